@@ -1,112 +1,34 @@
-"""Fox Energy integration."""
-
-import logging
-from typing import Final
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_TIMEOUT, Platform
-from homeassistant.core import HomeAssistant
-
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DEFAULT_TIMEOUT, DOMAIN
-from .coordinator import FoxEnergyCoordinator
-
-_LOGGER = logging.getLogger(__name__)
-
-PLATFORMS: Final = [Platform.SENSOR]
-
-
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Fox Energy from a config entry.
-
-    Args:
-        hass: Home Assistant instance
-        entry: Config entry
-
-    Returns:
-        True if setup successful
-    """
-    host = entry.data[CONF_HOST]
-    timeout = entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
-    # Update options if not set
-    if not entry.options:
-        hass.config_entries.async_update_entry(
-            entry,
-            options={
-                CONF_SCAN_INTERVAL: scan_interval,
-                CONF_TIMEOUT: timeout,
-            },
-        )
-
-    # Create coordinator
-    coordinator = FoxEnergyCoordinator(
-        hass=hass,
-        host=host,
-        timeout=timeout,
-        scan_interval=scan_interval,
+"""Fox Energy integration.
+
+Home Assistant setup lives in integration.py. The command-line tool
+(cli.py) and the poller daemon (daemon.py) only need aiohttp, so the
+package must stay importable without Home Assistant.
+"""
+
+try:
+    from .integration import (
+        CONFIG_SCHEMA,
+        PLATFORMS,
+        async_migrate_entry,
+        async_remove_entry,
+        async_setup,
+        async_setup_entry,
+        async_unload_entry,
+        async_update_options,
     )
-
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
-
-    # Store coordinator in hass data
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Setup platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # Setup entry reload listener
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-
-    return True
-
-
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry.
-
-    Args:
-        hass: Home Assistant instance
-        entry: Config entry
-
-    Returns:
-        True if unload successful
-    """
-    # Unload platforms
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-
-    if unload_ok:
-        # Remove coordinator
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unload_ok
-
-
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry.
-
-    Args:
-        hass: Home Assistant instance
-        entry: Config entry
-    """
-    await hass.config_entries.async_reload(entry.entry_id)
-
-
-async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
-    """Migrate old config entry.
-
-    Args:
-        hass: Home Assistant instance
-        config_entry: Config entry
-
-    Returns:
-        True if migration successful
-    """
-    _LOGGER.debug("Migrating from version %s", config_entry.version)
-
-    if config_entry.version > 1:
-        # This shouldn't happen
-        return False
-
-    return True
+except ModuleNotFoundError as err:
+    # Standalone tools run without Home Assistant installed
+    if err.name != "homeassistant":
+        raise
+    __all__: list[str] = []
+else:
+    __all__ = [
+        "CONFIG_SCHEMA",
+        "PLATFORMS",
+        "async_migrate_entry",
+        "async_remove_entry",
+        "async_setup",
+        "async_setup_entry",
+        "async_unload_entry",
+        "async_update_options",
+    ]
@@ -0,0 +1,178 @@
+"""Threshold alarms for Fox Energy integration."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import DEVICE_TYPE_3PHASE
+
+# Hysteresis as a fraction of the threshold
+DEFAULT_ALARM_HYSTERESIS = 0.03
+
+ALARM_OVERCURRENT = "przeciazenie"
+ALARM_UNDERVOLTAGE = "podnapiecie"
+ALARM_REACTIVE_POWER = "moc_bierna_wysoka"
+
+
+@dataclass(frozen=True, slots=True)
+class AlarmRule:
+    """Declarative threshold alarm on one sample field.
+
+    The alarm turns on once the value has been beyond the threshold for
+    min_duration seconds, and off as soon as it is back by more than the
+    hysteresis.
+
+    Attributes:
+        key: Alarm key
+        name: Display name
+        field: Sample field checked
+        threshold: Alarm threshold
+        above: True to alarm above the threshold, False below it
+        hysteresis: Distance from the threshold to clear the alarm
+        min_duration: Seconds the condition must hold to raise the alarm
+        absolute: Compare the magnitude of the value
+    """
+
+    key: str
+    name: str
+    field: str
+    threshold: float
+    above: bool = True
+    hysteresis: float = 0.0
+    min_duration: float = 0.0
+    absolute: bool = False
+
+    def tripped(self, value: float) -> bool:
+        """Return True if value is beyond the threshold."""
+        return value > self.threshold if self.above else value < self.threshold
+
+    def cleared(self, value: float) -> bool:
+        """Return True if value is back past the hysteresis band."""
+        if self.above:
+            return value <= self.threshold - self.hysteresis
+        return value >= self.threshold + self.hysteresis
+
+
+def build_alarm_rules(
+    device_type: str,
+    fuse_rating: float = 0,
+    undervoltage: float = 0,
+    reactive_power: float = 0,
+    min_duration: float = 0,
+    hysteresis: float = DEFAULT_ALARM_HYSTERESIS,
+) -> list[AlarmRule]:
+    """Return per-phase alarm rules for the configured limits.
+
+    Args:
+        device_type: "3phase" or "1phase"
+        fuse_rating: Overcurrent limit per phase in A (0 disables)
+        undervoltage: Lowest acceptable voltage in V (0 disables)
+        reactive_power: Highest reactive power magnitude per phase in VAr
+            (0 disables)
+        min_duration: Seconds a limit must be exceeded to raise an alarm
+        hysteresis: Hysteresis as a fraction of each limit
+
+    Returns:
+        Alarm rules
+    """
+    if device_type == DEVICE_TYPE_3PHASE:
+        phases = [("_l1", " L1"), ("_l2", " L2"), ("_l3", " L3")]
+    else:
+        phases = [("", "")]
+
+    limits = [
+        (ALARM_OVERCURRENT, "Overcurrent", "natezenie", fuse_rating, True, False),
+        (ALARM_UNDERVOLTAGE, "Undervoltage", "napiecie", undervoltage, False, False),
+        (
+            ALARM_REACTIVE_POWER,
+            "High Reactive Power",
+            "moc_reaktywna",
+            reactive_power,
+            True,
+            True,
+        ),
+    ]
+    return [
+        AlarmRule(
+            key=f"{key}{suffix}",
+            name=f"{name}{label}",
+            field=f"{field}{suffix}",
+            threshold=limit,
+            above=above,
+            hysteresis=limit * hysteresis,
+            min_duration=min_duration,
+            absolute=absolute,
+        )
+        for key, name, field, limit, above, absolute in limits
+        if limit
+        for suffix, label in phases
+    ]
+
+
+@dataclass(slots=True)
+class _AlarmState:
+    """Evaluation state of one rule."""
+
+    active: bool = False
+    since: float | None = None
+
+
+class FoxEnergyAlarms:
+    """Evaluate alarm rules against samples and report transitions."""
+
+    def __init__(self, rules: list[AlarmRule]):
+        """Initialize the evaluator.
+
+        Args:
+            rules: Alarm rules
+        """
+        self.rules = list(rules)
+        self._states = {rule.key: _AlarmState() for rule in self.rules}
+
+    @property
+    def fields(self) -> set[str]:
+        """Return the sample fields the rules check."""
+        return {rule.field for rule in self.rules}
+
+    def is_active(self, key: str) -> bool:
+        """Return whether an alarm is on."""
+        return self._states[key].active
+
+    def evaluate(
+        self, timestamp: float, data: dict[str, Any]
+    ) -> list[tuple[AlarmRule, bool, float]]:
+        """Evaluate a sample.
+
+        A missing value restarts the minimum duration but keeps an active
+        alarm on.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            Rules whose alarm turned on or off, with the new state and value
+        """
+        transitions = []
+        for rule in self.rules:
+            state = self._states[rule.key]
+            value = data.get(rule.field)
+            if value is None:
+                state.since = None
+                continue
+            if rule.absolute:
+                value = abs(value)
+
+            if state.active:
+                if rule.cleared(value):
+                    state.active = False
+                    transitions.append((rule, False, value))
+            elif rule.tripped(value):
+                if state.since is None:
+                    state.since = timestamp
+                if timestamp - state.since >= rule.min_duration:
+                    state.active = True
+                    state.since = None
+                    transitions.append((rule, True, value))
+            else:
+                state.since = None
+        return transitions
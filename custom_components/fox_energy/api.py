@@ -1,25 +1,82 @@
 """API client for Fox Energy meter."""
 
 import asyncio
+import json
 import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from functools import partial
 from typing import Any, Literal
 
 import aiohttp
 
+from .capture import FoxEnergyCapture
 from .const import (
+    ADAPTIVE_TIMEOUT_FACTOR,
+    ADAPTIVE_TIMEOUT_MIN,
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_TRANSPORT,
     DEVICE_TYPE_1PHASE,
     DEVICE_TYPE_3PHASE,
     ENDPOINT_CURRENT_PARAMETERS,
     ENDPOINT_TOTAL_ENERGY,
+    LATENCY_WINDOW,
+    RESPONSE_CACHE_TTL,
+    TRANSPORT_KEEPALIVE,
+)
+from .errors import FoxEnergyErrorTracker
+from .transport import (
+    FoxEnergyHTTPConnection,
+    FoxEnergyProtocolError,
+    FoxEnergyTransportError,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted values.
+
+    Args:
+        values: Sorted values
+        fraction: Percentile as a fraction (e.g., 0.99)
+
+    Returns:
+        Percentile value, 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def decode_json(body: str | bytes) -> Any:
+    """Decode a response body.
+
+    Single place all responses are decoded, so profiling can time it.
+
+    Args:
+        body: Response body
+
+    Returns:
+        Decoded JSON
+    """
+    return json.loads(body)
+
+
 class FoxEnergyConnectionError(Exception):
     """Connection error to Fox Energy device."""
 
 
+class FoxEnergyTimeoutError(FoxEnergyConnectionError):
+    """Request to Fox Energy device timed out."""
+
+
 class FoxEnergyAuthError(Exception):
     """Authentication error."""
 
@@ -28,28 +85,156 @@ class FoxEnergyInvalidResponse(Exception):
     """Invalid response from device."""
 
 
+class FoxEnergyRequestLimiter:
+    """Limit in-flight requests and request rate (token bucket)."""
+
+    def __init__(self, max_concurrent: int, rate: float = 0, burst: int = 1):
+        """Initialize the limiter.
+
+        Args:
+            max_concurrent: Maximum number of requests in flight
+            rate: Sustained requests per second (0 disables rate limiting)
+            burst: Number of requests allowed back-to-back
+        """
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+
+    async def acquire(self) -> float:
+        """Wait for a request slot.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        await self._semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return time.monotonic() - start
+
+    def release(self) -> None:
+        """Release a request slot."""
+        self._semaphore.release()
+
+    async def _take_token(self) -> None:
+        """Wait until the token bucket allows another request."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate
+            )
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
 class FoxEnergyAPI:
     """REST API client for Fox Energy meter."""
 
-    def __init__(self, host: str, timeout: int = 30):
+    def __init__(
+        self,
+        host: str,
+        timeout: int = 30,
+        cache_ttl: float = RESPONSE_CACHE_TTL,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_rate: float = DEFAULT_REQUEST_RATE,
+        global_limiter: FoxEnergyRequestLimiter | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        adaptive_timeout: bool = False,
+        timeout_ceiling: float | None = None,
+        transport: str = DEFAULT_TRANSPORT,
+    ):
         """Initialize the API client.
 
         Args:
             host: Device IP address (e.g., 192.168.3.101)
             timeout: Request timeout in seconds
+            cache_ttl: Seconds a successful response is reused (0 disables)
+            max_concurrent: Maximum requests in flight to this device
+            request_rate: Maximum requests per second to this device (0 = no limit)
+            global_limiter: Limiter shared by all devices
+            connect_timeout: Connection establishment timeout in seconds
+            read_timeout: Timeout between socket reads in seconds
+            adaptive_timeout: Derive the total timeout from observed latency
+            timeout_ceiling: Upper bound for any timeout (e.g., scan interval)
+            transport: HTTP client, aiohttp or the lightweight keep-alive one
         """
         self.host = host
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.adaptive_timeout = adaptive_timeout
+        self.timeout_ceiling = timeout_ceiling
+        self.cache_ttl = cache_ttl
         self.base_url = f"http://{host}"
+        self.limiter = FoxEnergyRequestLimiter(max_concurrent, request_rate)
+        self.global_limiter = global_limiter
+        self.transport = DEFAULT_TRANSPORT
+        self._connection: FoxEnergyHTTPConnection | None = None
+        self.set_transport(transport)
+
+        # Request metrics
+        self.request_count = 0
+        self.queue_wait_last = 0.0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        # Raw responses are recorded while a capture is attached
+        self.capture: FoxEnergyCapture | None = None
+
+        # Single-flight state: at most one request per endpoint is in flight,
+        # concurrent callers await the same future.
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    def set_transport(self, transport: str) -> None:
+        """Select the HTTP client used for requests.
+
+        Args:
+            transport: HTTP client, aiohttp or the lightweight keep-alive one
+        """
+        if transport == self.transport:
+            return
+        self.close()
+        self.transport = transport
+        self._connection = (
+            FoxEnergyHTTPConnection(self.host)
+            if transport == TRANSPORT_KEEPALIVE
+            else None
+        )
+
+    def close(self) -> None:
+        """Close the persistent connection, it is reopened on the next request."""
+        if self._connection is not None:
+            self._connection.close()
 
-    async def get_current_parameters(self) -> dict[str, Any]:
+    async def get_current_parameters(self, fresh: bool = False) -> dict[str, Any]:
         """Get current parameters (voltage, current, power, etc.).
 
+        Args:
+            fresh: Always request the device, bypassing the shared in-flight
+                request and the response cache
+
         Returns:
             Dictionary with current parameters
             3-phase: lists with [L1, L2, L3] values
             1-phase: string values
         """
+        if fresh:
+            return await self._fetch_endpoint(ENDPOINT_CURRENT_PARAMETERS)
         return await self._get_endpoint(ENDPOINT_CURRENT_PARAMETERS)
 
     async def get_total_energy(self) -> dict[str, Any]:
@@ -77,12 +262,170 @@ class FoxEnergyAPI:
                 return DEVICE_TYPE_3PHASE
             return DEVICE_TYPE_1PHASE
         except Exception as err:
-            _LOGGER.error("Error detecting device type: %s", err)
+            _LOGGER.debug("Error detecting device type: %s", err)
             raise FoxEnergyInvalidResponse(f"Cannot detect device type: {err}") from err
 
     async def _get_endpoint(self, endpoint: str) -> dict[str, Any]:
         """Get data from endpoint.
 
+        Concurrent callers share a single in-flight request and successful
+        responses are served from a short-lived cache, so the device never
+        sees more than one request per endpoint at a time.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            JSON response as dictionary
+        """
+        cached = self._cache.get(endpoint)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        future = self._inflight.get(endpoint)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_endpoint(endpoint))
+            future.add_done_callback(partial(self._fetch_done, endpoint))
+            self._inflight[endpoint] = future
+
+        # Shield so a cancelled caller does not abort the fetch for the others
+        return await asyncio.shield(future)
+
+    @property
+    def effective_timeout(self) -> float:
+        """Return the total request timeout currently in use.
+
+        The configured timeout is capped by the ceiling. In adaptive mode,
+        once enough samples exist, the timeout is the observed p99 latency
+        times a safety factor, clamped between a floor and that cap.
+        Requests that timed out count with the time they were given.
+        """
+        total = float(self.timeout)
+        if self.timeout_ceiling is not None:
+            total = min(total, self.timeout_ceiling)
+
+        if (
+            self.adaptive_timeout
+            and len(self.latencies) >= ADAPTIVE_TIMEOUT_MIN_SAMPLES
+        ):
+            p99 = percentile(sorted(self.latencies), 0.99)
+            total = min(total, max(ADAPTIVE_TIMEOUT_MIN, p99 * ADAPTIVE_TIMEOUT_FACTOR))
+
+        return total
+
+    def _client_timeout(self) -> aiohttp.ClientTimeout:
+        """Build the aiohttp timeout with connect, read and total budgets."""
+        total = self.effective_timeout
+        return aiohttp.ClientTimeout(
+            total=total,
+            connect=min(self.connect_timeout, total),
+            sock_read=min(self.read_timeout, total),
+        )
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return request metrics for diagnostics."""
+        avg_wait = (
+            self.queue_wait_total / self.request_count if self.request_count else 0.0
+        )
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.request_count,
+            "queue_wait_last": round(self.queue_wait_last, 4),
+            "queue_wait_avg": round(avg_wait, 4),
+            "queue_wait_max": round(self.queue_wait_max, 4),
+            "latency_p50": round(percentile(latencies, 0.5), 4),
+            "latency_p99": round(percentile(latencies, 0.99), 4),
+            "timeout_effective": round(self.effective_timeout, 3),
+        }
+
+    def _fetch_done(self, endpoint: str, future: asyncio.Future) -> None:
+        """Clear in-flight state and cache a successful response.
+
+        Args:
+            endpoint: API endpoint path
+            future: Completed fetch
+        """
+        self._inflight.pop(endpoint, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        if self.cache_ttl > 0:
+            self._cache[endpoint] = (time.monotonic(), future.result())
+
+    async def _fetch_endpoint(self, endpoint: str) -> dict[str, Any]:
+        """Request endpoint from the device.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            JSON response as dictionary
+        """
+        # Keep references, limiters may be replaced while a request waits
+        limiter = self.limiter
+        global_limiter = self.global_limiter
+
+        wait = await limiter.acquire()
+        try:
+            if global_limiter is not None:
+                wait += await global_limiter.acquire()
+            try:
+                self._record_wait(wait)
+                start = time.monotonic()
+                try:
+                    data = await self._request(endpoint)
+                except FoxEnergyTimeoutError:
+                    # Timeouts count as samples, so the adaptive timeout grows
+                    # with a meter that became slower instead of failing on
+                    # every request
+                    self.latencies.append(time.monotonic() - start)
+                    raise
+                latency = time.monotonic() - start
+                self.latencies.append(latency)
+                if self.capture is not None:
+                    self.capture.record(endpoint, data, latency)
+                return data
+            finally:
+                if global_limiter is not None:
+                    global_limiter.release()
+        finally:
+            limiter.release()
+
+    def _record_wait(self, wait: float) -> None:
+        """Record time a request spent queued behind the limiters.
+
+        Args:
+            wait: Seconds spent waiting
+        """
+        self.request_count += 1
+        self.queue_wait_last = wait
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    async def _request(self, endpoint: str) -> dict[str, Any]:
+        """Perform the HTTP request.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            JSON response as dictionary
+        """
+        if self._connection is not None:
+            data = await self._request_keepalive(self._connection, endpoint)
+        else:
+            data = await self._request_aiohttp(endpoint)
+
+        if data.get("status") != "ok":
+            raise FoxEnergyInvalidResponse(
+                f"Invalid response status: {data.get('status')}"
+            )
+
+        return data
+
+    async def _request_aiohttp(self, endpoint: str) -> dict[str, Any]:
+        """Perform the HTTP request with aiohttp.
+
         Args:
             endpoint: API endpoint path
 
@@ -95,43 +438,129 @@ class FoxEnergyAPI:
             async with aiohttp.ClientSession() as session:
                 async with session.get(
                     url,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    timeout=self._client_timeout(),
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
-
-                        if data.get("status") != "ok":
-                            raise FoxEnergyInvalidResponse(
-                                f"Invalid response status: {data.get('status')}"
-                            )
-
-                        return data
+                        return await response.json(loads=decode_json)
 
                     raise FoxEnergyConnectionError(
                         f"HTTP {response.status}: {await response.text()}"
                     )
         except asyncio.TimeoutError as err:
-            raise FoxEnergyConnectionError(
-                f"Connection timeout to {self.host}"
-            ) from err
+            raise FoxEnergyTimeoutError(f"Connection timeout to {self.host}") from err
         except aiohttp.ClientConnectorError as err:
             raise FoxEnergyConnectionError(f"Cannot connect to {self.host}") from err
         except aiohttp.ClientError as err:
             raise FoxEnergyConnectionError(f"Connection error: {err}") from err
 
+    async def _request_keepalive(
+        self, connection: FoxEnergyHTTPConnection, endpoint: str
+    ) -> dict[str, Any]:
+        """Perform the HTTP request on the persistent connection.
+
+        Args:
+            connection: Keep-alive connection to the meter
+            endpoint: API endpoint path
+
+        Returns:
+            JSON response as dictionary
+        """
+        total = self.effective_timeout
+        try:
+            async with asyncio.timeout(total):
+                response = await connection.get(
+                    endpoint,
+                    min(self.connect_timeout, total),
+                    min(self.read_timeout, total),
+                )
+        except TimeoutError as err:
+            raise FoxEnergyTimeoutError(f"Connection timeout to {self.host}") from err
+        except FoxEnergyTransportError as err:
+            raise FoxEnergyConnectionError(f"Cannot connect to {self.host}") from err
+        except FoxEnergyProtocolError as err:
+            raise FoxEnergyInvalidResponse(str(err)) from err
+
+        if response.status != 200:
+            raise FoxEnergyConnectionError(
+                f"HTTP {response.status}: {response.body.decode(errors='replace')}"
+            )
+        try:
+            return decode_json(response.body)
+        except ValueError as err:
+            raise FoxEnergyInvalidResponse(f"Invalid JSON: {err}") from err
+
+
+# Sensor key -> (endpoint, response field, phase index)
+FIELDS_3PHASE: dict[str, tuple[str, str, int | None]] = {
+    # Energy (kWh)
+    "energia_pobrana_l1": (ENDPOINT_TOTAL_ENERGY, "active_energy_import", 0),
+    "energia_pobrana_l2": (ENDPOINT_TOTAL_ENERGY, "active_energy_import", 1),
+    "energia_pobrana_l3": (ENDPOINT_TOTAL_ENERGY, "active_energy_import", 2),
+    # Power (W)
+    "moc_czynna_l1": (ENDPOINT_CURRENT_PARAMETERS, "power_active", 0),
+    "moc_czynna_l2": (ENDPOINT_CURRENT_PARAMETERS, "power_active", 1),
+    "moc_czynna_l3": (ENDPOINT_CURRENT_PARAMETERS, "power_active", 2),
+    # Current (A)
+    "natezenie_l1": (ENDPOINT_CURRENT_PARAMETERS, "current", 0),
+    "natezenie_l2": (ENDPOINT_CURRENT_PARAMETERS, "current", 1),
+    "natezenie_l3": (ENDPOINT_CURRENT_PARAMETERS, "current", 2),
+    # Voltage (V)
+    "napiecie_l1": (ENDPOINT_CURRENT_PARAMETERS, "voltage", 0),
+    "napiecie_l2": (ENDPOINT_CURRENT_PARAMETERS, "voltage", 1),
+    "napiecie_l3": (ENDPOINT_CURRENT_PARAMETERS, "voltage", 2),
+    # Reactive Power (VAr)
+    "moc_reaktywna_l1": (ENDPOINT_CURRENT_PARAMETERS, "power_reactive", 0),
+    "moc_reaktywna_l2": (ENDPOINT_CURRENT_PARAMETERS, "power_reactive", 1),
+    "moc_reaktywna_l3": (ENDPOINT_CURRENT_PARAMETERS, "power_reactive", 2),
+    # Power Factor (cos φ)
+    "cos_phi_l1": (ENDPOINT_CURRENT_PARAMETERS, "power_factor", 0),
+    "cos_phi_l2": (ENDPOINT_CURRENT_PARAMETERS, "power_factor", 1),
+    "cos_phi_l3": (ENDPOINT_CURRENT_PARAMETERS, "power_factor", 2),
+    # Frequency (Hz)
+    "czestotliwosc_l1": (ENDPOINT_CURRENT_PARAMETERS, "frequency", 0),
+    "czestotliwosc_l2": (ENDPOINT_CURRENT_PARAMETERS, "frequency", 1),
+    "czestotliwosc_l3": (ENDPOINT_CURRENT_PARAMETERS, "frequency", 2),
+}
+
+# Sum key -> (per-phase keys, rounding digits)
+SUMS_3PHASE: dict[str, tuple[tuple[str, ...], int]] = {
+    "energia_pobrana_suma": (
+        ("energia_pobrana_l1", "energia_pobrana_l2", "energia_pobrana_l3"),
+        3,
+    ),
+    "moc_czynna_suma": (("moc_czynna_l1", "moc_czynna_l2", "moc_czynna_l3"), 1),
+    "natezenie_suma": (("natezenie_l1", "natezenie_l2", "natezenie_l3"), 2),
+}
+
+FIELDS_1PHASE: dict[str, tuple[str, str, int | None]] = {
+    "energia_pobrana": (ENDPOINT_TOTAL_ENERGY, "active_energy", None),
+    "moc_czynna": (ENDPOINT_CURRENT_PARAMETERS, "power_active", None),
+    "natezenie": (ENDPOINT_CURRENT_PARAMETERS, "current", None),
+    "napiecie": (ENDPOINT_CURRENT_PARAMETERS, "voltage", None),
+    "moc_reaktywna": (ENDPOINT_CURRENT_PARAMETERS, "power_reactive", None),
+    "cos_phi": (ENDPOINT_CURRENT_PARAMETERS, "power_factor", None),
+    "czestotliwosc": (ENDPOINT_CURRENT_PARAMETERS, "frequency", None),
+}
+
 
 class FoxEnergyDataProcessor:
     """Process raw API data into unified format."""
 
     @staticmethod
-    def parse_energy_wh(value: Any) -> float:
+    def parse_energy_wh(
+        value: Any,
+        field: str | None = None,
+        errors: FoxEnergyErrorTracker | None = None,
+    ) -> float | None:
         """Convert energy value from Wh to kWh.
 
         Args:
             value: Energy value (int or string with leading zeros)
+            field: Sensor key, used for error accounting
+            errors: Error tracker counting parse failures
 
         Returns:
-            Energy in kWh rounded to 3 decimals
+            Energy in kWh rounded to 3 decimals, None if it cannot be parsed
         """
         try:
             # Convert to int first (handles strings with leading zeros)
@@ -139,125 +568,194 @@ class FoxEnergyDataProcessor:
             kwh = wh / 1000
             return round(kwh, 3)
         except (ValueError, TypeError) as err:
-            _LOGGER.error("Error parsing energy value %s: %s", value, err)
-            return 0.0
+            if errors is not None:
+                errors.record(
+                    f"parse:{field}", "Error parsing energy value %r: %s", value, err
+                )
+            else:
+                _LOGGER.debug("Error parsing energy value %s: %s", value, err)
+            # A bogus reading must not look like a counter reset
+            return None
 
     @staticmethod
-    def parse_float(value: Any) -> float:
+    def parse_float(
+        value: Any,
+        field: str | None = None,
+        errors: FoxEnergyErrorTracker | None = None,
+    ) -> float | None:
         """Convert value to float.
 
         Args:
             value: Value to convert (int, float, or string)
+            field: Sensor key, used for error accounting
+            errors: Error tracker counting parse failures
 
         Returns:
-            Float value or 0.0 on error
+            Float value, 0.0 if missing, None if it cannot be parsed
         """
         try:
             return float(value) if value is not None else 0.0
         except (ValueError, TypeError) as err:
-            _LOGGER.error("Error parsing float value %s: %s", value, err)
-            return 0.0
+            if errors is not None:
+                errors.record(
+                    f"parse:{field}", "Error parsing float value %r: %s", value, err
+                )
+            else:
+                _LOGGER.debug("Error parsing float value %s: %s", value, err)
+            return None
+
+    @classmethod
+    def required_endpoints(
+        cls, device_type: str, keys: Iterable[str] | None = None
+    ) -> set[str]:
+        """Return the endpoints needed to compute the given keys.
+
+        Args:
+            device_type: "3phase" or "1phase"
+            keys: Sensor keys, None for all
+
+        Returns:
+            Endpoint paths
+        """
+        if device_type == DEVICE_TYPE_3PHASE:
+            fields, sums = FIELDS_3PHASE, SUMS_3PHASE
+        else:
+            fields, sums = FIELDS_1PHASE, {}
+        if keys is None:
+            return {endpoint for endpoint, _field, _index in fields.values()}
+        return {fields[key][0] for key in _expand_sums(keys, sums) if key in fields}
+
+    @classmethod
+    def endpoint_keys(cls, device_type: str, endpoint: str) -> list[str]:
+        """Return the keys computed from one endpoint alone.
+
+        Args:
+            device_type: "3phase" or "1phase"
+            endpoint: API endpoint path
+
+        Returns:
+            Sensor keys, sums last
+        """
+        if device_type == DEVICE_TYPE_3PHASE:
+            fields, sums = FIELDS_3PHASE, SUMS_3PHASE
+        else:
+            fields, sums = FIELDS_1PHASE, {}
+        keys = [
+            key for key, (path, _field, _index) in fields.items() if path == endpoint
+        ]
+        keys.extend(
+            key
+            for key, (parts, _digits) in sums.items()
+            if all(part in keys for part in parts)
+        )
+        return keys
 
     @classmethod
     def process_3phase_data(
         cls,
-        current_params: dict[str, Any],
-        total_energy: dict[str, Any],
+        current_params: dict[str, Any] | None,
+        total_energy: dict[str, Any] | None,
+        keys: Iterable[str] | None = None,
+        errors: FoxEnergyErrorTracker | None = None,
     ) -> dict[str, Any]:
         """Process 3-phase device data.
 
         Args:
-            current_params: Current parameters response
-            total_energy: Total energy response
+            current_params: Current parameters response (None if not fetched)
+            total_energy: Total energy response (None if not fetched)
+            keys: Sensor keys to compute, None for all
+            errors: Error tracker counting parse failures
 
         Returns:
-            Unified dictionary with all sensor data
+            Unified dictionary with sensor data
         """
-        result = {
-            # Energy (kWh)
-            "energia_pobrana_l1": cls.parse_energy_wh(
-                total_energy["active_energy_import"][0]
-            ),
-            "energia_pobrana_l2": cls.parse_energy_wh(
-                total_energy["active_energy_import"][1]
-            ),
-            "energia_pobrana_l3": cls.parse_energy_wh(
-                total_energy["active_energy_import"][2]
-            ),
-            # Power (W)
-            "moc_czynna_l1": cls.parse_float(current_params["power_active"][0]),
-            "moc_czynna_l2": cls.parse_float(current_params["power_active"][1]),
-            "moc_czynna_l3": cls.parse_float(current_params["power_active"][2]),
-            # Current (A)
-            "natezenie_l1": cls.parse_float(current_params["current"][0]),
-            "natezenie_l2": cls.parse_float(current_params["current"][1]),
-            "natezenie_l3": cls.parse_float(current_params["current"][2]),
-            # Voltage (V)
-            "napiecie_l1": cls.parse_float(current_params["voltage"][0]),
-            "napiecie_l2": cls.parse_float(current_params["voltage"][1]),
-            "napiecie_l3": cls.parse_float(current_params["voltage"][2]),
-            # Reactive Power (VAr)
-            "moc_reaktywna_l1": cls.parse_float(current_params["power_reactive"][0]),
-            "moc_reaktywna_l2": cls.parse_float(current_params["power_reactive"][1]),
-            "moc_reaktywna_l3": cls.parse_float(current_params["power_reactive"][2]),
-            # Power Factor (cos φ)
-            "cos_phi_l1": cls.parse_float(current_params["power_factor"][0]),
-            "cos_phi_l2": cls.parse_float(current_params["power_factor"][1]),
-            "cos_phi_l3": cls.parse_float(current_params["power_factor"][2]),
-            # Frequency (Hz)
-            "czestotliwosc_l1": cls.parse_float(current_params["frequency"][0]),
-            "czestotliwosc_l2": cls.parse_float(current_params["frequency"][1]),
-            "czestotliwosc_l3": cls.parse_float(current_params["frequency"][2]),
-        }
-
-        # Calculate sums
-        result["energia_pobrana_suma"] = round(
-            result["energia_pobrana_l1"]
-            + result["energia_pobrana_l2"]
-            + result["energia_pobrana_l3"],
-            3,
-        )
-        result["moc_czynna_suma"] = round(
-            result["moc_czynna_l1"] + result["moc_czynna_l2"] + result["moc_czynna_l3"],
-            1,
-        )
-        result["natezenie_suma"] = round(
-            result["natezenie_l1"] + result["natezenie_l2"] + result["natezenie_l3"],
-            2,
+        if keys is not None:
+            keys = set(keys)
+
+        result = cls._process_fields(
+            FIELDS_3PHASE,
+            current_params,
+            total_energy,
+            None if keys is None else _expand_sums(keys, SUMS_3PHASE),
+            errors,
         )
 
+        # Calculate sums, unknown if any phase could not be parsed
+        for key, (parts, digits) in SUMS_3PHASE.items():
+            if keys is None or key in keys:
+                values = [result[part] for part in parts]
+                result[key] = None if None in values else round(sum(values), digits)
+
         return result
 
     @classmethod
     def process_1phase_data(
         cls,
-        current_params: dict[str, Any],
-        total_energy: dict[str, Any],
+        current_params: dict[str, Any] | None,
+        total_energy: dict[str, Any] | None,
+        keys: Iterable[str] | None = None,
+        errors: FoxEnergyErrorTracker | None = None,
     ) -> dict[str, Any]:
         """Process 1-phase device data.
 
         Args:
             current_params: Current parameters response (string values)
             total_energy: Total energy response (string values)
+            keys: Sensor keys to compute, None for all
+            errors: Error tracker counting parse failures
 
         Returns:
-            Unified dictionary with all sensor data
+            Unified dictionary with sensor data
         """
-        result = {
-            # Energy (kWh)
-            "energia_pobrana": cls.parse_energy_wh(total_energy["active_energy"]),
-            # Power (W)
-            "moc_czynna": cls.parse_float(current_params["power_active"]),
-            # Current (A)
-            "natezenie": cls.parse_float(current_params["current"]),
-            # Voltage (V)
-            "napiecie": cls.parse_float(current_params["voltage"]),
-            # Reactive Power (VAr)
-            "moc_reaktywna": cls.parse_float(current_params["power_reactive"]),
-            # Power Factor (cos φ)
-            "cos_phi": cls.parse_float(current_params["power_factor"]),
-            # Frequency (Hz)
-            "czestotliwosc": cls.parse_float(current_params["frequency"]),
-        }
+        return cls._process_fields(
+            FIELDS_1PHASE,
+            current_params,
+            total_energy,
+            None if keys is None else set(keys),
+            errors,
+        )
+
+    @classmethod
+    def _process_fields(
+        cls,
+        fields: dict[str, tuple[str, str, int | None]],
+        current_params: dict[str, Any] | None,
+        total_energy: dict[str, Any] | None,
+        keys: set[str] | None,
+        errors: FoxEnergyErrorTracker | None,
+    ) -> dict[str, Any]:
+        """Parse the requested fields out of the endpoint responses.
 
+        Args:
+            fields: Field table of the device type
+            current_params: Current parameters response
+            total_energy: Total energy response
+            keys: Sensor keys to parse, None for all
+            errors: Error tracker counting parse failures
+
+        Returns:
+            Parsed values by sensor key
+        """
+        result = {}
+        for key, (endpoint, field, index) in fields.items():
+            if keys is not None and key not in keys:
+                continue
+            if endpoint == ENDPOINT_TOTAL_ENERGY:
+                value = total_energy[field]
+                parse = cls.parse_energy_wh
+            else:
+                value = current_params[field]
+                parse = cls.parse_float
+            result[key] = parse(value if index is None else value[index], key, errors)
         return result
+
+
+def _expand_sums(
+    keys: Iterable[str], sums: dict[str, tuple[tuple[str, ...], int]]
+) -> set[str]:
+    """Return keys plus the per-phase keys their sums depend on."""
+    expanded = set(keys)
+    for key in list(expanded):
+        if key in sums:
+            expanded.update(sums[key][0])
+    return expanded
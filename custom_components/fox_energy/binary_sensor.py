@@ -0,0 +1,89 @@
+"""Binary sensors for Fox Energy integration."""
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .alarms import AlarmRule, build_alarm_rules
+from .const import CONF_ENTRY_TYPE, DOMAIN, ENTRY_TYPE_VIRTUAL
+from .coordinator import FoxEnergyCoordinator
+from .entity import FoxEnergyEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Fox Energy alarm binary sensors from config entry.
+
+    Args:
+        hass: Home Assistant instance
+        config_entry: Config entry
+        async_add_entities: Callback to add entities
+    """
+    if config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL:
+        return
+
+    coordinator: FoxEnergyCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    if coordinator.alarm_settings is None:
+        return
+
+    async_add_entities(
+        FoxEnergyAlarmSensor(coordinator, rule)
+        for rule in build_alarm_rules(
+            coordinator.device_type, **coordinator.alarm_settings
+        )
+    )
+
+
+class FoxEnergyAlarmSensor(FoxEnergyEntity, BinarySensorEntity):
+    """Alarm raised by the coordinator.
+
+    The state is written only when the alarm turns on or off (or the meter
+    becomes unavailable), not on every sample.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, coordinator: FoxEnergyCoordinator, rule: AlarmRule):
+        """Initialize the binary sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            rule: Alarm rule
+        """
+        super().__init__(coordinator, rule.key)
+
+        self._attr_name = rule.name
+        self._attr_unique_id = f"{coordinator.host}_{rule.key}"
+        self._attr_extra_state_attributes = {
+            "field": rule.field,
+            "threshold": rule.threshold,
+        }
+        self._written: tuple[bool, bool] | None = None
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the alarm is active."""
+        alarms = self.coordinator.alarms
+        return alarms is not None and alarms.is_active(self.sensor_key)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success and self.coordinator.data is not None
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed."""
+        state = (self.available, self.is_on)
+        if state != self._written:
+            self._written = state
+            self.async_write_ha_state()
@@ -0,0 +1,157 @@
+"""Burst capture of current parameters for Fox Energy integration."""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from array import array
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from .api import FoxEnergyConnectionError, FoxEnergyInvalidResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+BURST_MAX_DURATION = 300
+# Highest sampling rate the buffer is sized for (samples per second)
+BURST_MAX_RATE = 50
+# Delay after a failed request, doubled for every further consecutive failure
+BURST_ERROR_BACKOFF = 0.05
+BURST_MAX_BACKOFF = 1.0
+# Consecutive failures after which the device is considered gone
+BURST_MAX_CONSECUTIVE_ERRORS = 5
+
+
+class FoxEnergyBurstBuffer:
+    """Preallocated columns of a burst capture.
+
+    All memory is allocated up front, so appending during the capture
+    never resizes. Missing values are stored as NaN.
+    """
+
+    def __init__(self, keys: list[str], capacity: int):
+        """Initialize the buffer.
+
+        Args:
+            keys: Sample fields, one column each
+            capacity: Maximum number of samples
+        """
+        self.keys = list(keys)
+        self.capacity = capacity
+        self.size = 0
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.columns = {key: array("d", bytes(8 * capacity)) for key in self.keys}
+
+    @property
+    def full(self) -> bool:
+        """Return True if no more samples fit."""
+        return self.size >= self.capacity
+
+    def append(self, timestamp: float, data: dict[str, Any]) -> bool:
+        """Store a sample.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            False if the buffer is full and the sample was dropped
+        """
+        if self.size >= self.capacity:
+            return False
+        index = self.size
+        self.timestamps[index] = timestamp
+        for key, column in self.columns.items():
+            value = data.get(key)
+            column[index] = math.nan if value is None else value
+        self.size += 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the captured series.
+
+        Returns:
+            Timestamps and one list of values (None if missing) per key
+        """
+        return {
+            "timestamps": self.timestamps[: self.size].tolist(),
+            "values": {
+                key: [None if math.isnan(value) else value for value in column]
+                for key, column in (
+                    (key, column[: self.size]) for key, column in self.columns.items()
+                )
+            },
+        }
+
+    def write_json(self, path: Path) -> None:
+        """Write the captured series to a JSON file (blocking).
+
+        Args:
+            path: Output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.as_dict(), handle, separators=(",", ":"))
+
+
+async def async_burst_capture(
+    fetch: Callable[[], Awaitable[dict[str, Any]]],
+    process: Callable[[dict[str, Any]], dict[str, Any]],
+    buffer: FoxEnergyBurstBuffer,
+    duration: float,
+) -> dict[str, Any]:
+    """Fetch and process samples back-to-back for duration seconds.
+
+    Each request starts as soon as the previous one finished, so the rate
+    is bounded only by the device latency. Failed requests and responses
+    that cannot be processed are counted; sampling backs off exponentially
+    while failures repeat and stops after BURST_MAX_CONSECUTIVE_ERRORS in
+    a row.
+
+    Args:
+        fetch: Request returning the raw response
+        process: Convert a raw response to a sample
+        buffer: Buffer receiving the samples
+        duration: Seconds to sample
+
+    Returns:
+        Number of samples and errors, elapsed seconds, sampling rate,
+        whether sampling stopped early because the buffer was full and
+        whether it was aborted after consecutive errors
+    """
+    errors = 0
+    consecutive = 0
+    start = time.monotonic()
+    deadline = start + duration
+
+    while time.monotonic() < deadline and not buffer.full:
+        try:
+            sample = process(await fetch())
+        except (FoxEnergyConnectionError, FoxEnergyInvalidResponse) as err:
+            _LOGGER.debug("Burst capture request failed: %s", err)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Burst capture response could not be processed: %r", err)
+        else:
+            consecutive = 0
+            buffer.append(time.time(), sample)
+            continue
+
+        errors += 1
+        consecutive += 1
+        if consecutive >= BURST_MAX_CONSECUTIVE_ERRORS:
+            _LOGGER.debug("Burst capture aborted after %s errors in a row", consecutive)
+            break
+        delay = min(BURST_ERROR_BACKOFF * 2 ** (consecutive - 1), BURST_MAX_BACKOFF)
+        await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+
+    seconds = time.monotonic() - start
+    return {
+        "samples": buffer.size,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rate": round(buffer.size / seconds, 1) if seconds > 0 else 0.0,
+        "buffer_full": buffer.full,
+        "aborted": consecutive >= BURST_MAX_CONSECUTIVE_ERRORS,
+    }
@@ -0,0 +1,108 @@
+"""Capture of raw meter responses for Fox Energy integration."""
+
+import gzip
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Seconds between writes of captured responses while a capture runs
+CAPTURE_FLUSH_INTERVAL = 60
+CAPTURE_FILE_SUFFIX = ".jsonl.gz"
+
+
+@dataclass(slots=True)
+class CaptureRecord:
+    """One raw response received from a meter.
+
+    Attributes:
+        timestamp: Unix timestamp the response was received
+        endpoint: API endpoint path
+        latency: Request duration in seconds
+        data: Response JSON as returned by the meter
+    """
+
+    timestamp: float
+    endpoint: str
+    latency: float
+    data: dict[str, Any]
+
+
+class FoxEnergyCapture:
+    """Record raw responses of one meter to a gzip-compressed JSON lines file.
+
+    Responses are buffered on the event loop as received; serialising and
+    compressing happens in write, which is run from an executor. Every write
+    appends a gzip member, so a file stays readable if a capture is aborted.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the capture.
+
+        Args:
+            path: Output file
+        """
+        self.path = path
+        self.count = 0
+        self._pending: list[CaptureRecord] = []
+
+    def record(self, endpoint: str, data: dict[str, Any], latency: float) -> None:
+        """Buffer a response.
+
+        Args:
+            endpoint: API endpoint path
+            data: Response JSON
+            latency: Request duration in seconds
+        """
+        self._pending.append(CaptureRecord(time.time(), endpoint, latency, data))
+        self.count += 1
+
+    def take_pending(self) -> list[CaptureRecord]:
+        """Return and clear the buffered responses."""
+        records, self._pending = self._pending, []
+        return records
+
+    def write(self, records: list[CaptureRecord]) -> None:
+        """Append responses to the capture file (blocking, run in an executor).
+
+        Args:
+            records: Responses in the order received
+        """
+        if not records:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps(
+                {
+                    "t": record.timestamp,
+                    "endpoint": record.endpoint,
+                    "latency": round(record.latency, 4),
+                    "data": record.data,
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+            for record in records
+        )
+        with gzip.open(self.path, "at", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+def read_capture(path: Path) -> Iterator[CaptureRecord]:
+    """Read the responses of a capture file (blocking).
+
+    Args:
+        path: Capture file
+
+    Yields:
+        Responses in the order received
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            record = json.loads(line)
+            yield CaptureRecord(
+                record["t"], record["endpoint"], record["latency"], record["data"]
+            )
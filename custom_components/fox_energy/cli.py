@@ -0,0 +1,485 @@
+"""Command-line probing and benchmarking of Fox Energy meters.
+
+Needs only aiohttp, not Home Assistant, e.g.::
+
+    python -m custom_components.fox_energy.cli discover 192.168.3.0/24
+    python -m custom_components.fox_energy.cli latency -n 200 192.168.3.101
+    python -m custom_components.fox_energy.cli load --rate 1 --duration 300 \
+        192.168.3.101 192.168.3.102
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import math
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from .api import (
+    FoxEnergyAPI,
+    FoxEnergyConnectionError,
+    FoxEnergyDataProcessor,
+    FoxEnergyInvalidResponse,
+    percentile,
+)
+from .const import (
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSPORT,
+    DEVICE_TYPE_3PHASE,
+    ENDPOINT_CURRENT_PARAMETERS,
+    ENDPOINT_TOTAL_ENERGY,
+    TRANSPORTS,
+)
+
+# Discovery probes many addresses that do not answer, keep them short
+DISCOVER_TIMEOUT = 1
+DISCOVER_CONCURRENCY = 64
+MAX_DISCOVER_ADDRESSES = 1024
+
+REQUEST_ERRORS = (FoxEnergyConnectionError, FoxEnergyInvalidResponse)
+
+
+def summarize(latencies: list[float]) -> dict[str, Any]:
+    """Return the distribution of latencies in milliseconds.
+
+    Args:
+        latencies: Latencies in seconds
+
+    Returns:
+        Count, mean, minimum, p50, p90, p99 and maximum
+    """
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 2),
+        "min_ms": round(values[0] * 1000, 2),
+        "p50_ms": round(percentile(values, 0.5) * 1000, 2),
+        "p90_ms": round(percentile(values, 0.9) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+def _api(host: str, timeout: int, transport: str) -> FoxEnergyAPI:
+    """Create a client whose every request reaches the meter."""
+    return FoxEnergyAPI(
+        host,
+        timeout,
+        cache_ttl=0,
+        connect_timeout=timeout,
+        read_timeout=timeout,
+        transport=transport,
+    )
+
+
+def _requests(api: FoxEnergyAPI) -> dict[str, Callable[[], Awaitable[Any]]]:
+    """Return the request function of every endpoint."""
+    return {
+        ENDPOINT_CURRENT_PARAMETERS: partial(api.get_current_parameters, fresh=True),
+        ENDPOINT_TOTAL_ENERGY: api.get_total_energy,
+    }
+
+
+async def _async_poll(api: FoxEnergyAPI, device_type: str) -> dict[str, Any]:
+    """Fetch and process one sample like the coordinator does."""
+    current_params, total_energy = await asyncio.gather(
+        api.get_current_parameters(fresh=True), api.get_total_energy()
+    )
+    if device_type == DEVICE_TYPE_3PHASE:
+        return FoxEnergyDataProcessor.process_3phase_data(current_params, total_energy)
+    return FoxEnergyDataProcessor.process_1phase_data(current_params, total_energy)
+
+
+async def async_probe(
+    host: str, timeout: int = DEFAULT_TIMEOUT, transport: str = DEFAULT_TRANSPORT
+) -> dict[str, Any]:
+    """Detect a meter and read one sample.
+
+    Args:
+        host: Meter host
+        timeout: Request timeout in seconds
+        transport: HTTP client
+
+    Returns:
+        Host, device type, time taken and the processed sample, or the error
+    """
+    api = _api(host, timeout, transport)
+    start = time.perf_counter()
+    try:
+        device_type = await api.detect_device_type()
+        data = await _async_poll(api, device_type)
+    except REQUEST_ERRORS as err:
+        return {"host": host, "error": str(err)}
+    finally:
+        api.close()
+    return {
+        "host": host,
+        "device_type": device_type,
+        "seconds": round(time.perf_counter() - start, 3),
+        "data": data,
+    }
+
+
+async def async_discover(
+    network: str,
+    port: int | None = None,
+    timeout: int = DISCOVER_TIMEOUT,
+    concurrency: int = DISCOVER_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """Probe every address of a network for meters.
+
+    Args:
+        network: Network in CIDR notation (e.g. 192.168.3.0/24)
+        port: HTTP port, None for 80
+        timeout: Request timeout per address in seconds
+        concurrency: Addresses probed at once
+
+    Returns:
+        Probe results of the addresses that answered as a meter
+
+    Raises:
+        ValueError: If the network is invalid or too large
+    """
+    net = ipaddress.ip_network(network, strict=False)
+    if net.num_addresses > MAX_DISCOVER_ADDRESSES:
+        raise ValueError(f"{network} has more than {MAX_DISCOVER_ADDRESSES} addresses")
+    addresses = list(net.hosts()) or [net.network_address]
+    hosts = [str(ip) if port is None else f"{ip}:{port}" for ip in addresses]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> dict[str, Any]:
+        async with semaphore:
+            return await async_probe(host, timeout)
+
+    results = await asyncio.gather(*(probe(host) for host in hosts))
+    return [result for result in results if "error" not in result]
+
+
+async def async_latency(
+    hosts: list[str],
+    requests: int = 100,
+    timeout: int = DEFAULT_TIMEOUT,
+    transport: str = DEFAULT_TRANSPORT,
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Measure the latency distribution of every endpoint of meters.
+
+    Meters are measured concurrently; requests to one meter are sequential,
+    alternating between the endpoints.
+
+    Args:
+        hosts: Meter hosts
+        requests: Requests per endpoint and meter
+        timeout: Request timeout in seconds
+        transport: HTTP client
+
+    Returns:
+        Per host and endpoint, the latency distribution and error count
+    """
+
+    async def measure(host: str) -> dict[str, dict[str, Any]]:
+        api = _api(host, timeout, transport)
+        endpoints = _requests(api)
+        latencies: dict[str, list[float]] = {endpoint: [] for endpoint in endpoints}
+        errors: Counter[str] = Counter()
+        try:
+            for _ in range(requests):
+                for endpoint, request in endpoints.items():
+                    start = time.perf_counter()
+                    try:
+                        await request()
+                    except REQUEST_ERRORS:
+                        errors[endpoint] += 1
+                        continue
+                    latencies[endpoint].append(time.perf_counter() - start)
+        finally:
+            api.close()
+        return {
+            endpoint: {**summarize(values), "errors": errors[endpoint]}
+            for endpoint, values in latencies.items()
+        }
+
+    results = await asyncio.gather(*(measure(host) for host in hosts))
+    return dict(zip(hosts, results, strict=True))
+
+
+async def async_load(
+    hosts: list[str],
+    rate: float,
+    duration: float,
+    timeout: int = DEFAULT_TIMEOUT,
+    transport: str = DEFAULT_TRANSPORT,
+) -> dict[str, dict[str, Any]]:
+    """Poll meters at a target rate and measure what they sustain.
+
+    Each meter is polled like the coordinator does: both endpoints per
+    poll, processed, and never two polls of a meter at once. Ticks that
+    come due while a poll is still running are skipped.
+
+    Args:
+        hosts: Meter hosts
+        rate: Target polls per second per meter
+        duration: Seconds to poll
+        timeout: Request timeout in seconds
+        transport: HTTP client
+
+    Returns:
+        Per host, polls, errors, throughput, latency and start jitter
+
+    Raises:
+        ValueError: If the rate or the duration is not a positive number
+    """
+    if not (math.isfinite(rate) and rate > 0):
+        raise ValueError(f"Rate must be a positive number, got {rate}")
+    if not (math.isfinite(duration) and duration > 0):
+        raise ValueError(f"Duration must be a positive number, got {duration}")
+    loop = asyncio.get_running_loop()
+    interval = 1 / rate
+
+    async def run(host: str) -> dict[str, Any]:
+        api = _api(host, timeout, transport)
+        try:
+            device_type = await api.detect_device_type()
+        except REQUEST_ERRORS as err:
+            api.close()
+            return {"error": str(err)}
+
+        latencies: list[float] = []
+        lateness: list[float] = []
+        errors: Counter[str] = Counter()
+        skipped = 0
+        tick = 0
+        start = loop.time()
+        try:
+            while (due := start + tick * interval) < start + duration:
+                if (delay := due - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                began = loop.time()
+                lateness.append(began - due)
+                try:
+                    await _async_poll(api, device_type)
+                except REQUEST_ERRORS as err:
+                    errors[type(err).__name__] += 1
+                else:
+                    latencies.append(loop.time() - began)
+                # Ticks that passed during the poll are skipped
+                next_tick = max(tick + 1, math.ceil((loop.time() - start) / interval))
+                skipped += next_tick - tick - 1
+                tick = next_tick
+        finally:
+            api.close()
+
+        # The window is the duration, unless the last poll overran it
+        elapsed = max(loop.time() - start, duration)
+        polls = len(lateness)
+        return {
+            "device_type": device_type,
+            "polls": polls,
+            "errors": sum(errors.values()),
+            "error_rate": round(sum(errors.values()) / polls, 4) if polls else 0.0,
+            "error_types": dict(errors),
+            "skipped": skipped,
+            "throughput": round(len(latencies) / elapsed, 2),
+            "latency": summarize(latencies),
+            # Spread of poll start times around the schedule
+            "jitter_ms": round(statistics.pstdev(lateness) * 1000, 2),
+            "max_lateness_ms": round(max(lateness) * 1000, 2),
+        }
+
+    results = await asyncio.gather(*(run(host) for host in hosts))
+    return dict(zip(hosts, results, strict=True))
+
+
+def _print_table(rows: list[list[Any]], header: list[str]) -> None:
+    """Print rows as aligned columns."""
+    table = [
+        header,
+        *([("-" if cell is None else str(cell)) for cell in row] for row in rows),
+    ]
+    widths = [max(len(row[column]) for row in table) for column in range(len(header))]
+    for row in table:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def _print_probes(results: list[dict[str, Any]]) -> None:
+    """Print probe or discovery results."""
+    _print_table(
+        [
+            [
+                result["host"],
+                result.get("device_type"),
+                result.get("seconds"),
+                len(result["data"]) if "data" in result else None,
+                result.get("error"),
+            ]
+            for result in results
+        ],
+        ["host", "type", "seconds", "values", "error"],
+    )
+
+
+def _print_latency(results: dict[str, dict[str, dict[str, Any]]]) -> None:
+    """Print latency distributions."""
+    columns = ["count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+    _print_table(
+        [
+            [
+                host,
+                endpoint,
+                *(stats.get(column) for column in columns),
+                stats["errors"],
+            ]
+            for host, endpoints in results.items()
+            for endpoint, stats in endpoints.items()
+        ],
+        ["host", "endpoint", *columns, "errors"],
+    )
+
+
+def _print_load(results: dict[str, dict[str, Any]]) -> None:
+    """Print load test results with totals."""
+    rows = []
+    for host, stats in results.items():
+        if "error" in stats:
+            rows.append([host, *[None] * 7, stats["error"]])
+            continue
+        rows.append(
+            [
+                host,
+                stats["polls"],
+                stats["throughput"],
+                stats["error_rate"],
+                stats["skipped"],
+                stats["latency"].get("p50_ms"),
+                stats["latency"].get("p99_ms"),
+                stats["jitter_ms"],
+            ]
+        )
+    measured = [stats for stats in results.values() if "error" not in stats]
+    polls = sum(stats["polls"] for stats in measured)
+    errors = sum(stats["errors"] for stats in measured)
+    rows.append(
+        [
+            "total",
+            polls,
+            round(sum(stats["throughput"] for stats in measured), 2),
+            round(errors / polls, 4) if polls else None,
+            sum(stats["skipped"] for stats in measured),
+        ]
+    )
+    header = ["host", "polls", "polls/s", "error_rate", "skipped"]
+    header += ["p50_ms", "p99_ms", "jitter_ms", "error"]
+    _print_table([row + [None] * (len(header) - len(row)) for row in rows], header)
+
+
+async def _async_run(args: argparse.Namespace) -> Any:
+    """Run the selected command and return its results."""
+    if args.command == "probe":
+        return await asyncio.gather(
+            *(async_probe(host, args.timeout, args.transport) for host in args.hosts)
+        )
+    if args.command == "discover":
+        return await async_discover(args.network, args.port, args.timeout)
+    if args.command == "latency":
+        return await async_latency(
+            args.hosts, args.requests, args.timeout, args.transport
+        )
+    return await async_load(
+        args.hosts, args.rate, args.duration, args.timeout, args.transport
+    )
+
+
+def _positive(kind: type[int] | type[float]) -> Callable[[str], Any]:
+    """Return an argparse type accepting positive finite numbers of a kind."""
+
+    def parse(value: str) -> Any:
+        number = kind(value)
+        if not (math.isfinite(number) and number > 0):
+            raise argparse.ArgumentTypeError(f"not a positive number: {value}")
+        return number
+
+    return parse
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse the command line and run a command.
+
+    Returns:
+        Exit status, 1 if no meter answered
+    """
+    parser = argparse.ArgumentParser(
+        description="Probe and benchmark Fox Energy meters."
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, help_text: str, timeout: int) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument(
+            "--timeout", type=_positive(int), default=timeout, help="seconds"
+        )
+        return command
+
+    probe = add_command("probe", "detect meters and read one sample", DEFAULT_TIMEOUT)
+    probe.add_argument("hosts", nargs="+")
+    discover = add_command("discover", "find meters on a network", DISCOVER_TIMEOUT)
+    discover.add_argument("network", help="e.g. 192.168.3.0/24")
+    discover.add_argument("--port", type=int, help="HTTP port (default 80)")
+    latency = add_command(
+        "latency", "measure per-endpoint latency distributions", DEFAULT_TIMEOUT
+    )
+    latency.add_argument("hosts", nargs="+")
+    latency.add_argument(
+        "-n",
+        "--requests",
+        type=_positive(int),
+        default=100,
+        help="per endpoint and meter",
+    )
+    load = add_command("load", "poll meters at a target rate", DEFAULT_TIMEOUT)
+    load.add_argument("hosts", nargs="+")
+    load.add_argument(
+        "--rate", type=_positive(float), default=1.0, help="polls/s per meter"
+    )
+    load.add_argument("--duration", type=_positive(float), default=60.0, help="seconds")
+    for command in (probe, latency, load):
+        command.add_argument(
+            "--transport", choices=TRANSPORTS, default=DEFAULT_TRANSPORT
+        )
+
+    args = parser.parse_args(argv)
+    try:
+        results = asyncio.run(_async_run(args))
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+    elif args.command in ("probe", "discover"):
+        _print_probes(results)
+    elif args.command == "latency":
+        _print_latency(results)
+    else:
+        _print_load(results)
+
+    if args.command in ("probe", "discover"):
+        answered = [result for result in results if "error" not in result]
+    elif args.command == "latency":
+        answered = [
+            host
+            for host, endpoints in results.items()
+            if any(stats["count"] for stats in endpoints.values())
+        ]
+    else:
+        answered = [stats for stats in results.values() if "error" not in stats]
+    return 0 if answered else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,9 +9,57 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_NAME, CONF_TIMEOUT
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import selector
+from homeassistant.util import slugify
 
 from .api import FoxEnergyAPI, FoxEnergyConnectionError, FoxEnergyInvalidResponse
-from .const import CONF_HOST, CONF_SCAN_INTERVAL, DEFAULT_TIMEOUT, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_ADAPTIVE_TIMEOUT,
+    CONF_ALARM_DELAY,
+    CONF_APPLIANCES,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEMAND_PEAKS,
+    CONF_DEMAND_THRESHOLD,
+    CONF_DEMAND_TRACKING,
+    CONF_ENERGY_FORECAST,
+    CONF_ENTRY_TYPE,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_FUSE_RATING,
+    CONF_HOST,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METERS,
+    CONF_REACTIVE_POWER_LIMIT,
+    CONF_READ_TIMEOUT,
+    CONF_REQUEST_RATE,
+    CONF_SAMPLE_RETENTION_DAYS,
+    CONF_SCAN_INTERVAL,
+    CONF_STEP_THRESHOLD,
+    CONF_STORE_SAMPLES,
+    CONF_STREAM,
+    CONF_SUBTRACT,
+    CONF_TARIFF,
+    CONF_TRANSPORT,
+    CONF_UNDERVOLTAGE,
+    DEFAULT_ALARM_DELAY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DEMAND_PEAKS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_SAMPLE_RETENTION_DAYS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    ENTRY_TYPE_METER,
+    ENTRY_TYPE_VIRTUAL,
+    TARIFF_NONE,
+    TRANSPORTS,
+)
+from .steps import parse_appliances
+from .stream import parse_address
+from .tariffs import TARIFF_CALENDARS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,10 +105,33 @@ class FoxEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Create options flow."""
         return FoxEnergyOptionsFlow(config_entry)
 
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Return whether the entry has options; virtual meters have none."""
+        return config_entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_VIRTUAL
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle user step - manual IP entry.
+        """Handle user step - choose a physical or a virtual meter.
+
+        Args:
+            user_input: User input from form
+
+        Returns:
+            Flow result
+        """
+        return self.async_show_menu(
+            step_id="user", menu_options=[ENTRY_TYPE_METER, ENTRY_TYPE_VIRTUAL]
+        )
+
+    async def async_step_meter(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle meter step - manual IP entry.
 
         Args:
             user_input: User input from form
@@ -101,11 +172,69 @@ class FoxEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="meter",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
 
+    async def async_step_virtual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle virtual step - combine configured meters.
+
+        Args:
+            user_input: User input from form
+
+        Returns:
+            Flow result
+        """
+        coordinators = {
+            coordinator.host: coordinator
+            for coordinator in self.hass.data.get(DOMAIN, {}).values()
+        }
+        if not coordinators:
+            return self.async_abort(reason="no_meters")
+
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            meters = user_input[CONF_METERS]
+            subtract = user_input.get(CONF_SUBTRACT, [])
+            selected = [coordinators[host] for host in (*meters, *subtract)]
+
+            if not meters:
+                errors[CONF_METERS] = "no_meters_selected"
+            elif set(meters) & set(subtract):
+                errors[CONF_SUBTRACT] = "meter_added_and_subtracted"
+            elif len({coordinator.device_type for coordinator in selected}) > 1:
+                errors[CONF_METERS] = "mixed_device_types"
+
+            if not errors:
+                name = user_input[CONF_NAME].strip()
+                await self.async_set_unique_id(f"virtual_{slugify(name)}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=name,
+                    data={
+                        CONF_ENTRY_TYPE: ENTRY_TYPE_VIRTUAL,
+                        CONF_NAME: name,
+                        CONF_METERS: meters,
+                        CONF_SUBTRACT: subtract,
+                    },
+                )
+
+        hosts = {host: host for host in coordinators}
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME): str,
+                vol.Required(CONF_METERS, default=[]): cv.multi_select(hosts),
+                vol.Optional(CONF_SUBTRACT, default=[]): cv.multi_select(hosts),
+            }
+        )
+        return self.async_show_form(
+            step_id="virtual", data_schema=schema, errors=errors
+        )
+
 
 class FoxEnergyOptionsFlow(config_entries.OptionsFlow):
     """Options flow for Fox Energy integration."""
@@ -129,8 +258,20 @@ class FoxEnergyOptionsFlow(config_entries.OptionsFlow):
         Returns:
             Flow result
         """
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                parse_appliances(user_input.get(CONF_APPLIANCES, ""))
+            except ValueError:
+                errors[CONF_APPLIANCES] = "invalid_appliances"
+            if stream := user_input.get(CONF_STREAM, ""):
+                try:
+                    parse_address(stream)
+                except ValueError:
+                    errors[CONF_STREAM] = "invalid_stream"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
         schema = vol.Schema(
             {
@@ -146,7 +287,109 @@ class FoxEnergyOptionsFlow(config_entries.OptionsFlow):
                         CONF_TIMEOUT, DEFAULT_TIMEOUT
                     ),
                 ): int,
+                vol.Optional(
+                    CONF_CONNECT_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                vol.Optional(
+                    CONF_READ_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                vol.Optional(
+                    CONF_ADAPTIVE_TIMEOUT,
+                    default=self.config_entry.options.get(CONF_ADAPTIVE_TIMEOUT, False),
+                ): bool,
+                vol.Optional(
+                    CONF_TRANSPORT,
+                    default=self.config_entry.options.get(
+                        CONF_TRANSPORT, DEFAULT_TRANSPORT
+                    ),
+                ): vol.In(TRANSPORTS),
+                vol.Optional(
+                    CONF_STREAM,
+                    default=self.config_entry.options.get(CONF_STREAM, ""),
+                ): str,
+                vol.Optional(
+                    CONF_STORE_SAMPLES,
+                    default=self.config_entry.options.get(CONF_STORE_SAMPLES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SAMPLE_RETENTION_DAYS,
+                    default=self.config_entry.options.get(
+                        CONF_SAMPLE_RETENTION_DAYS, DEFAULT_SAMPLE_RETENTION_DAYS
+                    ),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    ),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_REQUEST_RATE,
+                    default=self.config_entry.options.get(
+                        CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_EXTERNAL_STATISTICS,
+                    default=self.config_entry.options.get(
+                        CONF_EXTERNAL_STATISTICS, False
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_TARIFF,
+                    default=self.config_entry.options.get(CONF_TARIFF, TARIFF_NONE),
+                ): vol.In([TARIFF_NONE, *TARIFF_CALENDARS]),
+                vol.Optional(
+                    CONF_DEMAND_TRACKING,
+                    default=self.config_entry.options.get(CONF_DEMAND_TRACKING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_DEMAND_PEAKS,
+                    default=self.config_entry.options.get(
+                        CONF_DEMAND_PEAKS, DEFAULT_DEMAND_PEAKS
+                    ),
+                ): vol.All(int, vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_DEMAND_THRESHOLD,
+                    default=self.config_entry.options.get(CONF_DEMAND_THRESHOLD, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_ENERGY_FORECAST,
+                    default=self.config_entry.options.get(CONF_ENERGY_FORECAST, False),
+                ): bool,
+                vol.Optional(
+                    CONF_FUSE_RATING,
+                    default=self.config_entry.options.get(CONF_FUSE_RATING, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_UNDERVOLTAGE,
+                    default=self.config_entry.options.get(CONF_UNDERVOLTAGE, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_REACTIVE_POWER_LIMIT,
+                    default=self.config_entry.options.get(CONF_REACTIVE_POWER_LIMIT, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_ALARM_DELAY,
+                    default=self.config_entry.options.get(
+                        CONF_ALARM_DELAY, DEFAULT_ALARM_DELAY
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_STEP_THRESHOLD,
+                    default=self.config_entry.options.get(CONF_STEP_THRESHOLD, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_APPLIANCES,
+                    default=self.config_entry.options.get(CONF_APPLIANCES, ""),
+                ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -3,8 +3,63 @@
 DOMAIN = "fox_energy"
 MANUFACTURER = "F&F"
 DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 3.0
+DEFAULT_READ_TIMEOUT = 5.0
 DEFAULT_SCAN_INTERVAL = 5
 
+# Seconds a successful endpoint response is shared between callers
+RESPONSE_CACHE_TTL = 0.5
+
+# Request limits
+DEFAULT_MAX_CONCURRENT_REQUESTS = 1
+DEFAULT_REQUEST_RATE = 0
+GLOBAL_MAX_CONCURRENT_REQUESTS = 8
+DATA_GLOBAL_LIMITER = "fox_energy_global_limiter"
+DATA_WORKER_POOL = "fox_energy_worker_pool"
+DATA_STREAM_CLIENTS = "fox_energy_stream_clients"
+# Scan intervals a refresh of a streamed meter waits for the next sample
+STREAM_REFRESH_INTERVALS = 3
+
+# HTTP transports
+TRANSPORT_AIOHTTP = "aiohttp"
+TRANSPORT_KEEPALIVE = "keepalive"
+TRANSPORTS = [TRANSPORT_AIOHTTP, TRANSPORT_KEEPALIVE]
+DEFAULT_TRANSPORT = TRANSPORT_AIOHTTP
+
+# Sample store
+DEFAULT_SAMPLE_RETENTION_DAYS = 30
+
+# Persisted per-meter state (tariff counters, demand peaks)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.{{entry_id}}"
+# Seconds state changes are collected before they are written
+STATE_SAVE_DELAY = 60
+
+# Alarms
+DEFAULT_ALARM_DELAY = 10
+EVENT_ALARM = f"{DOMAIN}_alarm"
+
+# Step-change detection
+EVENT_STEP = f"{DOMAIN}_step"
+
+# Virtual meters
+ENTRY_TYPE_METER = "meter"
+ENTRY_TYPE_VIRTUAL = "virtual"
+DATA_VIRTUAL_METERS = "fox_energy_virtual_meters"
+
+# Tariff zones
+TARIFF_NONE = "none"
+
+# Demand tracking
+DEFAULT_DEMAND_PEAKS = 3
+EVENT_DEMAND_THRESHOLD = f"{DOMAIN}_demand_threshold"
+
+# Adaptive timeout: p99 latency x factor, never below the floor (seconds)
+LATENCY_WINDOW = 200
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 20
+ADAPTIVE_TIMEOUT_FACTOR = 3
+ADAPTIVE_TIMEOUT_MIN = 0.3
+
 # API Endpoints
 ENDPOINT_CURRENT_PARAMETERS = "/0000/get_current_parameters"
 ENDPOINT_TOTAL_ENERGY = "/0000/get_total_energy"
@@ -241,6 +296,30 @@ SENSORS_1PHASE = {
 # Config flow
 CONF_HOST = "host"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_RATE = "request_rate"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_ADAPTIVE_TIMEOUT = "adaptive_timeout"
+CONF_STORE_SAMPLES = "store_samples"
+CONF_SAMPLE_RETENTION_DAYS = "sample_retention_days"
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+CONF_TRANSPORT = "transport"
+CONF_TARIFF = "tariff"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_FUSE_RATING = "fuse_rating"
+CONF_UNDERVOLTAGE = "undervoltage"
+CONF_REACTIVE_POWER_LIMIT = "reactive_power_limit"
+CONF_ALARM_DELAY = "alarm_delay"
+CONF_METERS = "meters"
+CONF_SUBTRACT = "subtract"
+CONF_DEMAND_TRACKING = "demand_tracking"
+CONF_DEMAND_PEAKS = "demand_peaks"
+CONF_DEMAND_THRESHOLD = "demand_threshold"
+CONF_ENERGY_FORECAST = "energy_forecast"
+CONF_STEP_THRESHOLD = "step_threshold"
+CONF_APPLIANCES = "appliances"
+CONF_STREAM = "stream"
 
 # Error messages
 ERROR_CANNOT_CONNECT = "cannot_connect"
@@ -1,23 +1,85 @@
 """Data update coordinator for Fox Energy integration."""
 
+import asyncio
 import logging
+import math
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from pathlib import Path
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import get_time_zone, utc_from_timestamp, utcnow
 
+from .alarms import FoxEnergyAlarms, build_alarm_rules
 from .api import (
     FoxEnergyAPI,
     FoxEnergyConnectionError,
     FoxEnergyDataProcessor,
     FoxEnergyInvalidResponse,
+    FoxEnergyRequestLimiter,
 )
+from .burst import BURST_MAX_RATE, FoxEnergyBurstBuffer, async_burst_capture
+from .capture import CAPTURE_FLUSH_INTERVAL, FoxEnergyCapture
 from .const import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DEMAND_PEAKS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_SAMPLE_RETENTION_DAYS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TRANSPORT,
     DEVICE_TYPE_3PHASE,
+    DOMAIN,
+    ENDPOINT_CURRENT_PARAMETERS,
+    ENDPOINT_TOTAL_ENERGY,
+    EVENT_ALARM,
+    EVENT_DEMAND_THRESHOLD,
+    EVENT_STEP,
+    SENSORS_1PHASE,
+    SENSORS_3PHASE,
+    STATE_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    STREAM_REFRESH_INTERVALS,
+)
+from .demand import FoxEnergyDemand
+from .errors import FoxEnergyErrorTracker
+from .forecast import FoxEnergyForecast, fit_parameters
+from .pipeline import (
+    FoxEnergyPipeline,
+    FoxEnergyWorkerPool,
+    LoopTimeStats,
+    Sample,
+)
+from .replay import FoxEnergyReplayAPI, ReplayFrame, async_replay
+from .rollups import FoxEnergyHourlyRollup, HourlyRollup
+from .schedule import next_aligned_tick
+from .steps import Appliance, FoxEnergyStepDetector
+from .store import FoxEnergySampleStore
+from .stream import FoxEnergyStreamClient
+from .tariffs import (
+    TARIFF_CALENDARS,
+    FoxEnergyTariffCounters,
+    FoxEnergyTariffZones,
+    TariffCalendar,
 )
 
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:
+    # Home Assistant before 2025.4 only knows has_mean
+    StatisticMeanType = None
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -30,6 +92,27 @@ class FoxEnergyCoordinator(DataUpdateCoordinator):
         host: str,
         timeout: int = 30,
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_rate: float = DEFAULT_REQUEST_RATE,
+        global_limiter: FoxEnergyRequestLimiter | None = None,
+        worker_pool: FoxEnergyWorkerPool | None = None,
+        stream_client: FoxEnergyStreamClient | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        adaptive_timeout: bool = False,
+        transport: str = DEFAULT_TRANSPORT,
+        sample_store_path: Path | None = None,
+        sample_retention_days: int = DEFAULT_SAMPLE_RETENTION_DAYS,
+        external_statistics: bool = False,
+        tariff: str | None = None,
+        demand_tracking: bool = False,
+        demand_peaks: int = DEFAULT_DEMAND_PEAKS,
+        demand_threshold: float = 0,
+        alarm_settings: dict[str, float] | None = None,
+        energy_forecast: bool = False,
+        step_threshold: float = 0,
+        appliances: list[Appliance] | None = None,
+        entry_id: str | None = None,
     ):
         """Initialize coordinator.
 
@@ -38,24 +121,1022 @@ class FoxEnergyCoordinator(DataUpdateCoordinator):
             host: Device IP address
             timeout: Request timeout in seconds
             scan_interval: Update interval in seconds
+            max_concurrent: Maximum requests in flight to the device
+            request_rate: Maximum requests per second to the device
+            global_limiter: Limiter shared by all devices
+            worker_pool: Worker pool shared by all devices
+            stream_client: Poller daemon stream samples are received from
+                instead of polling the device (None polls)
+            connect_timeout: Connection establishment timeout in seconds
+            read_timeout: Timeout between socket reads in seconds
+            adaptive_timeout: Derive the timeout from observed latency
+            transport: HTTP client, aiohttp or the lightweight keep-alive one
+            sample_store_path: Directory for stored samples (None disables)
+            sample_retention_days: Days of stored samples to keep
+            external_statistics: Import hourly statistics computed here
+                instead of letting the recorder compile them
+            tariff: Tariff whose zones energy is split into (None disables)
+            demand_tracking: Track 15-minute demand and monthly peaks
+            demand_peaks: Number of highest demand blocks kept per month
+            demand_threshold: Projected demand in W that fires an event
+                (0 disables)
+            alarm_settings: Limits passed to build_alarm_rules (None disables)
+            energy_forecast: Forecast the energy of the next hour and day
+            step_threshold: Smallest power step in W reported as an appliance
+                switching on or off (0 disables)
+            appliances: Appliance signatures power steps are matched against
+            entry_id: Config entry whose entity registry entries are tracked
         """
-        from datetime import timedelta
-
         super().__init__(
             hass,
             _LOGGER,
             name=f"Fox Energy {host}",
-            update_interval=timedelta(seconds=scan_interval),
+            # Polling is driven by the aligned tick scheduler below
+            update_interval=None,
         )
 
         self.host = host
-        self.api = FoxEnergyAPI(host, timeout)
+        self.scan_interval = scan_interval
+        self.skipped_ticks = 0
+        self.last_tick: float | None = None
+        self._poll_task: asyncio.Task | None = None
+        self._tick_handle: asyncio.TimerHandle | None = None
+        self._poll_lock = asyncio.Lock()
+        self._pending_tick: float | None = None
+        self._sample_listeners: list[Callable[[float, dict[str, Any]], None]] = []
+        self.stream_client = stream_client
+        self._stream_unsub: Callable[[], None] | None = None
+        self._stream_waiter: asyncio.Future[dict[str, Any]] | None = None
+        self.sample_store_path = sample_store_path
+        self.sample_retention_days = sample_retention_days
+        self.sample_store: FoxEnergySampleStore | None = None
+        self._write_lock = threading.Lock()
+        self.worker_pool = worker_pool or FoxEnergyWorkerPool(hass.loop)
+        # Storage and statistics rollups run in the worker pool
+        self.pipeline = FoxEnergyPipeline(
+            self.worker_pool, self._process_batch, self._batch_done
+        )
+        self.loop_time = LoopTimeStats()
+        self.external_statistics = external_statistics
+        self._rollup: FoxEnergyHourlyRollup | None = None
+        self.tariff = tariff
+        self.tariff_counters: FoxEnergyTariffCounters | None = None
+        self.demand_tracking = demand_tracking
+        self.demand_peaks = demand_peaks
+        self.demand_threshold = demand_threshold
+        self.demand: FoxEnergyDemand | None = None
+        self.alarm_settings = alarm_settings
+        self.alarms: FoxEnergyAlarms | None = None
+        self.energy_forecast = energy_forecast
+        self.forecast: FoxEnergyForecast | None = None
+        self._refit_task: asyncio.Task | None = None
+        self.step_threshold = step_threshold
+        self.appliances = appliances or []
+        self.steps: FoxEnergyStepDetector | None = None
+        self._release_step_keys: CALLBACK_TYPE | None = None
+        self._store: Store | None = None
+        self._stored_state: dict[str, Any] = {}
+        self.entry_id = entry_id
+        self._enabled_keys: set[str] | None = None
+        self._required_keys: list[frozenset[str]] = []
+        self.errors = FoxEnergyErrorTracker(f"Fox Energy {host}", logger=_LOGGER)
+        self.api = FoxEnergyAPI(
+            host,
+            timeout,
+            max_concurrent=max_concurrent,
+            request_rate=request_rate,
+            global_limiter=global_limiter,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            adaptive_timeout=adaptive_timeout,
+            transport=transport,
+            # A request must finish before the next poll is due
+            timeout_ceiling=scan_interval,
+        )
         self.device_type: str | None = None
         self.model: str | None = None
 
+    async def async_apply_settings(
+        self,
+        *,
+        timeout: int,
+        scan_interval: int,
+        max_concurrent: int,
+        request_rate: float,
+        connect_timeout: float,
+        read_timeout: float,
+        adaptive_timeout: bool,
+        transport: str,
+        sample_store_path: Path | None,
+        sample_retention_days: int,
+        demand_peaks: int,
+        demand_threshold: float,
+        step_threshold: float,
+        appliances: list[Appliance],
+    ) -> None:
+        """Apply changed settings without recreating the coordinator.
+
+        Args are the same as for the constructor.
+        """
+        api = self.api
+        api.timeout = timeout
+        api.connect_timeout = connect_timeout
+        api.read_timeout = read_timeout
+        api.adaptive_timeout = adaptive_timeout
+        api.timeout_ceiling = scan_interval
+        api.set_transport(transport)
+        if (
+            api.limiter.max_concurrent != max_concurrent
+            or api.limiter.rate != request_rate
+        ):
+            api.limiter = FoxEnergyRequestLimiter(max_concurrent, request_rate)
+
+        if sample_store_path != self.sample_store_path:
+            # Workers may still store samples, the store is swapped under the
+            # write lock in the executor
+            await self.pipeline.async_flush()
+            await self.hass.async_add_executor_job(
+                self._switch_sample_store, sample_store_path
+            )
+        self.sample_retention_days = sample_retention_days
+
+        self.demand_peaks = demand_peaks
+        self.demand_threshold = demand_threshold
+        if self.demand is not None:
+            self.demand.peak_count = demand_peaks
+            del self.demand.peaks[demand_peaks:]
+            self.demand.max_gap = self._demand_max_gap()
+
+        self.step_threshold = step_threshold
+        self.appliances = appliances
+        if self.steps is not None:
+            if step_threshold:
+                self.steps.min_step = step_threshold
+                self.steps.appliances = appliances
+            else:
+                self._release_step_keys()
+                self._release_step_keys = None
+                self.steps = None
+
+        if scan_interval != self.scan_interval:
+            self.scan_interval = scan_interval
+            if self._tick_handle is not None:
+                self._tick_handle.cancel()
+                self._schedule_tick()
+
+        _LOGGER.debug("Applied new settings to %s", self.host)
+
+    @property
+    def sensors_config(self) -> dict[str, dict[str, Any]]:
+        """Return the sensor configuration of the detected device type."""
+        if self.device_type == DEVICE_TYPE_3PHASE:
+            return SENSORS_3PHASE
+        return SENSORS_1PHASE
+
+    @property
+    def device_name(self) -> str:
+        """Return the name of the device."""
+        return f"Fox Energy ({self.host})"
+
+    @property
+    def energy_keys(self) -> list[str]:
+        """Return the keys of the monotonic energy readings."""
+        return [
+            key
+            for key, cfg in self.sensors_config.items()
+            if cfg["state_class"] == "total_increasing"
+        ]
+
+    @property
+    def tariff_calendar(self) -> TariffCalendar | None:
+        """Return the zone calendar of the configured tariff."""
+        if self.tariff is None:
+            return None
+        return TARIFF_CALENDARS[self.tariff]
+
+    @property
+    def active_keys(self) -> set[str] | None:
+        """Return keys to fetch and process, None for all.
+
+        These are the keys of enabled entities plus keys required by
+        features computed in the coordinator.
+        """
+        if self._enabled_keys is None:
+            return None
+        return self._enabled_keys.union(*self._required_keys)
+
+    @callback
+    def async_require_keys(self, keys: Iterable[str]) -> CALLBACK_TYPE:
+        """Keep keys processed even when their entities are disabled.
+
+        Args:
+            keys: Sensor keys
+
+        Returns:
+            Callback releasing the keys
+        """
+        required = frozenset(keys)
+        self._required_keys.append(required)
+
+        @callback
+        def release() -> None:
+            self._required_keys.remove(required)
+
+        return release
+
+    @callback
+    def async_track_enabled_entities(self) -> CALLBACK_TYPE:
+        """Follow entity registry changes to skip work for disabled entities.
+
+        Returns:
+            Callback stopping the tracking
+        """
+
+        @callback
+        def _filter(event_data: dict[str, Any]) -> bool:
+            return event_data["action"] != "update" or "disabled_by" in event_data.get(
+                "changes", {}
+            )
+
+        @callback
+        def _registry_updated(event: Any) -> None:
+            self._update_enabled_keys()
+
+        self._update_enabled_keys()
+        return self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, _registry_updated, event_filter=_filter
+        )
+
+    @callback
+    def _update_enabled_keys(self) -> None:
+        """Collect the keys of enabled sensor entities of the config entry."""
+        registry = er.async_get(self.hass)
+        entries = er.async_entries_for_config_entry(registry, self.entry_id)
+        prefix = f"{self.host}_"
+        sensors = [entry for entry in entries if entry.domain == "sensor"]
+
+        # Before entities are registered everything is processed
+        if not sensors:
+            self._enabled_keys = None
+            return
+
+        self._enabled_keys = {
+            entry.unique_id.removeprefix(prefix)
+            for entry in sensors
+            if entry.disabled_by is None
+        }
+        _LOGGER.debug("Active keys of %s: %s", self.host, self.active_keys)
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling on wall-clock aligned ticks, or receiving the stream."""
+        if self.stream_client is not None:
+            self._async_subscribe_stream()
+            return
+        self._schedule_tick()
+
+    @callback
+    def _async_subscribe_stream(self) -> None:
+        """Subscribe to the samples of this meter unless already subscribed."""
+        if self.stream_client is not None and self._stream_unsub is None:
+            self._stream_unsub = self.stream_client.subscribe(
+                self.host, self._handle_stream_sample, self._handle_stream_error
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling, cancel a poll still in flight and close connections."""
+        if self._stream_unsub is not None:
+            self._stream_unsub()
+            self._stream_unsub = None
+        if self._stream_waiter is not None and not self._stream_waiter.done():
+            self._stream_waiter.cancel()
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        if self._poll_task is not None and not self._poll_task.done():
+            self._poll_task.cancel()
+        self.api.close()
+
+    @callback
+    def _schedule_tick(self) -> None:
+        """Schedule the next tick on an exact multiple of the scan interval.
+
+        The delay is recomputed from the wall clock on every tick, so timer
+        drift never accumulates and ticks of all meters stay aligned.
+        """
+        now = time.time()
+        tick = next_aligned_tick(max(now, self.last_tick or 0), self.scan_interval)
+        self._tick_handle = self.hass.loop.call_later(
+            tick - now, self._handle_tick, tick
+        )
+
+    @callback
+    def _handle_tick(self, tick: float) -> None:
+        """Start a poll unless the previous one is still in flight.
+
+        Args:
+            tick: Unix timestamp of the tick
+        """
+        self.last_tick = tick
+        self._schedule_tick()
+
+        if self._poll_task is not None and not self._poll_task.done():
+            self.skipped_ticks += 1
+            _LOGGER.debug(
+                "Skipping poll of %s, previous poll still in flight (%s skipped)",
+                self.host,
+                self.skipped_ticks,
+            )
+            return
+
+        self._pending_tick = tick
+        self._poll_task = self.hass.async_create_background_task(
+            self.async_refresh(), f"{self.name} poll"
+        )
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from device.
 
+        Returns:
+            Unified data dictionary
+
+        Raises:
+            UpdateFailed: If data fetch fails
+        """
+        if self.stream_client is not None:
+            return await self._async_wait_stream_sample()
+
+        # Sample time is the tick that triggered the poll, so samples of all
+        # meters line up; manual refreshes use the current time
+        timestamp = self._pending_tick or time.time()
+        self._pending_tick = None
+
+        # Manual refreshes and scheduled ticks never poll the meter in parallel
+        async with self._poll_lock:
+            try:
+                data = await self._async_poll()
+            finally:
+                self.errors.log_summaries()
+
+        self._publish_sample(timestamp, data)
+        return data
+
+    async def _async_wait_stream_sample(self) -> dict[str, Any]:
+        """Wait for the next sample streamed by the daemon.
+
+        A streamed meter is never polled by Home Assistant, so the first
+        refresh and manual refreshes get the next sample of the daemon.
+
+        Returns:
+            Unified data dictionary
+
+        Raises:
+            UpdateFailed: If the daemon reports an error or sends no sample
+        """
+        self._async_subscribe_stream()
+        if self._stream_waiter is None or self._stream_waiter.done():
+            self._stream_waiter = self.hass.loop.create_future()
+        waiter = self._stream_waiter
+        try:
+            async with asyncio.timeout(STREAM_REFRESH_INTERVALS * self.scan_interval):
+                return await waiter
+        except TimeoutError as err:
+            raise UpdateFailed(
+                f"No sample of {self.host} received from the poller daemon"
+            ) from err
+        finally:
+            if self._stream_waiter is waiter:
+                self._stream_waiter = None
+
+    @callback
+    def _handle_stream_sample(
+        self, timestamp: float, data: dict[str, Any], device_type: str
+    ) -> None:
+        """Publish a sample polled by the daemon like a polled one.
+
+        Args:
+            timestamp: Unix timestamp of the tick the daemon polled on
+            data: Processed sample
+            device_type: Device type detected by the daemon
+        """
+        if self.device_type is None:
+            self.device_type = device_type
+        data["last_update"] = utcnow()
+        data["device_type"] = self.device_type
+        self._publish_sample(timestamp, data)
+        if self._stream_waiter is not None and not self._stream_waiter.done():
+            # A refresh is waiting and sets the data itself
+            self._stream_waiter.set_result(data)
+            return
+        self.async_set_updated_data(data)
+
+    @callback
+    def _handle_stream_error(self, message: str) -> None:
+        """Mark the entities unavailable after a failed poll of the daemon.
+
+        Args:
+            message: Error reported by the daemon or the stream client
+        """
+        self.errors.record("stream", "Stream error: %s", message)
+        if self._stream_waiter is not None and not self._stream_waiter.done():
+            self._stream_waiter.set_exception(UpdateFailed(message))
+            return
+        self.async_set_update_error(UpdateFailed(message))
+
+    @callback
+    def async_add_sample_listener(
+        self, listener: Callable[[float, dict[str, Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for processed samples.
+
+        Listeners run on the event loop after every successful poll and
+        must be cheap.
+
+        Args:
+            listener: Called with the sample timestamp and data
+
+        Returns:
+            Callback removing the listener
+        """
+        self._sample_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._sample_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _publish_sample(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Pass a processed sample to the analytics stages and listeners.
+
+        Per-sample features run on the event loop; storage and statistics
+        rollups are batched to the worker pool. The loop time of every
+        sample is checked against the budget.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+        """
+        start = time.perf_counter()
+        if self.tariff is not None:
+            self._account_tariff(timestamp, data)
+        if self.demand_tracking:
+            self._track_demand(timestamp, data)
+        if self.energy_forecast:
+            self._update_forecast(timestamp, data)
+        if self.alarm_settings:
+            self._evaluate_alarms(timestamp, data)
+        if self.step_threshold:
+            self._detect_steps(data)
+        if self.sample_store_path is not None or self.external_statistics:
+            self.pipeline.add(timestamp, data)
+
+        for listener in list(self._sample_listeners):
+            try:
+                listener(timestamp, data)
+            except Exception:
+                _LOGGER.exception("Error in sample listener for %s", self.host)
+
+        elapsed = time.perf_counter() - start
+        self.loop_time.add(elapsed)
+        if elapsed > self.loop_time.budget:
+            _LOGGER.debug(
+                "Processing a sample of %s took %.1f ms", self.host, elapsed * 1000
+            )
+
+    def _process_batch(self, batch: list[Sample]) -> list[HourlyRollup]:
+        """Store and aggregate a batch of samples (worker thread).
+
+        Args:
+            batch: Samples as (timestamp, data)
+
+        Returns:
+            Completed hourly rollups to import
+        """
+        rollups = []
+        for timestamp, data in batch:
+            if self.sample_store_path is not None:
+                self._store_sample(timestamp, data)
+            if self.external_statistics:
+                rollup = self._rollup_sample(timestamp, data)
+                if rollup is not None:
+                    rollups.append(rollup)
+        return rollups
+
+    @callback
+    def _batch_done(self, rollups: list[HourlyRollup]) -> None:
+        """Import the statistics of a processed batch."""
+        for rollup in rollups:
+            self._import_statistics(rollup)
+
+    @callback
+    def _evaluate_alarms(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Check alarm rules and fire an event for every transition.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+        """
+        alarms = self.alarms
+        if alarms is None:
+            alarms = self.alarms = FoxEnergyAlarms(
+                build_alarm_rules(self.device_type, **self.alarm_settings)
+            )
+            self.async_require_keys(alarms.fields)
+
+        for rule, active, value in alarms.evaluate(timestamp, data):
+            _LOGGER.debug(
+                "Alarm %s of %s %s at %s",
+                rule.key,
+                self.host,
+                "raised" if active else "cleared",
+                value,
+            )
+            self.hass.bus.async_fire(
+                EVENT_ALARM,
+                {
+                    "host": self.host,
+                    "alarm": rule.key,
+                    "name": rule.name,
+                    "active": active,
+                    "value": value,
+                    "threshold": rule.threshold,
+                },
+            )
+
+    @callback
+    def _detect_steps(self, data: dict[str, Any]) -> None:
+        """Fire an event for every power step change of a phase.
+
+        Args:
+            data: Processed sample
+        """
+        steps = self.steps
+        if steps is None:
+            steps = self.steps = FoxEnergyStepDetector(
+                self.device_type, self.step_threshold, self.appliances
+            )
+            self._release_step_keys = self.async_require_keys(steps.fields)
+
+        for step in steps.add(data):
+            self.hass.bus.async_fire(
+                EVENT_STEP,
+                {
+                    "host": self.host,
+                    "phase": step.phase,
+                    "state": "on" if step.power_delta > 0 else "off",
+                    "power_delta": step.power_delta,
+                    "reactive_power_delta": step.reactive_power_delta,
+                    "power": step.power,
+                    "reactive_power": step.reactive_power,
+                    "appliance": step.appliance,
+                },
+            )
+
+    async def async_load_state(self) -> None:
+        """Load the persisted tariff counters, demand peaks and forecast model."""
+        if (
+            self.tariff is None
+            and not self.demand_tracking
+            and not self.energy_forecast
+        ):
+            return
+        self._store = Store(
+            self.hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=self.entry_id)
+        )
+        self._stored_state = await self._store.async_load() or {}
+
+    def _state_to_save(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        state: dict[str, Any] = {}
+        if self.tariff_counters is not None:
+            state["tariff"] = self.tariff_counters.as_dict()
+        if self.demand is not None:
+            state["demand"] = self.demand.as_dict()
+        if self.forecast is not None:
+            state["forecast"] = self.forecast.as_dict()
+        return state
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Write the state after a delay, coalescing changes."""
+        if self._store is not None:
+            # Pending writes are also flushed when Home Assistant stops
+            self._store.async_delay_save(self._state_to_save, STATE_SAVE_DELAY)
+
+    async def async_save_state(self) -> None:
+        """Write the persisted state now."""
+        if self._store is not None:
+            await self._store.async_save(self._state_to_save())
+
+    @callback
+    def _account_tariff(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Split the energy of a sample into tariff zones.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, the zone counters are added to it
+        """
+        counters = self.tariff_counters
+        if counters is None:
+            energy_keys = self.energy_keys
+            counters = self.tariff_counters = FoxEnergyTariffCounters(
+                FoxEnergyTariffZones(
+                    self.tariff_calendar, get_time_zone(self.hass.config.time_zone)
+                ),
+                energy_keys,
+            )
+            counters.restore(self._stored_state.get("tariff", {}))
+            # Counters need the readings even if their entities are disabled
+            self.async_require_keys(energy_keys)
+
+        if counters.add(timestamp, data):
+            self._schedule_save()
+
+    def _demand_max_gap(self) -> float:
+        """Return how long a power sample holds for demand averages."""
+        return 3 * self.scan_interval
+
+    @property
+    def import_energy_key(self) -> str:
+        """Return the key of the total import energy."""
+        if self.device_type == DEVICE_TYPE_3PHASE:
+            return "energia_pobrana_suma"
+        return "energia_pobrana"
+
+    @property
+    def power_key(self) -> str:
+        """Return the key of the total active power."""
+        if self.device_type == DEVICE_TYPE_3PHASE:
+            return "moc_czynna_suma"
+        return "moc_czynna"
+
+    @callback
+    def _track_demand(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Update the demand averages and fire an event on a projected excess.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, the demand values are added to it
+        """
+        demand = self.demand
+        if demand is None:
+            demand = self.demand = FoxEnergyDemand(
+                get_time_zone(self.hass.config.time_zone),
+                self.demand_peaks,
+                self._demand_max_gap(),
+            )
+            demand.restore(self._stored_state.get("demand", {}))
+            self.async_require_keys([self.power_key])
+
+        if demand.add(timestamp, data.get(self.power_key)) is not None:
+            self._schedule_save()
+        if demand.check_threshold(self.demand_threshold):
+            self.hass.bus.async_fire(
+                EVENT_DEMAND_THRESHOLD,
+                {
+                    "host": self.host,
+                    "block_start": utc_from_timestamp(demand.block_start).isoformat(),
+                    "average": demand.average,
+                    "projected": demand.projected,
+                    "threshold": self.demand_threshold,
+                },
+            )
+        data.update(demand.values())
+
+    @callback
+    def _update_forecast(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Feed the forecast model and refit it once a day.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, the forecasts are added to it
+        """
+        forecast = self.forecast
+        if forecast is None:
+            forecast = self.forecast = FoxEnergyForecast(
+                get_time_zone(self.hass.config.time_zone)
+            )
+            forecast.restore(self._stored_state.get("forecast", {}))
+            self.async_require_keys([self.import_energy_key])
+
+        if forecast.add(timestamp, data.get(self.import_energy_key)):
+            self._schedule_save()
+            if forecast.refit_due and self._refit_task is None:
+                self._refit_task = self.hass.async_create_background_task(
+                    self._async_refit_forecast(), f"{self.name} forecast refit"
+                )
+        data.update(forecast.values())
+
+    async def _async_refit_forecast(self) -> None:
+        """Refit the forecast smoothing factors in the worker pool."""
+        forecast = self.forecast
+        future = self.worker_pool.submit(fit_parameters, list(forecast.history))
+        if future is None:
+            # Pool saturated, retried after the next hour
+            self._refit_task = None
+            return
+        try:
+            parameters = await future
+        finally:
+            self._refit_task = None
+        _LOGGER.debug("Refitted forecast of %s: %s", self.host, parameters)
+        forecast.set_parameters(parameters)
+        self._schedule_save()
+
+    def _store_sample(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Buffer a sample and write full blocks (worker thread).
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+        """
+        # A flush or a new store path may change the store from another thread
+        with self._write_lock:
+            path = self.sample_store_path
+            if path is None:
+                return
+            if self.sample_store is None:
+                self.sample_store = FoxEnergySampleStore(
+                    path, list(self.sensors_config)
+                )
+            block = self.sample_store.append(timestamp, data)
+            if block is not None:
+                self._write_samples(block)
+
+    def _rollup_sample(
+        self, timestamp: float, data: dict[str, Any]
+    ) -> HourlyRollup | None:
+        """Aggregate a sample (worker thread).
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            The previous hour once a sample of a later hour arrives
+        """
+        if self._rollup is None:
+            sensors = self.sensors_config
+            self._rollup = FoxEnergyHourlyRollup(
+                [
+                    key
+                    for key, cfg in sensors.items()
+                    if cfg["state_class"] == "measurement"
+                ],
+                self.energy_keys,
+            )
+
+        return self._rollup.add(timestamp, data)
+
+    @callback
+    def _import_statistics(self, rollup: HourlyRollup) -> None:
+        """Import an hourly rollup as external statistics.
+
+        Args:
+            rollup: Completed hour
+        """
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, dropping statistics of %s", self.host)
+            return
+
+        start = utc_from_timestamp(rollup.start)
+
+        for key, (mean, low, high) in rollup.measurements.items():
+            async_add_external_statistics(
+                self.hass,
+                self._statistic_metadata(key, measurement=True),
+                [StatisticData(start=start, mean=mean, min=low, max=high)],
+            )
+        for key, reading in rollup.energy.items():
+            async_add_external_statistics(
+                self.hass,
+                self._statistic_metadata(key, measurement=False),
+                [StatisticData(start=start, state=reading, sum=reading)],
+            )
+
+    def _statistic_metadata(self, key: str, measurement: bool) -> StatisticMetaData:
+        """Build external statistic metadata for a sensor key.
+
+        Args:
+            key: Sensor key
+            measurement: True for measurements, False for energy counters
+
+        Returns:
+            Statistic metadata
+        """
+        config = self.sensors_config[key]
+        slug = re.sub(r"[^a-z0-9]+", "_", f"{self.host}_{key}".lower())
+        if StatisticMeanType is None:
+            mean: dict[str, Any] = {"has_mean": measurement}
+        else:
+            mean = {
+                "mean_type": (
+                    StatisticMeanType.ARITHMETIC
+                    if measurement
+                    else StatisticMeanType.NONE
+                )
+            }
+        return StatisticMetaData(
+            **mean,
+            has_sum=not measurement,
+            name=f"Fox Energy ({self.host}) {config['name']}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{slug}",
+            unit_of_measurement=config["unit"],
+        )
+
+    def _write_samples(self, block: list[list[Any]]) -> None:
+        """Write a block of samples and drop expired files (blocking).
+
+        The caller holds the write lock.
+
+        Args:
+            block: Rows of [timestamp, *values]
+        """
+        self.sample_store.write_block(block)
+        self.sample_store.prune(self.sample_retention_days)
+
+    def _write_pending(self) -> None:
+        """Write the rows buffered in the sample store (blocking).
+
+        The caller holds the write lock.
+        """
+        if self.sample_store is None:
+            return
+        block = self.sample_store.take_pending()
+        if block:
+            self._write_samples(block)
+
+    def _flush_pending(self) -> None:
+        """Write the rows buffered in the sample store (blocking)."""
+        with self._write_lock:
+            self._write_pending()
+
+    def _switch_sample_store(self, path: Path | None) -> None:
+        """Write the buffered rows and store later samples under path (blocking).
+
+        Args:
+            path: Directory for stored samples (None disables)
+        """
+        with self._write_lock:
+            self._write_pending()
+            self.sample_store = None
+            self.sample_store_path = path
+
+    async def async_flush_samples(self) -> None:
+        """Write buffered samples to disk."""
+        await self.pipeline.async_flush()
+        if self.sample_store is None:
+            return
+        # Workers may append meanwhile, the buffer is only taken under the
+        # write lock in the executor
+        await self.hass.async_add_executor_job(self._flush_pending)
+
+    async def async_capture(self, path: Path, duration: float) -> dict[str, Any]:
+        """Record raw meter responses to a file while polling continues.
+
+        Args:
+            path: Capture file
+            duration: Seconds to capture
+
+        Returns:
+            Capture file and number of recorded responses
+        """
+        capture = FoxEnergyCapture(path)
+        api = self.api
+        api.capture = capture
+        try:
+            deadline = self.hass.loop.time() + duration
+            while (remaining := deadline - self.hass.loop.time()) > 0:
+                await asyncio.sleep(min(remaining, CAPTURE_FLUSH_INTERVAL))
+                await self.hass.async_add_executor_job(
+                    capture.write, capture.take_pending()
+                )
+        finally:
+            if api.capture is capture:
+                api.capture = None
+            await self.hass.async_add_executor_job(
+                capture.write, capture.take_pending()
+            )
+
+        return {"host": self.host, "path": str(path), "responses": capture.count}
+
+    async def async_burst_capture(
+        self, duration: float
+    ) -> tuple[dict[str, Any], FoxEnergyBurstBuffer]:
+        """Sample current parameters back-to-back for a short window.
+
+        Scheduled polling is paused and entities are not updated while the
+        burst runs; normal polling resumes afterwards.
+
+        Args:
+            duration: Seconds to sample
+
+        Returns:
+            Capture statistics and the buffer holding the series
+        """
+        paused = self._tick_handle is not None
+        if paused:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+        try:
+            # Waits for a poll still in flight
+            async with self._poll_lock:
+                if self.device_type is None:
+                    self.device_type = await self.api.detect_device_type()
+
+                keys = FoxEnergyDataProcessor.endpoint_keys(
+                    self.device_type, ENDPOINT_CURRENT_PARAMETERS
+                )
+                processor = (
+                    FoxEnergyDataProcessor.process_3phase_data
+                    if self.device_type == DEVICE_TYPE_3PHASE
+                    else FoxEnergyDataProcessor.process_1phase_data
+                )
+                buffer = FoxEnergyBurstBuffer(
+                    keys, math.ceil(duration * BURST_MAX_RATE)
+                )
+                result = await async_burst_capture(
+                    partial(self.api.get_current_parameters, fresh=True),
+                    partial(
+                        processor, total_energy=None, keys=keys, errors=self.errors
+                    ),
+                    buffer,
+                    duration,
+                )
+        finally:
+            if paused:
+                self._schedule_tick()
+
+        _LOGGER.debug("Burst capture of %s: %s", self.host, result)
+        return {"host": self.host, **result}, buffer
+
+    async def async_replay(
+        self, frames: Iterable[ReplayFrame], speed: float | None = 1.0
+    ) -> dict[str, Any]:
+        """Run captured responses through a replay copy of this coordinator.
+
+        The copy has the tariff, demand and forecast settings of this meter
+        but no sample store, statistics import, persisted state or events,
+        so neither this coordinator nor the stored history is touched and
+        polling continues meanwhile.
+
+        Args:
+            frames: Captured polls in order
+            speed: Replay speed (1.0 = real time, None = as fast as possible)
+
+        Returns:
+            Number of frames, failed polls, elapsed seconds and frames per
+            second
+        """
+        replay = FoxEnergyCoordinator(
+            self.hass,
+            self.host,
+            scan_interval=self.scan_interval,
+            worker_pool=self.worker_pool,
+            tariff=self.tariff,
+            demand_tracking=self.demand_tracking,
+            demand_peaks=self.demand_peaks,
+            energy_forecast=self.energy_forecast,
+        )
+        replay.api = replay_api = FoxEnergyReplayAPI(self.host)
+        failed = 0
+
+        async def poll(timestamp: float) -> None:
+            nonlocal failed
+            replay._pending_tick = timestamp
+            await replay.async_refresh()
+            if not replay.last_update_success:
+                failed += 1
+
+        try:
+            result = await async_replay(frames, replay_api, poll, speed)
+        finally:
+            replay.async_stop()
+        return {**result, "failed": failed}
+
+    @staticmethod
+    async def _fetch(
+        needed: bool, request: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any] | None:
+        """Run request if its data is needed.
+
+        Args:
+            needed: Whether any active key is served by the endpoint
+            request: API call fetching the endpoint
+
+        Returns:
+            Endpoint response, None if skipped
+        """
+        return await request() if needed else None
+
+    async def _async_poll(self) -> dict[str, Any]:
+        """Poll the device and process the response.
+
         Returns:
             Unified data dictionary
 
@@ -72,18 +1153,30 @@ class FoxEnergyCoordinator(DataUpdateCoordinator):
                     self.device_type,
                 )
 
-            # Fetch both endpoints
-            current_params = await self.api.get_current_parameters()
-            total_energy = await self.api.get_total_energy()
+            # Fetch only endpoints serving enabled entities, the API limiters
+            # bound real concurrency
+            keys = self.active_keys
+            endpoints = FoxEnergyDataProcessor.required_endpoints(
+                self.device_type, keys
+            )
+            current_params, total_energy = await asyncio.gather(
+                self._fetch(
+                    ENDPOINT_CURRENT_PARAMETERS in endpoints,
+                    self.api.get_current_parameters,
+                ),
+                self._fetch(
+                    ENDPOINT_TOTAL_ENERGY in endpoints, self.api.get_total_energy
+                ),
+            )
 
             # Process data based on device type
             if self.device_type == DEVICE_TYPE_3PHASE:
                 data = FoxEnergyDataProcessor.process_3phase_data(
-                    current_params, total_energy
+                    current_params, total_energy, keys, self.errors
                 )
             else:
                 data = FoxEnergyDataProcessor.process_1phase_data(
-                    current_params, total_energy
+                    current_params, total_energy, keys, self.errors
                 )
 
             # Add metadata
@@ -93,9 +1186,11 @@ class FoxEnergyCoordinator(DataUpdateCoordinator):
             return data
 
         except FoxEnergyConnectionError as err:
+            self.errors.record("connection", "Connection error: %s", err)
             raise UpdateFailed(f"Connection error: {err}") from err
         except FoxEnergyInvalidResponse as err:
+            self.errors.record("invalid_response", "Invalid response: %s", err)
             raise UpdateFailed(f"Invalid response: {err}") from err
         except Exception as err:
-            _LOGGER.error("Unexpected error updating data: %s", err)
+            self.errors.record("unexpected", "Unexpected error updating data: %r", err)
             raise UpdateFailed(f"Unexpected error: {err}") from err
@@ -0,0 +1,333 @@
+"""Standalone poller daemon streaming Fox Energy samples to Home Assistant.
+
+Needs only aiohttp, not Home Assistant, e.g.::
+
+    python -m custom_components.fox_energy.daemon \
+        --listen /run/fox_energy.sock 192.168.3.101 192.168.3.102
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import signal
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from .api import (
+    FoxEnergyAPI,
+    FoxEnergyConnectionError,
+    FoxEnergyDataProcessor,
+    FoxEnergyInvalidResponse,
+    FoxEnergyRequestLimiter,
+)
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DEVICE_TYPE_3PHASE,
+    GLOBAL_MAX_CONCURRENT_REQUESTS,
+    TRANSPORT_KEEPALIVE,
+    TRANSPORTS,
+)
+from .errors import FoxEnergyErrorTracker
+from .schedule import next_aligned_tick
+from .stream import (
+    StreamMeter,
+    async_start_stream_server,
+    encode_error,
+    encode_hello,
+    parse_address,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bytes buffered for a client before it is disconnected as too slow
+MAX_CLIENT_BUFFER = 4 << 20
+
+
+class _DaemonMeter:
+    """Polling state of one meter."""
+
+    __slots__ = ("api", "errors", "poll_task", "skipped_ticks", "stream")
+
+    def __init__(self, index: int, api: FoxEnergyAPI):
+        """Initialize the meter, announced without a sample layout yet."""
+        self.api = api
+        self.errors = FoxEnergyErrorTracker(f"Fox Energy {api.host}", logger=_LOGGER)
+        self.stream = StreamMeter(index, api.host, "", [])
+        self.poll_task: asyncio.Task | None = None
+        self.skipped_ticks = 0
+
+
+class FoxEnergyDaemon:
+    """Poll meters concurrently and stream the processed samples.
+
+    All meters are polled on the same wall-clock aligned ticks as the
+    integration does, through the same API client, limiters and data
+    processing. Every connected client receives each sample as a binary
+    frame; clients that fall behind are disconnected rather than buffered
+    without bound.
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str],
+        address: str,
+        scan_interval: float = DEFAULT_SCAN_INTERVAL,
+        timeout: int = DEFAULT_TIMEOUT,
+        transport: str = TRANSPORT_KEEPALIVE,
+        max_concurrent: int = GLOBAL_MAX_CONCURRENT_REQUESTS,
+    ):
+        """Initialize the daemon.
+
+        Args:
+            hosts: Meter hosts
+            address: Unix socket path or host:port to listen on
+            scan_interval: Seconds between polls
+            timeout: Request timeout in seconds
+            transport: HTTP client, aiohttp or the lightweight keep-alive one
+            max_concurrent: Maximum requests in flight to all meters
+        """
+        self.address = address
+        self.scan_interval = scan_interval
+        limiter = FoxEnergyRequestLimiter(max_concurrent)
+        self.meters = [
+            _DaemonMeter(
+                index,
+                FoxEnergyAPI(
+                    host,
+                    timeout,
+                    global_limiter=limiter,
+                    transport=transport,
+                    timeout_ceiling=scan_interval,
+                ),
+            )
+            for index, host in enumerate(dict.fromkeys(hosts))
+        ]
+        self.samples = 0
+        self.failed_polls = 0
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+        self._tick_handle: asyncio.TimerHandle | None = None
+
+    async def async_start(self) -> None:
+        """Start listening and polling."""
+        self._server = await async_start_stream_server(
+            self._async_handle_client, self.address
+        )
+        self._schedule_tick()
+        _LOGGER.info(
+            "Polling %s meters every %s s, streaming on %s",
+            len(self.meters),
+            self.scan_interval,
+            self.address,
+        )
+
+    async def async_stop(self) -> None:
+        """Stop polling and disconnect clients."""
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        tasks = [
+            meter.poll_task
+            for meter in self.meters
+            if meter.poll_task is not None and not meter.poll_task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for meter in self.meters:
+            meter.api.close()
+        clients = list(self._clients)
+        self._clients.clear()
+        for writer in clients:
+            writer.close()
+        await asyncio.gather(
+            *(writer.wait_closed() for writer in clients), return_exceptions=True
+        )
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def bound_address(self) -> str:
+        """Return the address listened on, with the port chosen for port 0."""
+        _host, port = parse_address(self.address)
+        if port is None:
+            return self.address
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"{host}:{port}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return daemon counters."""
+        return {
+            "meters": len(self.meters),
+            "clients": len(self._clients),
+            "samples": self.samples,
+            "failed_polls": self.failed_polls,
+            "skipped_ticks": sum(meter.skipped_ticks for meter in self.meters),
+        }
+
+    def _schedule_tick(self) -> None:
+        """Schedule the next tick on an exact multiple of the scan interval."""
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        tick = next_aligned_tick(now, self.scan_interval)
+        self._tick_handle = loop.call_later(tick - now, self._handle_tick, tick)
+
+    def _handle_tick(self, tick: float) -> None:
+        """Poll every meter whose previous poll has finished."""
+        self._schedule_tick()
+        loop = asyncio.get_running_loop()
+        for meter in self.meters:
+            if meter.poll_task is not None and not meter.poll_task.done():
+                meter.skipped_ticks += 1
+                continue
+            meter.poll_task = loop.create_task(self._async_poll(meter, tick))
+
+    async def _async_poll(self, meter: _DaemonMeter, tick: float) -> None:
+        """Poll a meter and stream its sample or the error.
+
+        Args:
+            meter: Meter to poll
+            tick: Unix timestamp of the tick, used as sample time
+        """
+        api = meter.api
+        stream = meter.stream
+        try:
+            if not stream.device_type:
+                device_type = await api.detect_device_type()
+                _LOGGER.info("Meter at %s detected as %s", api.host, device_type)
+            else:
+                device_type = stream.device_type
+            current_params, total_energy = await asyncio.gather(
+                api.get_current_parameters(), api.get_total_energy()
+            )
+            if device_type == DEVICE_TYPE_3PHASE:
+                data = FoxEnergyDataProcessor.process_3phase_data(
+                    current_params, total_energy, errors=meter.errors
+                )
+            else:
+                data = FoxEnergyDataProcessor.process_1phase_data(
+                    current_params, total_energy, errors=meter.errors
+                )
+        except (FoxEnergyConnectionError, FoxEnergyInvalidResponse) as err:
+            meter.errors.record("poll", "Poll failed: %s", err)
+            self.failed_polls += 1
+            self._broadcast(encode_error(stream.index, str(err)))
+            return
+        except Exception as err:  # noqa: BLE001
+            meter.errors.record("unexpected", "Unexpected error polling: %r", err)
+            self.failed_polls += 1
+            self._broadcast(encode_error(stream.index, f"Unexpected error: {err}"))
+            return
+        finally:
+            meter.errors.log_summaries()
+
+        if stream.device_type != device_type or stream.keys != list(data):
+            # First sample fixes the layout, announce it before the sample
+            stream = meter.stream = StreamMeter(
+                stream.index, api.host, device_type, list(data)
+            )
+            self._broadcast(stream.encode_meter())
+        self.samples += 1
+        self._broadcast(stream.encode_sample(tick, data))
+
+    def _broadcast(self, frame: bytes) -> None:
+        """Send a frame to every client, dropping clients that fall behind."""
+        for writer in list(self._clients):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                _LOGGER.warning(
+                    "Disconnecting stream client %s, not keeping up",
+                    writer.get_extra_info("peername"),
+                )
+                self._clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    async def _async_handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Announce all meters to a new client and stream until it leaves."""
+        writer.write(encode_hello())
+        for meter in self.meters:
+            writer.write(meter.stream.encode_meter())
+        self._clients.add(writer)
+        _LOGGER.debug("Stream client connected (%s)", len(self._clients))
+        try:
+            # Clients send nothing, wait for them to disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+            _LOGGER.debug("Stream client disconnected (%s)", len(self._clients))
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the daemon until interrupted."""
+    daemon = FoxEnergyDaemon(
+        args.hosts,
+        args.listen,
+        scan_interval=args.scan_interval,
+        timeout=args.timeout,
+        transport=args.transport,
+        max_concurrent=args.max_concurrent,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+
+    await daemon.async_start()
+    try:
+        await stop.wait()
+    finally:
+        await daemon.async_stop()
+        _LOGGER.info("Stopped: %s", daemon.as_dict())
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the command line and run the daemon."""
+    parser = argparse.ArgumentParser(
+        description="Poll Fox Energy meters and stream samples to Home Assistant."
+    )
+    parser.add_argument("hosts", nargs="+", help="meter hosts (IP or IP:port)")
+    parser.add_argument(
+        "--listen",
+        required=True,
+        help="Unix socket path or host:port to stream samples on",
+    )
+    parser.add_argument(
+        "--scan-interval", type=float, default=DEFAULT_SCAN_INTERVAL, help="seconds"
+    )
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="seconds")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=TRANSPORT_KEEPALIVE)
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=GLOBAL_MAX_CONCURRENT_REQUESTS,
+        help="requests in flight to all meters",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        parse_address(args.listen)
+    except ValueError as err:
+        parser.error(str(err))
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""15-minute demand tracking for Fox Energy integration."""
+
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from typing import Any
+
+# Length of a demand block in seconds
+DEMAND_BLOCK = 900
+# Projections earlier in a block are too noisy to alert on
+DEMAND_PROJECTION_MIN_ELAPSED = 60
+
+DEMAND_KEY = "moc_15min"
+DEMAND_PROJECTED_KEY = "moc_15min_prognoza"
+PEAK_DEMAND_KEY = "moc_szczytowa"
+PEAK_DEMAND_MEAN_KEY = "moc_szczytowa_srednia"
+
+DEMAND_SENSORS: dict[str, dict[str, Any]] = {
+    DEMAND_KEY: {
+        "name": "15-Minute Demand",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:gauge",
+    },
+    DEMAND_PROJECTED_KEY: {
+        "name": "15-Minute Demand Projected",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:gauge",
+    },
+    PEAK_DEMAND_KEY: {
+        "name": "Monthly Peak Demand",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": None,
+        "icon": "mdi:chart-bell-curve-cumulative",
+    },
+    PEAK_DEMAND_MEAN_KEY: {
+        "name": "Monthly Peak Demand Mean",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": None,
+        "icon": "mdi:chart-bell-curve-cumulative",
+    },
+}
+
+
+@dataclass(slots=True)
+class DemandBlock:
+    """Average demand of one completed block.
+
+    Attributes:
+        start: Unix timestamp of the start of the block
+        average: Average active power in W
+    """
+
+    start: float
+    average: float
+
+
+class FoxEnergyDemand:
+    """Track 15-minute average demand and the monthly peaks.
+
+    Power is integrated as a step function, each sample holding until the
+    next one. Gaps longer than max_gap are not integrated, and averages are
+    taken over the covered time only. Memory use is constant: the current
+    block and the top peaks of the month.
+    """
+
+    def __init__(self, time_zone: tzinfo, peaks: int = 3, max_gap: float = 60.0):
+        """Initialize the tracker.
+
+        Args:
+            time_zone: Time zone months are counted in
+            peaks: Number of highest blocks kept per month
+            max_gap: Longest time in seconds a sample holds
+        """
+        self.time_zone = time_zone
+        self.peak_count = peaks
+        self.max_gap = min(max_gap, DEMAND_BLOCK)
+        self.block_start: float | None = None
+        self.average: float | None = None
+        self.projected: float | None = None
+        self.month: str | None = None
+        self.peaks: list[DemandBlock] = []
+        self._energy = 0.0
+        self._covered = 0.0
+        self._last_timestamp: float | None = None
+        self._last_power: float | None = None
+        self._alerted = False
+
+    def add(self, timestamp: float, power: float | None) -> DemandBlock | None:
+        """Add a power sample.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            power: Active power in W, None if missing
+
+        Returns:
+            The previous block once a sample of a later block arrives
+        """
+        block = timestamp - timestamp % DEMAND_BLOCK
+        last = self._last_timestamp
+        hold = (
+            last is not None
+            and self._last_power is not None
+            and 0 < timestamp - last <= self.max_gap
+        )
+
+        completed = None
+        if self.block_start is None:
+            self.block_start = block
+        elif block > self.block_start:
+            if hold:
+                # The previous sample holds until the block boundary
+                self._integrate(block - last)
+                last = block
+            completed = self._complete()
+            self.block_start = block
+        if hold:
+            self._integrate(timestamp - last)
+        self._last_timestamp = timestamp
+        self._last_power = power
+
+        remaining = self.block_start + DEMAND_BLOCK - timestamp
+        if self._covered:
+            self.average = self._energy / self._covered
+        else:
+            self.average = power
+        if power is None:
+            self.projected = self.average
+        else:
+            self.projected = (self._energy + power * remaining) / (
+                self._covered + remaining
+            )
+        return completed
+
+    def _integrate(self, seconds: float) -> None:
+        """Add the energy of the last sample held for seconds."""
+        self._energy += self._last_power * seconds
+        self._covered += seconds
+
+    def _complete(self) -> DemandBlock | None:
+        """Finish the current block and update the monthly peaks."""
+        completed = None
+        if self._covered:
+            completed = DemandBlock(self.block_start, self._energy / self._covered)
+            month = datetime.fromtimestamp(completed.start, self.time_zone).strftime(
+                "%Y-%m"
+            )
+            if month != self.month:
+                self.month = month
+                self.peaks = []
+            self.peaks.append(completed)
+            self.peaks.sort(key=lambda peak: peak.average, reverse=True)
+            del self.peaks[self.peak_count :]
+
+        self._energy = 0.0
+        self._covered = 0.0
+        self._alerted = False
+        return completed
+
+    def check_threshold(self, threshold: float) -> bool:
+        """Return True the first time in a block the projection exceeds threshold.
+
+        Args:
+            threshold: Demand in W, 0 disables
+
+        Returns:
+            True if an alert should be raised
+        """
+        if (
+            not threshold
+            or self._alerted
+            or self.projected is None
+            or self.projected <= threshold
+            or self._last_timestamp - self.block_start < DEMAND_PROJECTION_MIN_ELAPSED
+        ):
+            return False
+        self._alerted = True
+        return True
+
+    def values(self) -> dict[str, float | None]:
+        """Return the sensor values in W."""
+        peaks = [peak.average for peak in self.peaks]
+        return {
+            DEMAND_KEY: _round(self.average),
+            DEMAND_PROJECTED_KEY: _round(self.projected),
+            PEAK_DEMAND_KEY: _round(peaks[0]) if peaks else None,
+            PEAK_DEMAND_MEAN_KEY: _round(sum(peaks) / len(peaks)) if peaks else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "month": self.month,
+            "peaks": [[peak.start, peak.average] for peak in self.peaks],
+            "block": [
+                self.block_start,
+                self._energy,
+                self._covered,
+                self._last_timestamp,
+                self._last_power,
+                self._alerted,
+            ],
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Restore persisted state.
+
+        A block interrupted by a restart is continued, or completed with
+        the time it covered once a sample of a later block arrives.
+
+        Args:
+            state: State returned by as_dict
+        """
+        self.month = state.get("month")
+        self.peaks = [
+            DemandBlock(start, average)
+            for start, average in state.get("peaks", [])[: self.peak_count]
+        ]
+        if state.get("block"):
+            (
+                self.block_start,
+                self._energy,
+                self._covered,
+                self._last_timestamp,
+                self._last_power,
+                self._alerted,
+            ) = state["block"]
+
+
+def _round(value: float | None) -> float | None:
+    """Round a power value for display."""
+    return None if value is None else round(value, 1)
@@ -0,0 +1,101 @@
+"""Diagnostics support for Fox Energy integration."""
+
+from dataclasses import asdict
+from typing import Any
+from urllib.parse import urlsplit
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ENTRY_TYPE,
+    CONF_METERS,
+    CONF_STREAM,
+    CONF_SUBTRACT,
+    DATA_VIRTUAL_METERS,
+    DOMAIN,
+    ENTRY_TYPE_VIRTUAL,
+)
+from .coordinator import FoxEnergyCoordinator
+
+TO_REDACT = {CONF_HOST, CONF_METERS, CONF_STREAM, CONF_SUBTRACT, "unique_id", "title"}
+
+
+def _redact_text(data: Any, secrets: list[str]) -> Any:
+    """Redact every occurrence of secrets in the strings of data.
+
+    Args:
+        data: Diagnostics data
+        secrets: Strings to redact, longest first
+
+    Returns:
+        Copy of data with the secrets replaced
+    """
+    if isinstance(data, str):
+        for secret in secrets:
+            data = data.replace(secret, REDACTED)
+        return data
+    if isinstance(data, dict):
+        return {key: _redact_text(value, secrets) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_redact_text(value, secrets) for value in data]
+    return data
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        Diagnostics data
+    """
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL:
+        virtual = hass.data[DATA_VIRTUAL_METERS][entry.entry_id]
+        return {
+            "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+            "keys": virtual.aggregator.keys,
+            "dropped_ticks": virtual.aggregator.dropped_ticks,
+        }
+
+    coordinator: FoxEnergyCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # Error messages and the stream address name the meter and the daemon
+    host = coordinator.host
+    secrets = {host, urlsplit(f"//{host}").hostname or host}
+    if coordinator.stream_client is not None:
+        secrets.add(coordinator.stream_client.address)
+
+    diagnostics = {
+        "device_type": coordinator.device_type,
+        "last_update_success": coordinator.last_update_success,
+        "api": coordinator.api.metrics,
+        "scheduler": {
+            "scan_interval": coordinator.scan_interval,
+            "skipped_ticks": coordinator.skipped_ticks,
+            "last_tick": coordinator.last_tick,
+        },
+        "loop_time": coordinator.loop_time.as_dict(),
+        "pipeline": coordinator.pipeline.as_dict(),
+        "worker_pool": coordinator.worker_pool.as_dict(),
+        "stream": (
+            coordinator.stream_client.as_dict() if coordinator.stream_client else None
+        ),
+        "errors": coordinator.errors.as_dict(),
+        "demand": coordinator.demand.as_dict() if coordinator.demand else None,
+        "forecast_parameters": (
+            asdict(coordinator.forecast.model.parameters)
+            if coordinator.forecast
+            else None
+        ),
+    }
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        **_redact_text(diagnostics, sorted(secrets, key=len, reverse=True)),
+    }
@@ -1,6 +1,6 @@
 """Base entity for Fox Energy integration."""
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -26,39 +26,36 @@ class FoxEnergyEntity(CoordinatorEntity[FoxEnergyCoordinator]):
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
-        host = self.coordinator.host
         return DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name=f"Fox Energy ({host})",
+            identifiers={(DOMAIN, self.coordinator.host)},
+            name=self.coordinator.device_name,
             manufacturer=MANUFACTURER,
             model=self.coordinator.device_type,
         )
 
 
 class FoxEnergySensor(FoxEnergyEntity, SensorEntity):
-    """Fox Energy sensor entity."""
+    """Fox Energy sensor entity.
+
+    Static attributes come from a shared, frozen entity description, so
+    each entity only holds its coordinator, key and unique ID.
+    """
 
     def __init__(
         self,
         coordinator: FoxEnergyCoordinator,
-        sensor_key: str,
-        sensor_config: dict,
+        description: SensorEntityDescription,
     ):
         """Initialize sensor.
 
         Args:
             coordinator: Data update coordinator
-            sensor_key: Unique sensor identifier
-            sensor_config: Sensor configuration dict with name, unit, etc.
+            description: Shared entity description (name, unit, classes, icon)
         """
-        super().__init__(coordinator, sensor_key)
-
-        self._attr_name = sensor_config.get("name")
-        self._attr_native_unit_of_measurement = sensor_config.get("unit")
-        self._attr_device_class = sensor_config.get("device_class")
-        self._attr_state_class = sensor_config.get("state_class")
-        self._attr_icon = sensor_config.get("icon")
-        self._attr_unique_id = f"{coordinator.host}_{sensor_key}"
+        super().__init__(coordinator, description.key)
+
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.host}_{description.key}"
 
     @property
     def native_value(self):
@@ -0,0 +1,110 @@
+"""Error accounting for Fox Energy integration."""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between summaries of a repeating error
+ERROR_SUMMARY_INTERVAL = 3600
+
+
+@dataclass(slots=True)
+class _ErrorCounter:
+    """Occurrences of one error category."""
+
+    count: int = 0
+    window_count: int = 0
+    window_start: float = 0.0
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+    message: str = ""
+    args: tuple[Any, ...] = ()
+
+
+class FoxEnergyErrorTracker:
+    """Count errors per category and log them at a bounded rate.
+
+    The first occurrence of a category is logged right away. Later
+    occurrences are only counted (without formatting the message) and
+    reported as one summary line per interval.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        summary_interval: float = ERROR_SUMMARY_INTERVAL,
+        logger: logging.Logger = _LOGGER,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            name: Prefix of log messages (e.g., meter host)
+            summary_interval: Seconds between summaries of a category
+            logger: Logger to write to
+        """
+        self.name = name
+        self.summary_interval = summary_interval
+        self._logger = logger
+        self._counters: dict[str, _ErrorCounter] = {}
+
+    def record(self, category: str, message: str, *args: Any) -> None:
+        """Record an error occurrence.
+
+        Args:
+            category: Error category (e.g., "parse:napiecie_l1")
+            message: Log message format string
+            args: Log message arguments
+        """
+        now = time.monotonic()
+        counter = self._counters.get(category)
+        if counter is None:
+            counter = self._counters[category] = _ErrorCounter(
+                window_start=now, first_seen=time.time()
+            )
+            self._logger.warning(
+                "%s: " + message + " (repeats are summarised every %d s)",
+                self.name,
+                *args,
+                self.summary_interval,
+            )
+        else:
+            counter.window_count += 1
+
+        counter.count += 1
+        counter.last_seen = time.time()
+        counter.message = message
+        counter.args = args
+
+    def log_summaries(self) -> None:
+        """Log a summary of every category whose interval has elapsed."""
+        now = time.monotonic()
+        for category, counter in self._counters.items():
+            if now - counter.window_start < self.summary_interval:
+                continue
+            if counter.window_count:
+                self._logger.warning(
+                    "%s: %s failed %d times in the last %d s, last error: "
+                    + counter.message,
+                    self.name,
+                    category,
+                    counter.window_count,
+                    now - counter.window_start,
+                    *counter.args,
+                )
+            counter.window_count = 0
+            counter.window_start = now
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return error counters for diagnostics."""
+        return {
+            category: {
+                "count": counter.count,
+                "first_seen": counter.first_seen,
+                "last_seen": counter.last_seen,
+                "last_error": counter.message % counter.args,
+            }
+            for category, counter in self._counters.items()
+        }
@@ -0,0 +1,186 @@
+"""Export of stored samples for Fox Energy integration."""
+
+import csv
+import logging
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .store import FoxEnergySampleStore
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_PARQUET]
+EXPORT_CHUNK_SIZE = 10_000
+
+
+class FoxEnergyExportError(Exception):
+    """Export failed."""
+
+
+def export_samples(
+    sources: list[tuple[str, FoxEnergySampleStore]],
+    start: float,
+    end: float,
+    path: Path,
+    file_format: str = EXPORT_FORMAT_CSV,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """Stream samples of several meters into a file (blocking).
+
+    Rows are read and written one chunk at a time, so memory use depends on
+    the chunk size and not on the length of the time range.
+
+    Args:
+        sources: Pairs of meter host and its sample store
+        start: Unix timestamp, inclusive
+        end: Unix timestamp, exclusive
+        path: Output file
+        file_format: "csv" or "parquet"
+        chunk_size: Rows per chunk
+
+    Returns:
+        Row count, duration and throughput of the export
+    """
+    columns: list[str] = []
+    for _host, store in sources:
+        columns.extend(key for key in store.keys if key not in columns)
+
+    if file_format == EXPORT_FORMAT_CSV:
+        writer = _CsvWriter(path, columns)
+    elif file_format == EXPORT_FORMAT_PARQUET:
+        writer = _ParquetWriter(path, columns)
+    else:
+        raise FoxEnergyExportError(f"Unsupported export format: {file_format}")
+
+    started = time.perf_counter()
+    rows = 0
+    try:
+        for host, store in sources:
+            for keys, chunk in store.iter_rows(start, end, chunk_size):
+                # Map the block's value columns onto the export columns
+                positions = [
+                    keys.index(column) if column in keys else None for column in columns
+                ]
+                writer.write(host, positions, chunk)
+                rows += len(chunk)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - started
+    result = {
+        "path": str(path),
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds > 0 else rows,
+    }
+    _LOGGER.debug("Exported samples: %s", result)
+    return result
+
+
+def _pick(row: list[Any], positions: list[int | None]) -> list[Any]:
+    """Return the values of row in export column order."""
+    return [None if pos is None else row[pos + 1] for pos in positions]
+
+
+class _CsvWriter:
+    """Write export chunks as CSV."""
+
+    def __init__(self, path: Path, columns: list[str]):
+        """Open the file and write the header row.
+
+        Args:
+            path: Output file
+            columns: Value columns after time and host
+        """
+        self._handle = open(path, "w", newline="", encoding="utf-8")  # noqa: SIM115
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(["time", "host", *columns])
+
+    def write(
+        self, host: str, positions: list[int | None], rows: list[list[Any]]
+    ) -> None:
+        """Write a chunk of rows of one meter.
+
+        Args:
+            host: Meter host
+            positions: Index of every export column in the row values, None
+                for columns the meter does not store
+            rows: Rows of [timestamp, *values]
+        """
+        self._writer.writerows(
+            [
+                datetime.fromtimestamp(row[0], UTC).isoformat(),
+                host,
+                *_pick(row, positions),
+            ]
+            for row in rows
+        )
+
+    def close(self) -> None:
+        """Close the file."""
+        self._handle.close()
+
+
+class _ParquetWriter:
+    """Write export chunks as Parquet row groups."""
+
+    def __init__(self, path: Path, columns: list[str]):
+        """Open the file with a schema of the export columns.
+
+        Args:
+            path: Output file
+            columns: Value columns after time and host
+
+        Raises:
+            FoxEnergyExportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise FoxEnergyExportError("Parquet export requires pyarrow") from err
+
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema(
+            [
+                ("time", pa.timestamp("ms", tz="UTC")),
+                ("host", pa.string()),
+                *((column, pa.float64()) for column in columns),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(
+        self, host: str, positions: list[int | None], rows: list[list[Any]]
+    ) -> None:
+        """Write a chunk of rows of one meter as a row group.
+
+        Args:
+            host: Meter host
+            positions: Index of every export column in the row values, None
+                for columns the meter does not store
+            rows: Rows of [timestamp, *values]
+        """
+        values = [_pick(row, positions) for row in rows]
+        arrays = [
+            self._pa.array(
+                [round(row[0] * 1000) for row in rows], self._pa.int64()
+            ).cast(self._schema.field("time").type),
+            self._pa.array([host] * len(rows), self._pa.string()),
+            *(
+                self._pa.array([value[index] for value in values], self._pa.float64())
+                for index in range(len(self._columns))
+            ),
+        ]
+        self._writer.write_table(
+            self._pa.Table.from_arrays(arrays, schema=self._schema)
+        )
+
+    def close(self) -> None:
+        """Write the file footer and close the file."""
+        self._writer.close()
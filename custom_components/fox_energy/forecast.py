@@ -0,0 +1,289 @@
+"""Short-term energy forecast for Fox Energy integration."""
+
+import itertools
+import math
+from collections import deque
+from dataclasses import astuple, dataclass
+from datetime import datetime, tzinfo
+from typing import Any
+
+HOURS_PER_WEEK = 7 * 24
+# Completed hours kept to refit the smoothing factors
+FORECAST_HISTORY_HOURS = 4 * HOURS_PER_WEEK
+# Completed hours between refits
+FORECAST_REFIT_HOURS = 24
+# Energy in kWh no hour can reach, well above the 44 kW of a 3x63 A connection
+FORECAST_MAX_HOUR_ENERGY = 100
+# Seconds readings must stay implausible before the counter is taken as
+# reset or replaced
+FORECAST_RESET_DELAY = 3600
+
+# Candidate smoothing factors tried by a refit
+PROFILE_SMOOTHING_GRID = (0.05, 0.1, 0.2, 0.3, 0.5)
+LEVEL_SMOOTHING_GRID = (0.1, 0.3, 0.5, 0.7, 0.9)
+DAMPING_GRID = (0.5, 0.8, 0.9, 0.95)
+
+FORECAST_NEXT_HOUR_KEY = "prognoza_energii_1h"
+FORECAST_NEXT_DAY_KEY = "prognoza_energii_24h"
+
+FORECAST_SENSORS: dict[str, dict[str, Any]] = {
+    FORECAST_NEXT_HOUR_KEY: {
+        "name": "Energy Forecast Next Hour",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": None,
+        "icon": "mdi:chart-timeline-variant-shimmer",
+    },
+    FORECAST_NEXT_DAY_KEY: {
+        "name": "Energy Forecast Next 24 Hours",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": None,
+        "icon": "mdi:chart-timeline-variant-shimmer",
+    },
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastParameters:
+    """Smoothing factors of the forecast model.
+
+    Attributes:
+        profile_smoothing: Weight of a new hour in its time-of-week bin
+        level_smoothing: Weight of a new hour in the level offset
+        damping: Fraction of the level offset kept per hour ahead
+    """
+
+    profile_smoothing: float = 0.2
+    level_smoothing: float = 0.5
+    damping: float = 0.8
+
+
+class ForecastModel:
+    """Time-of-week profile with a damped, exponentially smoothed level.
+
+    The profile holds the smoothed energy of each of the 168 hours of the
+    week. The level is the smoothed deviation of recent hours from the
+    profile (a cold day, guests); it decays towards the profile for hours
+    further ahead.
+    """
+
+    __slots__ = ("level", "parameters", "profile")
+
+    def __init__(self, parameters: ForecastParameters):
+        """Initialize an empty model."""
+        self.parameters = parameters
+        self.profile: list[float | None] = [None] * HOURS_PER_WEEK
+        self.level = 0.0
+
+    def predict(self, hour: int, ahead: int = 1) -> float | None:
+        """Return the energy expected in an hour of the week.
+
+        Args:
+            hour: Hour of the week (Monday 00:00 = 0)
+            ahead: Hours since the last completed hour
+
+        Returns:
+            Energy in kWh, None before any hour was observed
+        """
+        expected = self.profile[hour % HOURS_PER_WEEK]
+        if expected is None:
+            known = [value for value in self.profile if value is not None]
+            if not known:
+                return None
+            expected = sum(known) / len(known)
+        return max(0.0, expected + self.level * self.parameters.damping**ahead)
+
+    def update(self, hour: int, energy: float) -> None:
+        """Add a completed hour.
+
+        Args:
+            hour: Hour of the week
+            energy: Energy consumed in the hour in kWh
+        """
+        parameters = self.parameters
+        expected = self.profile[hour]
+        if expected is None:
+            self.profile[hour] = energy
+            return
+        deviation = energy - expected
+        level = parameters.damping * self.level
+        self.level = level + parameters.level_smoothing * (deviation - level)
+        self.profile[hour] = expected + parameters.profile_smoothing * (
+            deviation - self.level
+        )
+
+
+def fit_parameters(history: list[tuple[int, float]]) -> ForecastParameters:
+    """Choose the smoothing factors with the smallest one-hour-ahead error.
+
+    Every candidate replays the history on a fresh model; the first week
+    only fills the profile and is not scored. CPU-bound, run in an
+    executor.
+
+    Args:
+        history: Completed hours as (hour of the week, energy), oldest first
+
+    Returns:
+        Best parameters
+    """
+    best = ForecastParameters()
+    best_error = math.inf
+    for candidate in itertools.starmap(
+        ForecastParameters,
+        itertools.product(PROFILE_SMOOTHING_GRID, LEVEL_SMOOTHING_GRID, DAMPING_GRID),
+    ):
+        model = ForecastModel(candidate)
+        error = 0.0
+        for index, (hour, energy) in enumerate(history):
+            if index >= HOURS_PER_WEEK:
+                error += (model.predict(hour) - energy) ** 2
+            model.update(hour, energy)
+        if error < best_error:
+            best = candidate
+            best_error = error
+    return best
+
+
+class FoxEnergyForecast:
+    """Next-hour and next-day energy forecast updated from live samples.
+
+    Energy is taken from the import counter at every full hour and fed to
+    the model once per hour, so no history has to be read back. The
+    completed hours of the last four weeks are kept to refit the smoothing
+    factors once a day.
+
+    Readings that are not positive, go backwards or imply more energy
+    than FORECAST_MAX_HOUR_ENERGY per hour are skipped. Only if they stay
+    that way for FORECAST_RESET_DELAY is the counter taken as reset.
+    """
+
+    def __init__(
+        self,
+        time_zone: tzinfo,
+        parameters: ForecastParameters | None = None,
+    ):
+        """Initialize the forecast.
+
+        Args:
+            time_zone: Time zone hours of the week are counted in
+            parameters: Smoothing factors
+        """
+        self.time_zone = time_zone
+        self.model = ForecastModel(parameters or ForecastParameters())
+        self.history: deque[tuple[int, float]] = deque(maxlen=FORECAST_HISTORY_HOURS)
+        self.hours_since_refit = 0
+        self.hour_start: float | None = None
+        self.hour_reading: float | None = None
+        self.next_hour: float | None = None
+        self.next_day: float | None = None
+        self._implausible_since: float | None = None
+
+    def hour_of_week(self, timestamp: float) -> int:
+        """Return the hour of the week of a Unix timestamp."""
+        local = datetime.fromtimestamp(timestamp, self.time_zone)
+        return local.weekday() * 24 + local.hour
+
+    def add(self, timestamp: float, reading: float | None) -> bool:
+        """Add an import energy reading.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            reading: Import energy counter in kWh, None if missing
+
+        Returns:
+            True if an hour was completed and the forecast changed
+        """
+        if reading is None or reading <= 0:
+            return False
+        hour_start = timestamp - timestamp % 3600
+        if self.hour_start is None:
+            self.hour_start, self.hour_reading = hour_start, reading
+            return False
+        if hour_start <= self.hour_start:
+            return False
+
+        energy = reading - self.hour_reading
+        hours = (hour_start - self.hour_start) / 3600
+        if not 0 <= energy <= FORECAST_MAX_HOUR_ENERGY * hours:
+            # A bogus reading, unless the counter stays off
+            if self._implausible_since is None:
+                self._implausible_since = timestamp
+            if timestamp - self._implausible_since < FORECAST_RESET_DELAY:
+                return False
+        self._implausible_since = None
+
+        # Hours missed entirely (restart, outage) or a reset counter cannot
+        # be attributed to a single hour of the week
+        completed = hours == 1 and 0 <= energy <= FORECAST_MAX_HOUR_ENERGY
+        if completed:
+            hour = self.hour_of_week(self.hour_start)
+            self.model.update(hour, energy)
+            self.history.append((hour, round(energy, 4)))
+            self.hours_since_refit += 1
+        self.hour_start, self.hour_reading = hour_start, reading
+        self._predict()
+        return completed
+
+    def _predict(self) -> None:
+        """Update the forecasts for the hours after the current one."""
+        current = self.hour_of_week(self.hour_start)
+        predictions = [
+            self.model.predict(current + ahead, ahead + 1) for ahead in range(1, 25)
+        ]
+        if predictions[0] is None:
+            self.next_hour = self.next_day = None
+            return
+        self.next_hour = round(predictions[0], 3)
+        self.next_day = round(sum(predictions), 3)
+
+    @property
+    def refit_due(self) -> bool:
+        """Return True if the smoothing factors should be refitted."""
+        return (
+            self.hours_since_refit >= FORECAST_REFIT_HOURS
+            and len(self.history) > 2 * HOURS_PER_WEEK
+        )
+
+    def set_parameters(self, parameters: ForecastParameters) -> None:
+        """Apply refitted smoothing factors."""
+        self.model.parameters = parameters
+        self.hours_since_refit = 0
+
+    def values(self) -> dict[str, float | None]:
+        """Return the sensor values in kWh."""
+        return {
+            FORECAST_NEXT_HOUR_KEY: self.next_hour,
+            FORECAST_NEXT_DAY_KEY: self.next_day,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "parameters": astuple(self.model.parameters),
+            "profile": [
+                None if value is None else round(value, 4)
+                for value in self.model.profile
+            ],
+            "level": round(self.model.level, 4),
+            "history": list(self.history),
+            "hours_since_refit": self.hours_since_refit,
+            "hour": [self.hour_start, self.hour_reading],
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Restore persisted state.
+
+        Args:
+            state: State returned by as_dict
+        """
+        if state.get("parameters"):
+            self.model.parameters = ForecastParameters(*state["parameters"])
+        if len(state.get("profile", [])) == HOURS_PER_WEEK:
+            self.model.profile = list(state["profile"])
+        self.model.level = state.get("level", 0.0)
+        self.history.extend(tuple(entry) for entry in state.get("history", []))
+        self.hours_since_refit = state.get("hours_since_refit", 0)
+        self.hour_start, self.hour_reading = state.get("hour", [None, None])
+        if self.hour_start is not None:
+            self._predict()
@@ -0,0 +1,301 @@
+"""Gorilla-style compression of sample columns for Fox Energy integration.
+
+Timestamps and decimal columns are stored as integers with delta-of-delta
+encoding; other floats are XOR-ed with their predecessor and only the
+meaningful bits are kept. Bit parsing is sequential, the reconstruction of
+values from deltas and XOR residues is a prefix scan that runs vectorized
+in numpy when it is available.
+"""
+
+import math
+import operator
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+# Column encodings
+ENCODING_XOR = 0
+ENCODING_DECIMAL = 1
+
+# Most decimal places tried before falling back to XOR encoding
+MAX_DECIMALS = 6
+_MAX_EXACT_INT = 2**53
+
+# Delta-of-delta buckets: (control bits, control length, value bits)
+_DOD_BUCKETS = ((0b10, 2, 7), (0b110, 3, 12), (0b1110, 4, 20))
+
+
+class BitWriter:
+    """Append bit fields to a byte string."""
+
+    __slots__ = ("_acc", "_bits", "_buffer")
+
+    def __init__(self) -> None:
+        """Initialize an empty writer."""
+        self._buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        """Append the low bits of value, most significant first."""
+        self._acc = (self._acc << bits) | (value & ((1 << bits) - 1))
+        self._bits += bits
+        while self._bits >= 8:
+            self._bits -= 8
+            self._buffer.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+
+    def to_bytes(self) -> bytes:
+        """Return the written bits, zero-padded to whole bytes."""
+        if self._bits:
+            return bytes(self._buffer) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self._buffer)
+
+
+class BitReader:
+    """Read bit fields from a byte string."""
+
+    __slots__ = ("_remaining", "_value")
+
+    def __init__(self, data: bytes):
+        """Initialize the reader.
+
+        Args:
+            data: Bytes written by BitWriter
+        """
+        self._value = int.from_bytes(data, "big")
+        self._remaining = len(data) * 8
+
+    def read(self, bits: int) -> int:
+        """Return the next bits as an unsigned integer."""
+        self._remaining -= bits
+        return (self._value >> self._remaining) & ((1 << bits) - 1)
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed integer to an unsigned one, small magnitudes first."""
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    """Invert _zigzag."""
+    return (value >> 1) ^ -(value & 1)
+
+
+def encode_ints(values: list[int]) -> bytes:
+    """Encode integers with delta-of-delta compression.
+
+    Args:
+        values: Integers of magnitude below 2**61
+
+    Returns:
+        Encoded bits
+    """
+    writer = BitWriter()
+    if not values:
+        return b""
+    writer.write(_zigzag(values[0]), 64)
+
+    previous, delta = values[0], 0
+    for value in values[1:]:
+        new_delta = value - previous
+        dod = _zigzag(new_delta - delta)
+        previous, delta = value, new_delta
+
+        if dod == 0:
+            writer.write(0, 1)
+            continue
+        for control, control_bits, value_bits in _DOD_BUCKETS:
+            if dod < 1 << value_bits:
+                writer.write(control, control_bits)
+                writer.write(dod, value_bits)
+                break
+        else:
+            writer.write(0b1111, 4)
+            writer.write(dod, 64)
+    return writer.to_bytes()
+
+
+def decode_ints(data: bytes, count: int) -> list[int]:
+    """Decode integers encoded with encode_ints.
+
+    Args:
+        data: Encoded bits
+        count: Number of values
+
+    Returns:
+        Decoded integers
+    """
+    if count == 0:
+        return []
+    reader = BitReader(data)
+    read = reader.read
+    first = _unzigzag(read(64))
+
+    dods = [0] * (count - 1)
+    for index in range(count - 1):
+        if not read(1):
+            continue
+        if not read(1):
+            dod = read(7)
+        elif not read(1):
+            dod = read(12)
+        elif not read(1):
+            dod = read(20)
+        else:
+            dod = read(64)
+        dods[index] = _unzigzag(dod)
+
+    if np is not None:
+        values = np.empty(count, dtype=np.int64)
+        values[0] = first
+        values[1:] = first + np.cumsum(np.cumsum(np.array(dods, dtype=np.int64)))
+        return values.tolist()
+    return list(accumulate(accumulate(dods), initial=first))
+
+
+def encode_floats(values: list[float]) -> bytes:
+    """Encode floats by XOR with the previous value.
+
+    Args:
+        values: Floats, NaN allowed
+
+    Returns:
+        Encoded bits
+    """
+    if not values:
+        return b""
+    bits = array("Q", array("d", values).tobytes())
+    writer = BitWriter()
+    writer.write(bits[0], 64)
+
+    previous = bits[0]
+    leading, trailing = 65, 0
+    for current in bits[1:]:
+        xor = current ^ previous
+        previous = current
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+
+        new_leading = 64 - xor.bit_length()
+        new_trailing = (xor & -xor).bit_length() - 1
+        if new_leading >= leading and new_trailing >= trailing:
+            # Meaningful bits fit the previous window
+            writer.write(0b10, 2)
+            writer.write(xor >> trailing, 64 - leading - trailing)
+        else:
+            leading, trailing = new_leading, new_trailing
+            length = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 6)
+            writer.write(length - 1, 6)
+            writer.write(xor >> trailing, length)
+    return writer.to_bytes()
+
+
+def decode_floats(data: bytes, count: int) -> list[float]:
+    """Decode floats encoded with encode_floats.
+
+    Args:
+        data: Encoded bits
+        count: Number of values
+
+    Returns:
+        Decoded floats
+    """
+    if count == 0:
+        return []
+    reader = BitReader(data)
+    read = reader.read
+
+    residues = [0] * count
+    residues[0] = read(64)
+    length, trailing = 0, 0
+    for index in range(1, count):
+        if not read(1):
+            continue
+        if read(1):
+            leading = read(6)
+            length = read(6) + 1
+            trailing = 64 - leading - length
+        residues[index] = read(length) << trailing
+
+    if np is not None:
+        return (
+            np.bitwise_xor.accumulate(np.array(residues, dtype=np.uint64))
+            .view(np.float64)
+            .tolist()
+        )
+    return array("d", array("Q", accumulate(residues, operator.xor)).tobytes()).tolist()
+
+
+def _decimal_places(values: list[float]) -> int | None:
+    """Return the fewest decimal places representing all values exactly.
+
+    Args:
+        values: Floats
+
+    Returns:
+        Decimal places, None if a value is NaN or needs more than MAX_DECIMALS
+    """
+    if not all(math.isfinite(value) for value in values):
+        return None
+    for places in range(MAX_DECIMALS + 1):
+        scale = 10**places
+        for value in values:
+            scaled = round(value * scale)
+            if abs(scaled) >= _MAX_EXACT_INT or scaled / scale != value:
+                break
+        else:
+            return places
+    return None
+
+
+def encode_column(values: list[float | None]) -> bytes:
+    """Encode a column, choosing decimal or XOR encoding.
+
+    Values the meter reports with fixed decimals (voltage, power, energy)
+    become small integer deltas; anything else falls back to XOR floats.
+    Missing values are stored as NaN.
+
+    Args:
+        values: Column values
+
+    Returns:
+        Encoding byte followed by the encoded bits
+    """
+    floats = [math.nan if value is None else float(value) for value in values]
+    places = _decimal_places(floats)
+    if places is not None:
+        scale = 10**places
+        return bytes([ENCODING_DECIMAL, places]) + encode_ints(
+            [round(value * scale) for value in floats]
+        )
+    return bytes([ENCODING_XOR]) + encode_floats(floats)
+
+
+def decode_column(data: bytes, count: int) -> list[float | None]:
+    """Decode a column encoded with encode_column.
+
+    Args:
+        data: Encoded column
+        count: Number of values
+
+    Returns:
+        Column values, None where missing
+    """
+    if data[0] == ENCODING_DECIMAL:
+        scale = 10 ** data[1]
+        ints = decode_ints(data[2:], count)
+        if np is not None:
+            return (np.array(ints, dtype=np.float64) / scale).tolist()
+        return [value / scale for value in ints]
+
+    return [
+        None if math.isnan(value) else value for value in decode_floats(data[1:], count)
+    ]
@@ -0,0 +1,429 @@
+"""Setup of the Fox Energy integration in Home Assistant."""
+
+import logging
+from pathlib import Path
+from typing import Any, Final
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_TIMEOUT,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .api import FoxEnergyRequestLimiter
+from .const import (
+    CONF_ADAPTIVE_TIMEOUT,
+    CONF_ALARM_DELAY,
+    CONF_APPLIANCES,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEMAND_PEAKS,
+    CONF_DEMAND_THRESHOLD,
+    CONF_DEMAND_TRACKING,
+    CONF_ENERGY_FORECAST,
+    CONF_ENTRY_TYPE,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_FUSE_RATING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METERS,
+    CONF_REACTIVE_POWER_LIMIT,
+    CONF_READ_TIMEOUT,
+    CONF_REQUEST_RATE,
+    CONF_SAMPLE_RETENTION_DAYS,
+    CONF_SCAN_INTERVAL,
+    CONF_STEP_THRESHOLD,
+    CONF_STORE_SAMPLES,
+    CONF_STREAM,
+    CONF_SUBTRACT,
+    CONF_TARIFF,
+    CONF_TRANSPORT,
+    CONF_UNDERVOLTAGE,
+    DATA_GLOBAL_LIMITER,
+    DATA_STREAM_CLIENTS,
+    DATA_VIRTUAL_METERS,
+    DATA_WORKER_POOL,
+    DEFAULT_ALARM_DELAY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DEMAND_PEAKS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_SAMPLE_RETENTION_DAYS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    ENTRY_TYPE_VIRTUAL,
+    GLOBAL_MAX_CONCURRENT_REQUESTS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TARIFF_NONE,
+)
+from .coordinator import FoxEnergyCoordinator
+from .pipeline import FoxEnergyWorkerPool
+from .services import async_setup_services
+from .steps import parse_appliances
+from .stream import FoxEnergyStreamClient
+from .virtual import FoxEnergyVirtualCoordinator
+from .websocket_api import async_setup_websocket_api
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS: Final = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up Fox Energy services and websocket commands.
+
+    Args:
+        hass: Home Assistant instance
+        config: Configuration
+
+    Returns:
+        True if setup successful
+    """
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+
+    async def _async_stop(event: Event) -> None:
+        """Write buffered samples and stop the worker threads."""
+        for coordinator in hass.data.get(DOMAIN, {}).values():
+            await coordinator.async_flush_samples()
+        await _async_shutdown_worker_pool(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Fox Energy from a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        True if setup successful
+    """
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL:
+        return await _async_setup_virtual_entry(hass, entry)
+
+    host = entry.data[CONF_HOST]
+
+    # Update options if not set
+    if not entry.options:
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                CONF_SCAN_INTERVAL: entry.data.get(
+                    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                ),
+                CONF_TIMEOUT: entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            },
+        )
+
+    # Limiter shared by all meters caps total load on the network
+    global_limiter = hass.data.get(DATA_GLOBAL_LIMITER)
+    if global_limiter is None:
+        global_limiter = FoxEnergyRequestLimiter(GLOBAL_MAX_CONCURRENT_REQUESTS)
+        hass.data[DATA_GLOBAL_LIMITER] = global_limiter
+
+    # Storage, rollups and refits of all meters share a bounded worker pool
+    worker_pool = hass.data.get(DATA_WORKER_POOL)
+    if worker_pool is None:
+        worker_pool = FoxEnergyWorkerPool(hass.loop)
+        hass.data[DATA_WORKER_POOL] = worker_pool
+
+    # Create coordinator
+    coordinator = FoxEnergyCoordinator(
+        hass=hass,
+        host=host,
+        global_limiter=global_limiter,
+        worker_pool=worker_pool,
+        stream_client=_get_stream_client(hass, entry),
+        external_statistics=entry.options.get(CONF_EXTERNAL_STATISTICS, False),
+        tariff=_get_tariff(entry),
+        demand_tracking=entry.options.get(CONF_DEMAND_TRACKING, False),
+        alarm_settings=_get_alarm_settings(entry),
+        energy_forecast=entry.options.get(CONF_ENERGY_FORECAST, False),
+        entry_id=entry.entry_id,
+        **_get_settings(hass, entry),
+    )
+
+    # Restore tariff counters, demand peaks and the forecast model before the
+    # first sample
+    await coordinator.async_load_state()
+
+    # Fetch initial data; a streamed meter subscribes here already, so stop
+    # it again when setup fails
+    entry.async_on_unload(coordinator.async_stop)
+    await coordinator.async_config_entry_first_refresh()
+
+    # Store coordinator in hass data
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    # Start aligned polling
+    coordinator.async_start()
+
+    # Setup platforms
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Skip fetching and processing data of disabled entities
+    entry.async_on_unload(coordinator.async_track_enabled_entities())
+
+    # Apply option changes in place
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    # Virtual meters waiting for this meter, or attached to the coordinator
+    # it replaces, attach to this one
+    _async_reload_virtual_meters(hass, host)
+
+    return True
+
+
+async def _async_setup_virtual_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a virtual meter combining the samples of physical meters.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry of the virtual meter
+
+    Returns:
+        True if setup successful
+
+    Raises:
+        ConfigEntryNotReady: If a member meter is not set up yet
+    """
+    by_host = {
+        coordinator.host: coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+    }
+    hosts = [*entry.data[CONF_METERS], *entry.data.get(CONF_SUBTRACT, [])]
+    missing = [host for host in hosts if host not in by_host]
+    if missing:
+        raise ConfigEntryNotReady(f"Meters not ready: {', '.join(missing)}")
+
+    coordinator = FoxEnergyVirtualCoordinator(
+        hass,
+        entry.data[CONF_NAME],
+        entry.unique_id,
+        [by_host[host] for host in entry.data[CONF_METERS]],
+        [by_host[host] for host in entry.data.get(CONF_SUBTRACT, [])],
+    )
+    hass.data.setdefault(DATA_VIRTUAL_METERS, {})[entry.entry_id] = coordinator
+
+    coordinator.async_start()
+    entry.async_on_unload(coordinator.async_stop)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    return True
+
+
+def _async_reload_virtual_meters(hass: HomeAssistant, host: str) -> None:
+    """Reload virtual meters that include a meter.
+
+    Args:
+        hass: Home Assistant instance
+        host: Member meter host
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if (
+            entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL
+            and entry.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_RETRY)
+            and host in (*entry.data[CONF_METERS], *entry.data.get(CONF_SUBTRACT, []))
+        ):
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        True if unload successful
+    """
+    # Unload platforms
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL:
+        if unload_ok:
+            hass.data[DATA_VIRTUAL_METERS].pop(entry.entry_id)
+        return unload_ok
+
+    if unload_ok:
+        # Remove coordinator
+        coordinator: FoxEnergyCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_flush_samples()
+        await coordinator.async_save_state()
+        _async_reload_virtual_meters(hass, coordinator.host)
+        if not hass.data[DOMAIN]:
+            await _async_shutdown_worker_pool(hass)
+
+    return unload_ok
+
+
+async def _async_shutdown_worker_pool(hass: HomeAssistant) -> None:
+    """Stop the shared worker pool once no meter uses it.
+
+    Args:
+        hass: Home Assistant instance
+    """
+    worker_pool: FoxEnergyWorkerPool | None = hass.data.pop(DATA_WORKER_POOL, None)
+    if worker_pool is not None:
+        await hass.async_add_executor_job(worker_pool.shutdown)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a deleted config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+    """
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+    ).async_remove()
+
+
+def _get_alarm_settings(entry: ConfigEntry) -> dict[str, float] | None:
+    """Return the configured alarm limits, None if no alarm is configured."""
+    settings = {
+        "fuse_rating": entry.options.get(CONF_FUSE_RATING, 0),
+        "undervoltage": entry.options.get(CONF_UNDERVOLTAGE, 0),
+        "reactive_power": entry.options.get(CONF_REACTIVE_POWER_LIMIT, 0),
+    }
+    if not any(settings.values()):
+        return None
+    return {
+        **settings,
+        "min_duration": entry.options.get(CONF_ALARM_DELAY, DEFAULT_ALARM_DELAY),
+    }
+
+
+def _get_stream_client(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> FoxEnergyStreamClient | None:
+    """Return the daemon stream client, None if the meter is polled here.
+
+    Meters consuming the same address share one client and connection.
+    """
+    address = entry.options.get(CONF_STREAM, "")
+    if not address:
+        return None
+    clients = hass.data.setdefault(DATA_STREAM_CLIENTS, {})
+    if address not in clients:
+        clients[address] = FoxEnergyStreamClient(
+            address, create_task=hass.async_create_background_task
+        )
+    return clients[address]
+
+
+def _get_tariff(entry: ConfigEntry) -> str | None:
+    """Return the configured tariff, None if energy is not split into zones."""
+    tariff = entry.options.get(CONF_TARIFF, TARIFF_NONE)
+    return None if tariff == TARIFF_NONE else tariff
+
+
+def _get_settings(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return coordinator settings that can change at runtime.
+
+    Options take precedence over the values entered during setup.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        Keyword arguments for the coordinator
+    """
+
+    def get(key: str, default: Any) -> Any:
+        return entry.options.get(key, entry.data.get(key, default))
+
+    host = entry.data[CONF_HOST]
+    return {
+        "timeout": get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+        "scan_interval": get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        "max_concurrent": get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        "request_rate": get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+        "connect_timeout": get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        "read_timeout": get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        "adaptive_timeout": get(CONF_ADAPTIVE_TIMEOUT, False),
+        "transport": get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+        "sample_store_path": (
+            Path(hass.config.path(DOMAIN, host.replace(":", "_")))
+            if get(CONF_STORE_SAMPLES, False)
+            else None
+        ),
+        "sample_retention_days": get(
+            CONF_SAMPLE_RETENTION_DAYS, DEFAULT_SAMPLE_RETENTION_DAYS
+        ),
+        "demand_peaks": get(CONF_DEMAND_PEAKS, DEFAULT_DEMAND_PEAKS),
+        "demand_threshold": get(CONF_DEMAND_THRESHOLD, 0),
+        "step_threshold": get(CONF_STEP_THRESHOLD, 0),
+        "appliances": parse_appliances(get(CONF_APPLIANCES, "")),
+    }
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options.
+
+    Settings are applied to the running coordinator, so entities keep their
+    state and polling continues without a gap. Only options that change how
+    entities are created require a reload.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+    """
+    coordinator: FoxEnergyCoordinator = hass.data[DOMAIN][entry.entry_id]
+    stream_client = coordinator.stream_client
+
+    if (
+        coordinator.external_statistics
+        != entry.options.get(CONF_EXTERNAL_STATISTICS, False)
+        or coordinator.tariff != _get_tariff(entry)
+        or coordinator.demand_tracking != entry.options.get(CONF_DEMAND_TRACKING, False)
+        or coordinator.alarm_settings != _get_alarm_settings(entry)
+        or coordinator.energy_forecast != entry.options.get(CONF_ENERGY_FORECAST, False)
+        or (stream_client.address if stream_client else "")
+        != entry.options.get(CONF_STREAM, "")
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    await coordinator.async_apply_settings(**_get_settings(hass, entry))
+
+
+async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Migrate old config entry.
+
+    Args:
+        hass: Home Assistant instance
+        config_entry: Config entry
+
+    Returns:
+        True if migration successful
+    """
+    _LOGGER.debug("Migrating from version %s", config_entry.version)
+
+    if config_entry.version > 1:
+        # This shouldn't happen
+        return False
+
+    return True
@@ -0,0 +1,242 @@
+"""Worker pool pipeline for Fox Energy integration."""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Worker threads shared by all meters
+WORKER_THREADS = 2
+# Batches queued or running in the pool before submissions are refused
+WORKER_QUEUE_SIZE = 32
+# Samples handed to a worker at once
+SAMPLE_BATCH_SIZE = 12
+# Samples a meter buffers while the pool is saturated; older ones are dropped
+MAX_SAMPLE_BACKLOG = 50 * SAMPLE_BATCH_SIZE
+# Event loop time one poll may take to process its sample, in seconds
+LOOP_BUDGET = 0.002
+
+Sample = tuple[float, dict[str, Any]]
+
+
+class FoxEnergyWorkerPool:
+    """Bounded thread pool shared by the pipelines of all meters.
+
+    Submissions beyond the queue size are refused rather than queued, so a
+    slow disk or a burst of refits cannot build an unbounded backlog; the
+    caller keeps its work and retries later.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        max_workers: int = WORKER_THREADS,
+        max_pending: int = WORKER_QUEUE_SIZE,
+    ):
+        """Initialize the pool.
+
+        Args:
+            loop: Event loop results are delivered on
+            max_workers: Worker threads
+            max_pending: Jobs queued or running before submissions are refused
+        """
+        self.loop = loop
+        self.max_pending = max_pending
+        self.pending = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fox_energy_worker"
+        )
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> asyncio.Future | None:
+        """Run a function in a worker.
+
+        Must be called from the event loop.
+
+        Args:
+            func: Blocking function
+            *args: Arguments
+
+        Returns:
+            Future of the result, None if the pool is saturated or shut down
+        """
+        if self.closed or self.pending >= self.max_pending:
+            self.rejected += 1
+            return None
+        self.pending += 1
+        self.submitted += 1
+        future = self.loop.run_in_executor(self._executor, func, *args)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future: asyncio.Future) -> None:
+        """Release the queue slot of a finished job."""
+        self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Refuse new jobs, finish queued ones and stop the threads (blocking).
+
+        Submissions are refused from the moment this is called, so it may
+        run in an executor while meters still add samples.
+        """
+        self.closed = True
+        self._executor.shutdown(wait=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return pool counters for diagnostics."""
+        return {
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+        }
+
+
+class LoopTimeStats:
+    """Event loop time spent per poll, checked against a budget."""
+
+    __slots__ = ("budget", "count", "max", "over_budget", "total")
+
+    def __init__(self, budget: float = LOOP_BUDGET):
+        """Initialize the statistics.
+
+        Args:
+            budget: Seconds a poll may block the event loop
+        """
+        self.budget = budget
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.over_budget = 0
+
+    def add(self, seconds: float) -> None:
+        """Record the loop time of one poll."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if seconds > self.budget:
+            self.over_budget += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in milliseconds for diagnostics."""
+        return {
+            "budget_ms": self.budget * 1000,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+            "over_budget": self.over_budget,
+        }
+
+
+class FoxEnergyPipeline:
+    """Batch the samples of one meter and process them in the worker pool.
+
+    Adding a sample on the event loop only appends it to the current batch.
+    Full batches are processed in a worker, one batch of a meter at a time
+    and in order, so the processing function may keep per-meter state
+    without locking. Its result is passed to the done callback on the
+    event loop. While a batch is in flight or the pool is saturated,
+    samples accumulate up to the backlog limit; beyond it the oldest
+    samples are dropped.
+    """
+
+    def __init__(
+        self,
+        pool: FoxEnergyWorkerPool,
+        process: Callable[[list[Sample]], Any],
+        done: Callable[[Any], None] | None = None,
+        batch_size: int = SAMPLE_BATCH_SIZE,
+        max_backlog: int = MAX_SAMPLE_BACKLOG,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            pool: Shared worker pool
+            process: Processes a batch in a worker (blocking)
+            done: Called on the event loop with the result of each batch
+            batch_size: Samples per batch
+            max_backlog: Samples kept while batches cannot be submitted
+        """
+        self.pool = pool
+        self.process = process
+        self.done = done
+        self.batch_size = batch_size
+        self.max_backlog = max_backlog
+        self.batches = 0
+        self.dropped_samples = 0
+        self._batch: list[Sample] = []
+        self._inflight: asyncio.Future | None = None
+        self._saturated = False
+
+    def add(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Queue a sample, submitting the batch once full.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, not modified afterwards
+        """
+        self._batch.append((timestamp, data))
+        if len(self._batch) >= self.batch_size:
+            self._submit()
+
+    def _submit(self) -> bool:
+        """Hand the current batch to the pool, return False if it was kept."""
+        if self._inflight is None and self._batch:
+            future = self.pool.submit(self.process, self._batch)
+            if future is not None:
+                self._batch = []
+                self._saturated = False
+                self._inflight = future
+                future.add_done_callback(self._batch_done)
+                return True
+
+        excess = len(self._batch) - self.max_backlog
+        if excess > 0:
+            del self._batch[:excess]
+            self.dropped_samples += excess
+            if not self._saturated:
+                # Once per episode, the pool drains on its own
+                self._saturated = True
+                _LOGGER.warning(
+                    "Worker pool saturated, dropping samples (%s dropped so far)",
+                    self.dropped_samples,
+                )
+        return False
+
+    def _batch_done(self, future: asyncio.Future) -> None:
+        """Deliver the result of a batch and submit the next one."""
+        self._inflight = None
+        self.batches += 1
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            _LOGGER.error("Error processing samples", exc_info=error)
+        elif self.done is not None:
+            self.done(future.result())
+        if len(self._batch) >= self.batch_size:
+            self._submit()
+
+    async def async_flush(self) -> None:
+        """Process all queued samples, including a partial batch.
+
+        Samples still queued when the pool is shut down are not processed.
+        """
+        while self._inflight is not None or self._batch:
+            if self._inflight is None and not self._submit():
+                if self.pool.closed:
+                    return
+                # Pool saturated, wait for a slot
+                await asyncio.sleep(0.05)
+                continue
+            await asyncio.wait([self._inflight])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return pipeline counters for diagnostics."""
+        return {
+            "queued_samples": len(self._batch),
+            "batches": self.batches,
+            "dropped_samples": self.dropped_samples,
+        }
@@ -0,0 +1,190 @@
+"""Profiling of the update path for Fox Energy integration."""
+
+import cProfile
+import functools
+import inspect
+import pstats
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import api as api_module
+from .api import FoxEnergyDataProcessor
+
+STAGE_UPDATE = "update"
+STAGE_ENDPOINT = "endpoint"
+STAGE_JSON_DECODE = "json_decode"
+STAGE_PROCESS = "process"
+STAGE_STATE_WRITE = "state_write"
+
+# Functions listed in the summary, by cumulative time
+PROFILE_TOP_FUNCTIONS = 20
+
+
+@dataclass(slots=True)
+class _StageTiming:
+    """Timing of one stage."""
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class FoxEnergyProfiler:
+    """Time the stages of the update path and profile the event loop.
+
+    Timing wrappers are installed on start and removed on stop, so the
+    update path runs unmodified while no profile is active. Stages that
+    await I/O (update, endpoint) are timed in wall-clock time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.stages: dict[str, _StageTiming] = {}
+        self.profile = cProfile.Profile()
+        self.started: float | None = None
+        self.seconds = 0.0
+        self._restore: list[Callable[[], None]] = []
+
+    def start(self, coordinators: Iterable[Any]) -> None:
+        """Install timing wrappers and start profiling.
+
+        Args:
+            coordinators: Coordinators of all meters
+
+        Raises:
+            ValueError: If another profiler is active in this thread
+        """
+        self._patch(api_module, "decode_json", STAGE_JSON_DECODE)
+        self._patch(FoxEnergyDataProcessor, "process_3phase_data", STAGE_PROCESS)
+        self._patch(FoxEnergyDataProcessor, "process_1phase_data", STAGE_PROCESS)
+        for coordinator in coordinators:
+            self._patch(coordinator, "_async_update_data", STAGE_UPDATE)
+            self._patch(coordinator, "async_update_listeners", STAGE_STATE_WRITE)
+            self._patch(coordinator.api, "_get_endpoint", STAGE_ENDPOINT)
+
+        try:
+            self.profile.enable()
+        except ValueError:
+            self._unpatch()
+            raise
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling and remove timing wrappers."""
+        self.profile.disable()
+        if self.started is not None:
+            self.seconds = time.perf_counter() - self.started
+        self._unpatch()
+
+    def _unpatch(self) -> None:
+        """Restore the original functions."""
+        while self._restore:
+            self._restore.pop()()
+
+    def _patch(self, owner: Any, name: str, stage: str) -> None:
+        """Replace owner.name with a timing wrapper.
+
+        Args:
+            owner: Module, class or instance holding the function
+            name: Attribute name
+            stage: Stage the time is accounted to
+        """
+        own = vars(owner)
+        had_own = name in own
+        original = own.get(name)
+        func = getattr(owner, name)
+
+        wrapper: Any = (
+            self._wrap_async(stage, func)
+            if inspect.iscoroutinefunction(func)
+            else self._wrap(stage, func)
+        )
+        if isinstance(original, staticmethod | classmethod):
+            # func is already bound to the class
+            wrapper = staticmethod(wrapper)
+        setattr(owner, name, wrapper)
+
+        def restore() -> None:
+            if had_own:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+
+        self._restore.append(restore)
+
+    def _wrap(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return func timed as stage."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    def _wrap_async(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return coroutine function func timed as stage."""
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    def _record(self, stage: str, elapsed: float) -> None:
+        """Account elapsed seconds to stage."""
+        timing = self.stages.get(stage)
+        if timing is None:
+            timing = self.stages[stage] = _StageTiming()
+        timing.calls += 1
+        timing.total += elapsed
+        timing.max = max(timing.max, elapsed)
+
+    def summary(self) -> dict[str, Any]:
+        """Return time spent per stage and the most expensive functions."""
+        stats = pstats.Stats(self.profile)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        top = []
+        for func in stats.fcn_list[:PROFILE_TOP_FUNCTIONS]:
+            calls, _, own, cumulative, _ = stats.stats[func]
+            top.append(
+                {
+                    "function": pstats.func_std_string(func),
+                    "calls": calls,
+                    "own": round(own, 6),
+                    "cumulative": round(cumulative, 6),
+                }
+            )
+
+        return {
+            "seconds": round(self.seconds, 3),
+            "stages": {
+                stage: {
+                    "calls": timing.calls,
+                    "total": round(timing.total, 6),
+                    "mean": round(timing.total / timing.calls, 6),
+                    "max": round(timing.max, 6),
+                }
+                for stage, timing in self.stages.items()
+            },
+            "top": top,
+        }
+
+    def dump(self, path: Path) -> None:
+        """Write the profile as a pstats file (blocking).
+
+        Args:
+            path: Output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(path)
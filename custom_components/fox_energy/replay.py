@@ -0,0 +1,126 @@
+"""Replay of captured meter traffic for Fox Energy integration."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .api import FoxEnergyAPI, FoxEnergyConnectionError
+from .capture import CaptureRecord
+
+
+@dataclass(slots=True)
+class ReplayFrame:
+    """Responses of one poll.
+
+    Attributes:
+        timestamp: Unix timestamp of the first response of the poll
+        responses: Endpoint path to response JSON
+    """
+
+    timestamp: float
+    responses: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def iter_frames(records: Iterable[CaptureRecord]) -> Iterator[ReplayFrame]:
+    """Group captured responses into polls.
+
+    A poll requests every endpoint at most once, so a new frame starts
+    whenever an endpoint repeats.
+
+    Args:
+        records: Responses in the order received
+
+    Yields:
+        One frame per poll
+    """
+    frame: ReplayFrame | None = None
+    for record in records:
+        if frame is None or record.endpoint in frame.responses:
+            if frame is not None:
+                yield frame
+            frame = ReplayFrame(record.timestamp)
+        frame.responses[record.endpoint] = record.data
+    if frame is not None:
+        yield frame
+
+
+class FoxEnergyReplayAPI(FoxEnergyAPI):
+    """API client answering from a captured frame instead of the meter.
+
+    Only the HTTP request is replaced, so limiters, single-flight and
+    metrics behave as with a real meter.
+    """
+
+    def __init__(self, host: str):
+        """Initialize the replay client.
+
+        Args:
+            host: Host of the captured meter
+        """
+        # Every poll must see its own frame
+        super().__init__(host, cache_ttl=0)
+        self.frame = ReplayFrame(0.0)
+
+    async def _request(self, endpoint: str) -> dict[str, Any]:
+        """Return the captured response of the current frame.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            Captured response
+
+        Raises:
+            FoxEnergyConnectionError: If the frame has no response for endpoint
+        """
+        try:
+            return self.frame.responses[endpoint]
+        except KeyError:
+            raise FoxEnergyConnectionError(
+                f"No captured response for {endpoint} at {self.frame.timestamp}"
+            ) from None
+
+
+async def async_replay(
+    frames: Iterable[ReplayFrame],
+    api: FoxEnergyReplayAPI,
+    poll: Callable[[float], Awaitable[Any]],
+    speed: float | None = 1.0,
+) -> dict[str, Any]:
+    """Feed captured frames through a poll function.
+
+    Args:
+        frames: Frames in capture order
+        api: Replay client the poll function requests data from
+        poll: Called with the frame timestamp once the frame is current
+        speed: Replay speed relative to capture time (1.0 = real time),
+            None replays as fast as possible
+
+    Returns:
+        Number of frames, elapsed seconds and frames per second
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    count = 0
+    first: float | None = None
+    start = loop.time()
+
+    for frame in frames:
+        if first is None:
+            first = frame.timestamp
+        if speed:
+            delay = start + (frame.timestamp - first) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        api.frame = frame
+        await poll(frame.timestamp)
+        count += 1
+
+    seconds = time.perf_counter() - started
+    return {
+        "frames": count,
+        "seconds": round(seconds, 3),
+        "frames_per_second": round(count / seconds, 1) if seconds > 0 else 0.0,
+    }
@@ -0,0 +1,109 @@
+"""Hourly rollups of samples for Fox Energy integration."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+HOUR = 3600
+
+
+@dataclass(slots=True)
+class _Aggregate:
+    """Running aggregate of one field within an hour."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+    last: float = 0.0
+
+
+@dataclass(slots=True)
+class HourlyRollup:
+    """Statistics of one completed hour.
+
+    Attributes:
+        start: Unix timestamp of the start of the hour
+        measurements: Field key to (mean, min, max)
+        energy: Field key to last meter reading of the hour
+    """
+
+    start: float
+    measurements: dict[str, tuple[float, float, float]] = field(default_factory=dict)
+    energy: dict[str, float] = field(default_factory=dict)
+
+
+class FoxEnergyHourlyRollup:
+    """Aggregate samples into hourly mean/min/max and energy readings.
+
+    Memory use is constant per field; a rollup is produced whenever a
+    sample belongs to a later hour than the previous one.
+    """
+
+    def __init__(self, measurement_keys: list[str], energy_keys: list[str]):
+        """Initialize the rollup.
+
+        Args:
+            measurement_keys: Fields aggregated as mean/min/max
+            energy_keys: Monotonic energy counters (kWh)
+        """
+        self.measurement_keys = list(measurement_keys)
+        self.energy_keys = list(energy_keys)
+        self._hour: float | None = None
+        self._aggregates: dict[str, _Aggregate] = {}
+
+    def add(self, timestamp: float, data: dict[str, Any]) -> HourlyRollup | None:
+        """Add a sample.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            The previous hour once a sample of a new hour arrives
+        """
+        hour = timestamp - timestamp % HOUR
+        completed = None
+        if self._hour is not None and hour > self._hour:
+            completed = self.flush()
+        self._hour = hour
+
+        for key in (*self.measurement_keys, *self.energy_keys):
+            value = data.get(key)
+            if value is None:
+                continue
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = _Aggregate()
+            aggregate.count += 1
+            aggregate.total += value
+            aggregate.min = min(aggregate.min, value)
+            aggregate.max = max(aggregate.max, value)
+            aggregate.last = value
+
+        return completed
+
+    def flush(self) -> HourlyRollup | None:
+        """Return the current hour so far and start over.
+
+        Returns:
+            Rollup of the current hour, None if no samples were added
+        """
+        if self._hour is None or not self._aggregates:
+            return None
+
+        rollup = HourlyRollup(start=self._hour)
+        for key in self.measurement_keys:
+            aggregate = self._aggregates.get(key)
+            if aggregate is not None:
+                rollup.measurements[key] = (
+                    aggregate.total / aggregate.count,
+                    aggregate.min,
+                    aggregate.max,
+                )
+        for key in self.energy_keys:
+            aggregate = self._aggregates.get(key)
+            if aggregate is not None:
+                rollup.energy[key] = aggregate.last
+
+        self._aggregates = {}
+        return rollup
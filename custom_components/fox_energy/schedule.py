@@ -0,0 +1,16 @@
+"""Poll scheduling for Fox Energy integration."""
+
+import math
+
+
+def next_aligned_tick(now: float, interval: float) -> float:
+    """Return the first wall-clock boundary of interval strictly after now.
+
+    Args:
+        now: Current time as a Unix timestamp
+        interval: Tick interval in seconds
+
+    Returns:
+        Unix timestamp of the next tick
+    """
+    return (math.floor(now / interval) + 1) * interval
@@ -1,18 +1,80 @@
 """Sensors for Fox Energy integration."""
 
 import logging
+from typing import Any
 
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DEVICE_TYPE_3PHASE, DOMAIN, SENSORS_1PHASE, SENSORS_3PHASE
+from .const import (
+    CONF_ENTRY_TYPE,
+    DATA_VIRTUAL_METERS,
+    DEVICE_TYPE_3PHASE,
+    DOMAIN,
+    ENTRY_TYPE_VIRTUAL,
+    SENSORS_1PHASE,
+    SENSORS_3PHASE,
+)
 from .coordinator import FoxEnergyCoordinator
+from .demand import DEMAND_SENSORS
 from .entity import FoxEnergySensor
+from .forecast import FORECAST_SENSORS
+from .tariffs import tariff_sensors
+from .virtual import FoxEnergyVirtualCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _build_descriptions(
+    sensors: dict[str, dict[str, Any]], state_class: bool = True
+) -> tuple[SensorEntityDescription, ...]:
+    """Build entity descriptions from sensor configuration dicts.
+
+    Args:
+        sensors: Sensor configuration by key
+        state_class: Whether to set the state class; without it the recorder
+            does not compile statistics from every state row
+
+    Returns:
+        Frozen descriptions in configuration order
+    """
+    return tuple(
+        SensorEntityDescription(
+            key=key,
+            name=config.get("name"),
+            native_unit_of_measurement=config.get("unit"),
+            device_class=(
+                SensorDeviceClass(config.get("device_class"))
+                if config.get("device_class")
+                else None
+            ),
+            state_class=(
+                SensorStateClass(config.get("state_class"))
+                if state_class and config.get("state_class")
+                else None
+            ),
+            icon=config.get("icon"),
+        )
+        for key, config in sensors.items()
+    )
+
+
+# Built once at import and shared by the entities of all meters. The variants
+# without state class are used when the coordinator imports statistics itself.
+SENSOR_DESCRIPTIONS_3PHASE = _build_descriptions(SENSORS_3PHASE)
+SENSOR_DESCRIPTIONS_1PHASE = _build_descriptions(SENSORS_1PHASE)
+SENSOR_DESCRIPTIONS_3PHASE_NO_STATS = _build_descriptions(SENSORS_3PHASE, False)
+SENSOR_DESCRIPTIONS_1PHASE_NO_STATS = _build_descriptions(SENSORS_1PHASE, False)
+DEMAND_SENSOR_DESCRIPTIONS = _build_descriptions(DEMAND_SENSORS)
+FORECAST_SENSOR_DESCRIPTIONS = _build_descriptions(FORECAST_SENSORS)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -25,16 +87,50 @@ async def async_setup_entry(
         config_entry: Config entry
         async_add_entities: Callback to add entities
     """
+    if config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_VIRTUAL:
+        virtual: FoxEnergyVirtualCoordinator = hass.data[DATA_VIRTUAL_METERS][
+            config_entry.entry_id
+        ]
+        async_add_entities(
+            FoxEnergySensor(virtual, description)
+            for description in _build_descriptions(virtual.sensors_config)
+        )
+        return
+
     coordinator: FoxEnergyCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     if coordinator.device_type == DEVICE_TYPE_3PHASE:
-        sensors_config = SENSORS_3PHASE
+        descriptions = (
+            SENSOR_DESCRIPTIONS_3PHASE_NO_STATS
+            if coordinator.external_statistics
+            else SENSOR_DESCRIPTIONS_3PHASE
+        )
     else:
-        sensors_config = SENSORS_1PHASE
+        descriptions = (
+            SENSOR_DESCRIPTIONS_1PHASE_NO_STATS
+            if coordinator.external_statistics
+            else SENSOR_DESCRIPTIONS_1PHASE
+        )
+
+    calendar = coordinator.tariff_calendar
+    if calendar is not None:
+        energy_keys = coordinator.energy_keys
+        descriptions += _build_descriptions(
+            tariff_sensors(
+                calendar,
+                {
+                    key: config
+                    for key, config in coordinator.sensors_config.items()
+                    if key in energy_keys
+                },
+            )
+        )
 
-    entities = [
-        FoxEnergySensor(coordinator, sensor_key, sensor_config)
-        for sensor_key, sensor_config in sensors_config.items()
-    ]
+    if coordinator.demand_tracking:
+        descriptions += DEMAND_SENSOR_DESCRIPTIONS
+    if coordinator.energy_forecast:
+        descriptions += FORECAST_SENSOR_DESCRIPTIONS
 
-    async_add_entities(entities)
+    async_add_entities(
+        FoxEnergySensor(coordinator, description) for description in descriptions
+    )
@@ -0,0 +1,315 @@
+"""Services for Fox Energy integration."""
+
+import asyncio
+import logging
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.dt import as_utc, utcnow
+
+from .api import FoxEnergyConnectionError, FoxEnergyInvalidResponse
+from .burst import BURST_MAX_DURATION
+from .capture import CAPTURE_FILE_SUFFIX, read_capture
+from .const import DOMAIN
+from .coordinator import FoxEnergyCoordinator
+from .export import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    FoxEnergyExportError,
+    export_samples,
+)
+from .profile import FoxEnergyProfiler
+from .replay import iter_frames
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_EXPORT = "export"
+SERVICE_CAPTURE = "capture"
+SERVICE_PROFILE = "profile"
+SERVICE_BURST_CAPTURE = "burst_capture"
+SERVICE_REPLAY = "replay"
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_METERS = "meters"
+ATTR_FORMAT = "format"
+ATTR_PATH = "path"
+ATTR_DURATION = "duration"
+ATTR_METER = "meter"
+ATTR_SPEED = "speed"
+
+MAX_CAPTURE_DURATION = 86400
+MAX_PROFILE_DURATION = 3600
+MAX_REPLAY_SPEED = 1000
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Required(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_METERS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_METERS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_CAPTURE_DURATION)
+        ),
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+BURST_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_METER): cv.string,
+        vol.Required(ATTR_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=BURST_MAX_DURATION)
+        ),
+        vol.Optional(ATTR_PATH): cv.string,
+    }
+)
+
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_METER): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+        # 0 replays as fast as possible
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_REPLAY_SPEED)
+        ),
+    }
+)
+
+
+def _resolve_path(hass: HomeAssistant, value: str) -> Path:
+    """Resolve a service path against the configuration directory.
+
+    Args:
+        hass: Home Assistant instance
+        value: Absolute path or path relative to the configuration directory
+
+    Returns:
+        Absolute path
+
+    Raises:
+        ServiceValidationError: If accessing the path is not allowed
+    """
+    path = Path(value)
+    if not path.is_absolute():
+        path = Path(hass.config.path(str(path)))
+    if not hass.config.is_allowed_path(str(path)):
+        raise ServiceValidationError(f"Access to {path} is not allowed")
+    return path
+
+
+def _get_coordinators(
+    hass: HomeAssistant, hosts: list[str] | None
+) -> list[FoxEnergyCoordinator]:
+    """Return coordinators of the selected meters.
+
+    Args:
+        hass: Home Assistant instance
+        hosts: Meter hosts, None selects all meters
+
+    Returns:
+        Matching coordinators
+
+    Raises:
+        ServiceValidationError: If a host is not configured
+    """
+    coordinators = list(hass.data.get(DOMAIN, {}).values())
+    if hosts is None:
+        return coordinators
+
+    by_host = {coordinator.host: coordinator for coordinator in coordinators}
+    unknown = [host for host in hosts if host not in by_host]
+    if unknown:
+        raise ServiceValidationError(f"Unknown Fox Energy meters: {', '.join(unknown)}")
+    return [by_host[host] for host in hosts]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Fox Energy services.
+
+    Args:
+        hass: Home Assistant instance
+    """
+
+    async def async_export(call: ServiceCall) -> ServiceResponse:
+        """Export stored samples to a CSV or Parquet file."""
+        path = _resolve_path(hass, call.data[ATTR_PATH])
+
+        start = as_utc(call.data[ATTR_START]).timestamp()
+        end = as_utc(call.data[ATTR_END]).timestamp()
+        if end <= start:
+            raise ServiceValidationError("End must be after start")
+
+        sources = []
+        for coordinator in _get_coordinators(hass, call.data.get(ATTR_METERS)):
+            await coordinator.async_flush_samples()
+            if coordinator.sample_store is not None:
+                sources.append((coordinator.host, coordinator.sample_store))
+        if not sources:
+            raise ServiceValidationError("No selected meter has sample storage enabled")
+
+        try:
+            return await hass.async_add_executor_job(
+                export_samples, sources, start, end, path, call.data[ATTR_FORMAT]
+            )
+        except (FoxEnergyExportError, OSError) as err:
+            raise HomeAssistantError(f"Export failed: {err}") from err
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        async_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_capture(call: ServiceCall) -> ServiceResponse:
+        """Record raw responses of meters to one file per meter."""
+        directory = _resolve_path(hass, call.data[ATTR_PATH])
+        coordinators = _get_coordinators(hass, call.data.get(ATTR_METERS))
+        stamp = utcnow().strftime("%Y%m%dT%H%M%S")
+
+        try:
+            captures = await asyncio.gather(
+                *(
+                    coordinator.async_capture(
+                        directory / f"{coordinator.host.replace(':', '_')}-{stamp}"
+                        f"{CAPTURE_FILE_SUFFIX}",
+                        call.data[ATTR_DURATION],
+                    )
+                    for coordinator in coordinators
+                )
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Capture failed: {err}") from err
+        return {"captures": list(captures)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        async_capture,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    profiling = False
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Time the update path of all meters and profile the event loop."""
+        nonlocal profiling
+        path = _resolve_path(hass, call.data[ATTR_PATH])
+        if profiling:
+            raise ServiceValidationError("A profile is already running")
+
+        profiler = FoxEnergyProfiler()
+        try:
+            profiler.start(_get_coordinators(hass, None))
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+        profiling = True
+        try:
+            await asyncio.sleep(call.data[ATTR_DURATION])
+        finally:
+            profiler.stop()
+            profiling = False
+
+        try:
+            await hass.async_add_executor_job(profiler.dump, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Writing profile failed: {err}") from err
+        return {"path": str(path), **profiler.summary()}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_burst_capture(call: ServiceCall) -> ServiceResponse:
+        """Sample one meter as fast as it answers for a short window."""
+        path = (
+            _resolve_path(hass, call.data[ATTR_PATH])
+            if ATTR_PATH in call.data
+            else None
+        )
+        (coordinator,) = _get_coordinators(hass, [call.data[ATTR_METER]])
+
+        try:
+            result, buffer = await coordinator.async_burst_capture(
+                call.data[ATTR_DURATION]
+            )
+        except (FoxEnergyConnectionError, FoxEnergyInvalidResponse) as err:
+            raise HomeAssistantError(f"Burst capture failed: {err}") from err
+        if result["aborted"] and not result["samples"]:
+            raise HomeAssistantError(
+                f"Burst capture failed: {result['errors']} errors in a row"
+            )
+
+        if path is None:
+            return {**result, **buffer.as_dict()}
+        try:
+            await hass.async_add_executor_job(buffer.write_json, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Writing burst capture failed: {err}") from err
+        return {**result, "path": str(path)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BURST_CAPTURE,
+        async_burst_capture,
+        schema=BURST_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_replay(call: ServiceCall) -> ServiceResponse:
+        """Replay a capture file through a copy of one meter's coordinator."""
+        path = _resolve_path(hass, call.data[ATTR_PATH])
+        (coordinator,) = _get_coordinators(hass, [call.data[ATTR_METER]])
+
+        try:
+            records = await hass.async_add_executor_job(list, read_capture(path))
+        except (OSError, ValueError, KeyError) as err:
+            raise HomeAssistantError(f"Reading capture failed: {err}") from err
+
+        result = await coordinator.async_replay(
+            iter_frames(records), call.data[ATTR_SPEED] or None
+        )
+        return {"host": coordinator.host, "path": str(path), **result}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY,
+        async_replay,
+        schema=REPLAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,264 @@
+"""Step-change (appliance on/off) detection for Fox Energy integration."""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+from .const import DEVICE_TYPE_3PHASE
+
+# CUSUM drift and decision threshold, in units of the minimum step
+STEP_DRIFT = 0.5
+STEP_DECISION = 2.0
+# Weight of a sample in the steady level while no change is in progress
+LEVEL_SMOOTHING = 0.1
+# Relative distance within which a step matches an appliance signature
+APPLIANCE_TOLERANCE = 0.15
+
+
+@dataclass(frozen=True, slots=True)
+class Appliance:
+    """Power signature of an appliance.
+
+    Attributes:
+        name: Appliance name
+        power: Active power drawn when on, in W
+        reactive_power: Reactive power drawn when on, in VAr (None to
+            match on active power only)
+    """
+
+    name: str
+    power: float
+    reactive_power: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class StepChange:
+    """Step change detected on one phase.
+
+    Attributes:
+        phase: Phase label
+        power_delta: Change of active power in W
+        reactive_power_delta: Change of reactive power in VAr
+        power: Active power after the change in W
+        reactive_power: Reactive power after the change in VAr
+        appliance: Name of the matching appliance, if any
+    """
+
+    phase: str
+    power_delta: float
+    reactive_power_delta: float
+    power: float
+    reactive_power: float
+    appliance: str | None = None
+
+
+def parse_appliances(text: str) -> list[Appliance]:
+    """Parse an appliance table, one "name: W[, VAr]" line per appliance.
+
+    Args:
+        text: Appliance table
+
+    Returns:
+        Appliances
+
+    Raises:
+        ValueError: If a line is not valid
+    """
+    appliances = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name, separator, values = line.rpartition(":")
+        name = name.strip()
+        if not separator or not name:
+            raise ValueError(f"Missing appliance name: {line!r}")
+        numbers = [float(value) for value in values.split(",")]
+        if len(numbers) > 2 or numbers[0] <= 0:
+            raise ValueError(f"Invalid appliance power: {line!r}")
+        appliances.append(Appliance(name, *numbers))
+    return appliances
+
+
+def match_appliance(
+    appliances: list[Appliance],
+    power_delta: float,
+    reactive_power_delta: float,
+    tolerance: float = APPLIANCE_TOLERANCE,
+) -> Appliance | None:
+    """Return the appliance whose signature is nearest to a step.
+
+    Steps down are matched against the signatures of appliances turning off.
+
+    Args:
+        appliances: Appliance signatures
+        power_delta: Change of active power in W
+        reactive_power_delta: Change of reactive power in VAr
+        tolerance: Largest distance relative to the signature magnitude
+
+    Returns:
+        Matching appliance, None if no signature is close enough
+    """
+    sign = 1 if power_delta >= 0 else -1
+    best = None
+    best_distance = math.inf
+    for appliance in appliances:
+        reactive = appliance.reactive_power
+        distance = math.hypot(
+            sign * power_delta - appliance.power,
+            0 if reactive is None else sign * reactive_power_delta - reactive,
+        )
+        if (
+            distance <= tolerance * math.hypot(appliance.power, reactive or 0)
+            and distance < best_distance
+        ):
+            best = appliance
+            best_distance = distance
+    return best
+
+
+class _PhaseDetector:
+    """Two-sided CUSUM on the active and reactive power of one phase."""
+
+    __slots__ = (
+        "count",
+        "level_p",
+        "level_q",
+        "neg_p",
+        "neg_q",
+        "pos_p",
+        "pos_q",
+        "sum_p",
+        "sum_q",
+    )
+
+    def __init__(self, power: float, reactive_power: float):
+        """Initialize the detector at a steady level."""
+        self.level_p = power
+        self.level_q = reactive_power
+        self.pos_p = self.neg_p = self.pos_q = self.neg_q = 0.0
+        self.sum_p = self.sum_q = 0.0
+        self.count = 0
+
+    def update(
+        self, power: float, reactive_power: float, min_step: float
+    ) -> tuple[float, float] | None:
+        """Add a sample, return the new level once a change is confirmed."""
+        drift = min_step * STEP_DRIFT
+        dp = power - self.level_p
+        dq = reactive_power - self.level_q
+        self.pos_p = max(0.0, self.pos_p + dp - drift)
+        self.neg_p = max(0.0, self.neg_p - dp - drift)
+        self.pos_q = max(0.0, self.pos_q + dq - drift)
+        self.neg_q = max(0.0, self.neg_q - dq - drift)
+
+        if not (self.pos_p or self.neg_p or self.pos_q or self.neg_q):
+            self.count = 0
+            self.level_p += LEVEL_SMOOTHING * dp
+            self.level_q += LEVEL_SMOOTHING * dq
+            return None
+
+        # The first sample of a change often falls on the switching
+        # transient (inrush current), so the new level is averaged over
+        # the samples after it
+        self.count += 1
+        if self.count == 1:
+            self.sum_p = self.sum_q = 0.0
+            return None
+        self.sum_p += power
+        self.sum_q += reactive_power
+        if (
+            max(self.pos_p, self.neg_p, self.pos_q, self.neg_q)
+            < min_step * STEP_DECISION
+        ):
+            return None
+
+        level = (self.sum_p / (self.count - 1), self.sum_q / (self.count - 1))
+        self.level_p, self.level_q = level
+        self.pos_p = self.neg_p = self.pos_q = self.neg_q = 0.0
+        self.count = 0
+        return level
+
+
+class FoxEnergyStepDetector:
+    """Detect step changes of per-phase active and reactive power.
+
+    Each phase runs a two-sided CUSUM against its steady level, so every
+    sample costs a fixed handful of float operations and no history is
+    kept. A change is confirmed once the accumulated deviation exceeds
+    twice the minimum step and at least one sample followed the switching
+    sample; changes smaller than the minimum step (transients that
+    returned to the old level) are absorbed into the level.
+    """
+
+    def __init__(
+        self,
+        device_type: str,
+        min_step: float,
+        appliances: list[Appliance] | None = None,
+    ):
+        """Initialize the detector.
+
+        Args:
+            device_type: "3phase" or "1phase"
+            min_step: Smallest change reported, in W or VAr
+            appliances: Appliance signatures steps are matched against
+        """
+        if device_type == DEVICE_TYPE_3PHASE:
+            suffixes = [("L1", "_l1"), ("L2", "_l2"), ("L3", "_l3")]
+        else:
+            suffixes = [("L1", "")]
+        self.phases = [
+            (phase, f"moc_czynna{suffix}", f"moc_reaktywna{suffix}")
+            for phase, suffix in suffixes
+        ]
+        self.min_step = min_step
+        self.appliances = list(appliances or [])
+        self._detectors: dict[str, _PhaseDetector] = {}
+
+    @property
+    def fields(self) -> set[str]:
+        """Return the sample fields the detector reads."""
+        return {key for _, *keys in self.phases for key in keys}
+
+    def add(self, data: dict[str, Any]) -> list[StepChange]:
+        """Add a sample.
+
+        Args:
+            data: Processed sample
+
+        Returns:
+            Step changes confirmed by this sample
+        """
+        steps = []
+        for phase, power_key, reactive_key in self.phases:
+            power = data.get(power_key)
+            if power is None:
+                continue
+            reactive_power = data.get(reactive_key) or 0.0
+
+            detector = self._detectors.get(phase)
+            if detector is None:
+                self._detectors[phase] = _PhaseDetector(power, reactive_power)
+                continue
+
+            level_p, level_q = detector.level_p, detector.level_q
+            level = detector.update(power, reactive_power, self.min_step)
+            if level is None:
+                continue
+            power_delta = level[0] - level_p
+            reactive_delta = level[1] - level_q
+            if max(abs(power_delta), abs(reactive_delta)) < self.min_step:
+                continue
+
+            appliance = match_appliance(self.appliances, power_delta, reactive_delta)
+            steps.append(
+                StepChange(
+                    phase,
+                    round(power_delta, 1),
+                    round(reactive_delta, 1),
+                    round(level[0], 1),
+                    round(level[1], 1),
+                    appliance.name if appliance else None,
+                )
+            )
+        return steps
@@ -0,0 +1,347 @@
+"""Sample store for Fox Energy integration."""
+
+import logging
+import math
+import os
+import struct
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .gorilla import decode_column, decode_ints, encode_column, encode_ints
+
+_LOGGER = logging.getLogger(__name__)
+
+# A block is the unit of disk I/O and compression
+SAMPLE_BLOCK_SIZE = 120
+SAMPLE_FILE_SUFFIX = ".fxs"
+
+# Block length (excluding this field), first and last timestamp, rows, keys
+_BLOCK_HEADER = struct.Struct("<IddIH")
+# Leading length field of the block header
+_BLOCK_LENGTH = struct.Struct("<I")
+# Column minimum, maximum and encoded length
+_COLUMN_HEADER = struct.Struct("<ddI")
+_KEY_LENGTH = struct.Struct("<B")
+_SEGMENT_LENGTH = struct.Struct("<I")
+
+# Value range filter: key -> (minimum, maximum), None for unbounded
+ValueFilter = dict[str, tuple[float | None, float | None]]
+
+
+def _day_name(timestamp: float) -> str:
+    """Return the UTC day file stem for a timestamp."""
+    return datetime.fromtimestamp(timestamp, UTC).strftime("%Y-%m-%d")
+
+
+class _Block:
+    """Block read from disk, columns are decoded on first access."""
+
+    __slots__ = ("_decoded", "_segments", "keys", "ranges", "rows", "t0", "t1")
+
+    def __init__(self, t0: float, t1: float, rows: int, keys: list[str]):
+        """Initialize the block."""
+        self.t0 = t0
+        self.t1 = t1
+        self.rows = rows
+        self.keys = keys
+        self.ranges: dict[str, tuple[float, float]] = {}
+        self._segments: dict[str | None, memoryview] = {}
+        self._decoded: dict[str | None, list[Any]] = {}
+
+    @classmethod
+    def parse(cls, t0: float, t1: float, rows: int, count: int, body: bytes):
+        """Parse the key list and column index of a compressed block.
+
+        Args:
+            t0: First timestamp
+            t1: Last timestamp
+            rows: Number of rows
+            count: Number of keys
+            body: Block without header
+
+        Returns:
+            Block with encoded columns
+        """
+        view = memoryview(body)
+        offset = 0
+        keys = []
+        for _ in range(count):
+            (length,) = _KEY_LENGTH.unpack_from(view, offset)
+            offset += _KEY_LENGTH.size
+            keys.append(bytes(view[offset : offset + length]).decode())
+            offset += length
+
+        block = cls(t0, t1, rows, keys)
+        (length,) = _SEGMENT_LENGTH.unpack_from(view, offset)
+        offset += _SEGMENT_LENGTH.size
+        block._segments[None] = view[offset : offset + length]
+        offset += length
+        for key in keys:
+            minimum, maximum, length = _COLUMN_HEADER.unpack_from(view, offset)
+            offset += _COLUMN_HEADER.size
+            block.ranges[key] = (minimum, maximum)
+            block._segments[key] = view[offset : offset + length]
+            offset += length
+        return block
+
+    def timestamps(self) -> list[float]:
+        """Return the timestamps of the rows."""
+        decoded = self._decoded.get(None)
+        if decoded is None:
+            decoded = self._decoded[None] = [
+                value / 1000
+                for value in decode_ints(bytes(self._segments[None]), self.rows)
+            ]
+        return decoded
+
+    def column(self, key: str) -> list[Any]:
+        """Return the values of a column, None for keys not in the block."""
+        decoded = self._decoded.get(key)
+        if decoded is None:
+            segment = self._segments.get(key)
+            decoded = self._decoded[key] = (
+                decode_column(bytes(segment), self.rows)
+                if segment is not None
+                else [None] * self.rows
+            )
+        return decoded
+
+    def may_match(self, where: ValueFilter | None) -> bool:
+        """Return False if the block index rules out any row matching where."""
+        if not where:
+            return True
+        for key, (low, high) in where.items():
+            minimum, maximum = self.ranges.get(key, (math.nan, math.nan))
+            if math.isnan(minimum):
+                return False
+            if (low is not None and maximum < low) or (
+                high is not None and minimum > high
+            ):
+                return False
+        return True
+
+
+def encode_block(keys: list[str], rows: list[list[Any]]) -> bytes:
+    """Encode rows as a compressed block.
+
+    Timestamps are stored in milliseconds with delta-of-delta encoding and
+    every column is compressed separately, with its minimum and maximum in
+    the block index.
+
+    Args:
+        keys: Column keys
+        rows: Rows of [timestamp, *values], ordered by time
+
+    Returns:
+        Block including its header
+    """
+    parts = []
+    for key in keys:
+        encoded = key.encode()
+        parts.append(_KEY_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+
+    timestamps = encode_ints([round(row[0] * 1000) for row in rows])
+    parts.append(_SEGMENT_LENGTH.pack(len(timestamps)))
+    parts.append(timestamps)
+
+    for index, key in enumerate(keys, 1):
+        values = [row[index] for row in rows]
+        present = [value for value in values if value is not None]
+        encoded = encode_column(values)
+        parts.append(
+            _COLUMN_HEADER.pack(
+                min(present) if present else math.nan,
+                max(present) if present else math.nan,
+                len(encoded),
+            )
+        )
+        parts.append(encoded)
+
+    body = b"".join(parts)
+    header = _BLOCK_HEADER.pack(
+        _BLOCK_HEADER.size - _BLOCK_LENGTH.size + len(body),
+        rows[0][0],
+        rows[-1][0],
+        len(rows),
+        len(keys),
+    )
+    return header + body
+
+
+class FoxEnergySampleStore:
+    """Append-only on-disk store of processed samples for one meter.
+
+    Rows are buffered in memory by the coordinator (on the event loop) and
+    handed out as full blocks, which are compressed and written from an
+    executor. Blocks are stored in one file per UTC day. Each block header
+    holds its time range and per-column minimum and maximum, so range reads
+    only open the files of the requested days, skip blocks outside the time
+    or value range without decoding them and decode only requested columns.
+    """
+
+    def __init__(
+        self, path: Path, keys: list[str], block_size: int = SAMPLE_BLOCK_SIZE
+    ):
+        """Initialize the store.
+
+        Args:
+            path: Directory holding the day files of this meter
+            keys: Sample fields in column order
+            block_size: Rows per block
+        """
+        self.path = path
+        self.keys = list(keys)
+        self.block_size = block_size
+        self._pending: list[list[Any]] = []
+
+    def append(self, timestamp: float, data: dict[str, Any]) -> list[list[Any]] | None:
+        """Buffer a sample.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            A full block to be written with write_block, otherwise None
+        """
+        self._pending.append([timestamp, *(data.get(key) for key in self.keys)])
+        if len(self._pending) >= self.block_size:
+            return self.take_pending()
+        return None
+
+    def take_pending(self) -> list[list[Any]]:
+        """Return and clear the buffered rows."""
+        block, self._pending = self._pending, []
+        return block
+
+    def write_block(self, rows: list[list[Any]]) -> None:
+        """Write rows to the day files (blocking, run in an executor).
+
+        Args:
+            rows: Rows of [timestamp, *values], ordered by time
+        """
+        if not rows:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Split at day boundaries so every block belongs to one file
+        start = 0
+        for index in range(1, len(rows) + 1):
+            if index == len(rows) or _day_name(rows[index][0]) != _day_name(
+                rows[start][0]
+            ):
+                self._write_day(rows[start:index])
+                start = index
+
+    def _write_day(self, rows: list[list[Any]]) -> None:
+        """Append one block to the file of its day."""
+        file = self.path / f"{_day_name(rows[0][0])}{SAMPLE_FILE_SUFFIX}"
+        with open(file, "ab") as handle:
+            handle.write(encode_block(self.keys, rows))
+
+    def iter_rows(
+        self,
+        start: float,
+        end: float,
+        chunk_size: int = 10_000,
+        keys: list[str] | None = None,
+        where: ValueFilter | None = None,
+    ) -> Iterator[tuple[list[str], list[list[Any]]]]:
+        """Read rows in [start, end) in chunks (blocking).
+
+        Args:
+            start: Unix timestamp, inclusive
+            end: Unix timestamp, exclusive
+            chunk_size: Maximum rows per chunk
+            keys: Columns to read, None for the columns stored in each block
+            where: Only rows whose values are within these ranges
+
+        Yields:
+            Column keys and a chunk of rows
+        """
+        chunk: list[list[Any]] = []
+        chunk_keys = keys if keys is not None else self.keys
+
+        for block in self._iter_blocks(start, end):
+            if not block.may_match(where):
+                continue
+            block_keys = keys if keys is not None else block.keys
+            if block_keys != chunk_keys and chunk:
+                yield chunk_keys, chunk
+                chunk = []
+            chunk_keys = block_keys
+
+            timestamps = block.timestamps()
+            columns = [block.column(key) for key in block_keys]
+            filters = [
+                (block.column(key), low, high)
+                for key, (low, high) in (where or {}).items()
+            ]
+            for index, timestamp in enumerate(timestamps):
+                if not start <= timestamp < end:
+                    continue
+                if filters and not all(
+                    values[index] is not None
+                    and (low is None or values[index] >= low)
+                    and (high is None or values[index] <= high)
+                    for values, low, high in filters
+                ):
+                    continue
+                chunk.append([timestamp, *(column[index] for column in columns)])
+                if len(chunk) >= chunk_size:
+                    yield chunk_keys, chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk_keys, chunk
+
+    def _iter_blocks(self, start: float, end: float) -> Iterator[_Block]:
+        """Return blocks overlapping [start, end), oldest first."""
+        for file in self._files_between(start, end):
+            with open(file, "rb") as handle:
+                while True:
+                    header = handle.read(_BLOCK_HEADER.size)
+                    if len(header) < _BLOCK_HEADER.size:
+                        break
+                    length, t0, t1, rows, count = _BLOCK_HEADER.unpack(header)
+                    remaining = length - (_BLOCK_HEADER.size - _BLOCK_LENGTH.size)
+                    if t1 < start or t0 >= end:
+                        handle.seek(remaining, os.SEEK_CUR)
+                        continue
+                    body = handle.read(remaining)
+                    if len(body) < remaining:
+                        _LOGGER.warning("Truncated sample block in %s", file)
+                        break
+                    yield _Block.parse(t0, t1, rows, count, body)
+
+    def _files_between(self, start: float, end: float) -> list[Path]:
+        """Return the day files overlapping [start, end), oldest first."""
+        if not self.path.is_dir():
+            return []
+        first = _day_name(start)
+        last = _day_name(end)
+        return sorted(
+            file
+            for file in self.path.iterdir()
+            if file.suffix == SAMPLE_FILE_SUFFIX and first <= file.stem <= last
+        )
+
+    def prune(self, retention_days: int) -> None:
+        """Delete day files older than the retention period (blocking).
+
+        Args:
+            retention_days: Number of days to keep
+        """
+        if not self.path.is_dir():
+            return
+        cutoff = (datetime.now(UTC) - timedelta(days=retention_days)).strftime(
+            "%Y-%m-%d"
+        )
+        for file in self.path.iterdir():
+            if file.suffix == SAMPLE_FILE_SUFFIX and file.stem < cutoff:
+                _LOGGER.debug("Removing expired sample file %s", file)
+                os.remove(file)
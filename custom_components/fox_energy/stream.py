@@ -0,0 +1,352 @@
+"""Binary sample stream between the poller daemon and the integration."""
+
+import asyncio
+import json
+import logging
+import math
+import struct
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_VERSION = 1
+
+# Every frame starts with the payload length and the frame type
+FRAME_HEADER = struct.Struct("<IB")
+# Protocol version, first frame on every connection
+FRAME_HELLO = 0
+# Meter index, then JSON with host, device type and sample keys; sent again
+# when the layout of the samples changes
+FRAME_METER = 1
+# Meter index, timestamp and one float64 per key (NaN = missing)
+FRAME_SAMPLE = 2
+# Meter index, then the UTF-8 message of a failed poll
+FRAME_ERROR = 3
+
+METER_INDEX = struct.Struct("<H")
+MAX_FRAME_SIZE = 1 << 20
+
+# Seconds between reconnect attempts, doubled up to the maximum
+STREAM_RETRY_DELAY = 1.0
+STREAM_MAX_RETRY_DELAY = 30.0
+
+SampleCallback = Callable[[float, dict[str, Any], str], None]
+ErrorCallback = Callable[[str], None]
+TaskFactory = Callable[[Coroutine[Any, Any, None], str], asyncio.Task]
+
+
+class FoxEnergyStreamError(Exception):
+    """Malformed or incompatible sample stream."""
+
+
+def parse_address(address: str) -> tuple[str, int | None]:
+    """Split a stream address.
+
+    Args:
+        address: Unix socket path (containing "/") or host:port
+
+    Returns:
+        (path, None) for a Unix socket, (host, port) for TCP
+
+    Raises:
+        ValueError: If the address is neither
+    """
+    if "/" in address:
+        return address, None
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"Invalid stream address: {address!r}")
+    return host, int(port)
+
+
+async def async_open_stream(
+    address: str,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a stream address."""
+    host, port = parse_address(address)
+    if port is None:
+        return await asyncio.open_unix_connection(host)
+    return await asyncio.open_connection(host, port)
+
+
+async def async_start_stream_server(
+    handler: Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]],
+    address: str,
+) -> asyncio.Server:
+    """Listen on a stream address."""
+    host, port = parse_address(address)
+    if port is None:
+        return await asyncio.start_unix_server(handler, host)
+    return await asyncio.start_server(handler, host, port)
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    """Return a frame with its header."""
+    return FRAME_HEADER.pack(len(payload), frame_type) + payload
+
+
+def encode_hello() -> bytes:
+    """Return the frame opening a connection."""
+    return encode_frame(FRAME_HELLO, bytes([STREAM_VERSION]))
+
+
+def encode_error(index: int, message: str) -> bytes:
+    """Return the frame reporting a failed poll of a meter."""
+    return encode_frame(FRAME_ERROR, METER_INDEX.pack(index) + message.encode())
+
+
+async def async_read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Read the next frame.
+
+    Returns:
+        Frame type and payload
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection was closed
+        FoxEnergyStreamError: If the frame is oversized
+    """
+    length, frame_type = FRAME_HEADER.unpack(
+        await reader.readexactly(FRAME_HEADER.size)
+    )
+    if length > MAX_FRAME_SIZE:
+        raise FoxEnergyStreamError(f"Frame of {length} bytes exceeds the limit")
+    return frame_type, await reader.readexactly(length)
+
+
+@dataclass(slots=True)
+class StreamMeter:
+    """Meter announced on the stream and the layout of its samples.
+
+    Attributes:
+        index: Meter index carried by its frames
+        host: Meter host
+        device_type: "3phase" or "1phase"
+        keys: Sample fields, in payload order
+    """
+
+    index: int
+    host: str
+    device_type: str
+    keys: list[str]
+    _sample: struct.Struct = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Build the sample layout."""
+        self._sample = struct.Struct(f"<Hd{len(self.keys)}d")
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "StreamMeter":
+        """Return the meter announced by a meter frame.
+
+        Raises:
+            FoxEnergyStreamError: If the frame cannot be decoded
+        """
+        try:
+            (index,) = METER_INDEX.unpack_from(payload)
+            info = json.loads(payload[METER_INDEX.size :])
+            host, device_type, keys = info["host"], info["device_type"], info["keys"]
+        except (KeyError, TypeError, ValueError, struct.error) as err:
+            raise FoxEnergyStreamError(f"Malformed meter frame: {err!r}") from err
+        if not (
+            isinstance(host, str)
+            and isinstance(device_type, str)
+            and isinstance(keys, list)
+            and all(isinstance(key, str) for key in keys)
+        ):
+            raise FoxEnergyStreamError("Malformed meter frame: invalid field types")
+        return cls(index, host, device_type, keys)
+
+    def encode_meter(self) -> bytes:
+        """Return the frame announcing the meter."""
+        info = {"host": self.host, "device_type": self.device_type, "keys": self.keys}
+        return encode_frame(
+            FRAME_METER, METER_INDEX.pack(self.index) + json.dumps(info).encode()
+        )
+
+    def encode_sample(self, timestamp: float, data: dict[str, Any]) -> bytes:
+        """Return the frame of a processed sample.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, keys other than the announced ones are
+                not sent
+
+        Returns:
+            Sample frame
+        """
+        values = [data.get(key) for key in self.keys]
+        return encode_frame(
+            FRAME_SAMPLE,
+            self._sample.pack(
+                self.index,
+                timestamp,
+                *(math.nan if value is None else value for value in values),
+            ),
+        )
+
+    def decode_sample(self, payload: bytes) -> tuple[float, dict[str, Any]]:
+        """Return the timestamp and processed sample of a sample frame."""
+        _index, timestamp, *values = self._sample.unpack(payload)
+        return timestamp, {
+            key: None if math.isnan(value) else value
+            for key, value in zip(self.keys, values, strict=True)
+        }
+
+
+class FoxEnergyStreamClient:
+    """Receive the samples of meters from the poller daemon.
+
+    One connection is shared by all meters consuming the same address. It
+    is opened with the first subscriber, closed with the last and
+    re-established with backoff whenever it drops. Subscribers of a meter
+    are told about failed polls and about the stream going away, so their
+    entities become unavailable.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        retry_delay: float = STREAM_RETRY_DELAY,
+        max_retry_delay: float = STREAM_MAX_RETRY_DELAY,
+        create_task: TaskFactory | None = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            address: Unix socket path or host:port of the daemon
+            retry_delay: Seconds before the first reconnect attempt
+            max_retry_delay: Upper bound of the reconnect delay
+            create_task: Starts the connection task with a name, e.g.
+                hass.async_create_background_task (None uses the running loop)
+        """
+        self.address = address
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._create_task = create_task
+        self.connected = False
+        self.frames = 0
+        self.connects = 0
+        self._subscribers: dict[str, tuple[SampleCallback, ErrorCallback]] = {}
+        self._meters: dict[int, StreamMeter] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(
+        self, host: str, on_sample: SampleCallback, on_error: ErrorCallback
+    ) -> Callable[[], None]:
+        """Receive the samples of a meter.
+
+        Must be called from the event loop.
+
+        Args:
+            host: Meter host
+            on_sample: Called with timestamp, processed sample and device type
+            on_error: Called with a message when a poll failed or the stream
+                is unavailable
+
+        Returns:
+            Function removing the subscription
+        """
+        subscriber = (on_sample, on_error)
+        self._subscribers[host] = subscriber
+        if self._task is None:
+            name = f"fox_energy stream {self.address}"
+            if self._create_task is not None:
+                self._task = self._create_task(self._async_run(), name)
+            else:
+                self._task = asyncio.get_running_loop().create_task(
+                    self._async_run(), name=name
+                )
+
+        def unsubscribe() -> None:
+            if self._subscribers.get(host) is subscriber:
+                del self._subscribers[host]
+            if not self._subscribers and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+        return unsubscribe
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return connection state for diagnostics."""
+        return {
+            "address": self.address,
+            "connected": self.connected,
+            "connects": self.connects,
+            "frames": self.frames,
+            "meters": len(self._meters),
+        }
+
+    async def _async_run(self) -> None:
+        """Keep the connection up and dispatch its frames."""
+        delay = self.retry_delay
+        while True:
+            try:
+                reader, writer = await async_open_stream(self.address)
+            except OSError as err:
+                self._notify_error(f"Cannot connect to sample stream: {err}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+
+            delay = self.retry_delay
+            self.connected = True
+            self.connects += 1
+            _LOGGER.debug("Connected to sample stream %s", self.address)
+            try:
+                await self._async_read(reader)
+            except asyncio.IncompleteReadError:
+                message = "Sample stream closed"
+            except (OSError, FoxEnergyStreamError, ValueError, struct.error) as err:
+                message = f"Sample stream error: {err}"
+            finally:
+                self.connected = False
+                self._meters.clear()
+                writer.close()
+            _LOGGER.warning("%s (%s), reconnecting", message, self.address)
+            self._notify_error(message)
+            await asyncio.sleep(delay)
+
+    async def _async_read(self, reader: asyncio.StreamReader) -> None:
+        """Dispatch frames until the connection ends.
+
+        Raises:
+            FoxEnergyStreamError: If the daemon speaks another protocol
+        """
+        frame_type, payload = await async_read_frame(reader)
+        if frame_type != FRAME_HELLO or payload != bytes([STREAM_VERSION]):
+            raise FoxEnergyStreamError("Unsupported stream protocol")
+
+        while True:
+            frame_type, payload = await async_read_frame(reader)
+            self.frames += 1
+            if frame_type == FRAME_METER:
+                meter = StreamMeter.from_payload(payload)
+                self._meters[meter.index] = meter
+                continue
+
+            (index,) = METER_INDEX.unpack_from(payload)
+            meter = self._meters.get(index)
+            subscriber = self._subscribers.get(meter.host) if meter else None
+            if subscriber is None:
+                continue
+            if frame_type == FRAME_SAMPLE:
+                timestamp, data = meter.decode_sample(payload)
+                _call(meter.host, subscriber[0], timestamp, data, meter.device_type)
+            elif frame_type == FRAME_ERROR:
+                message = payload[METER_INDEX.size :].decode(errors="replace")
+                _call(meter.host, subscriber[1], message)
+
+    def _notify_error(self, message: str) -> None:
+        """Tell every subscriber the stream is unavailable."""
+        for host, (_on_sample, on_error) in list(self._subscribers.items()):
+            _call(host, on_error, message)
+
+
+def _call(host: str, callback: Callable[..., None], *args: Any) -> None:
+    """Run a subscriber callback; a failing subscriber must not end the stream."""
+    try:
+        callback(*args)
+    except Exception:
+        _LOGGER.exception("Error in sample stream subscriber of %s", host)
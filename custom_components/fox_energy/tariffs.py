@@ -0,0 +1,341 @@
+"""Tariff-zone energy accounting for Fox Energy integration."""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from typing import Any
+
+# Zone calendars are resolved in slots of this many minutes
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+TARIFF_ZONE_KEY = "strefa_taryfowa"
+
+# A reading below this share of the previous one may be a counter reset
+TARIFF_RESET_RATIO = 0.5
+# Energy in kWh no hour can reach, well above the 44 kW of a 3x63 A connection
+TARIFF_MAX_HOUR_ENERGY = 100
+# Rise in kWh always plausible, covering counter resolution and samples
+# taken at the same time
+TARIFF_MIN_PLAUSIBLE_RISE = 1.0
+# Consecutive implausible readings that confirm a reset or a replaced meter;
+# fewer are a bad reading
+TARIFF_RESET_SAMPLES = 3
+
+ALL_MONTHS = frozenset(range(1, 13))
+WORKDAYS = frozenset(range(5))
+WEEKEND = frozenset({5, 6})
+ALL_DAYS = WORKDAYS | WEEKEND
+SUMMER = frozenset(range(4, 10))
+WINTER = ALL_MONTHS - SUMMER
+
+# Zone key to display name
+ZONE_NAMES = {
+    "calodobowa": "All Day",
+    "dzienna": "Day",
+    "nocna": "Night",
+    "szczyt_przedpoludniowy": "Morning Peak",
+    "szczyt_popoludniowy": "Afternoon Peak",
+    "pozaszczytowa": "Off-Peak",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneRule:
+    """Hours of a zone on some days of some months.
+
+    Attributes:
+        zone: Zone key
+        start: First hour, local time (fractions allowed, e.g. 21.5)
+        end: Hour the zone ends (exclusive), up to 24
+        weekdays: Days of the week (Monday = 0)
+        months: Months (January = 1)
+    """
+
+    zone: str
+    start: float
+    end: float
+    weekdays: frozenset[int] = ALL_DAYS
+    months: frozenset[int] = ALL_MONTHS
+
+
+@dataclass(frozen=True, slots=True)
+class TariffCalendar:
+    """Zones of a tariff; the first matching rule wins.
+
+    Attributes:
+        zones: Zone keys in display order
+        default: Zone of times no rule matches
+        rules: Zone rules
+    """
+
+    zones: tuple[str, ...]
+    default: str
+    rules: tuple[ZoneRule, ...] = ()
+
+
+# Polish household tariffs as offered by the major distribution system
+# operators; public holidays are not taken into account
+TARIFF_CALENDARS: dict[str, TariffCalendar] = {
+    "G11": TariffCalendar(zones=("calodobowa",), default="calodobowa"),
+    "G12": TariffCalendar(
+        zones=("dzienna", "nocna"),
+        default="dzienna",
+        rules=(
+            ZoneRule("nocna", 0, 6),
+            ZoneRule("nocna", 13, 15),
+            ZoneRule("nocna", 22, 24),
+        ),
+    ),
+    "G12w": TariffCalendar(
+        zones=("dzienna", "nocna"),
+        default="dzienna",
+        rules=(
+            ZoneRule("nocna", 0, 24, WEEKEND),
+            ZoneRule("nocna", 0, 6),
+            ZoneRule("nocna", 13, 15),
+            ZoneRule("nocna", 22, 24),
+        ),
+    ),
+    "G13": TariffCalendar(
+        zones=("szczyt_przedpoludniowy", "szczyt_popoludniowy", "pozaszczytowa"),
+        default="pozaszczytowa",
+        rules=(
+            ZoneRule("szczyt_przedpoludniowy", 7, 13, WORKDAYS),
+            ZoneRule("szczyt_popoludniowy", 19, 22, WORKDAYS, SUMMER),
+            ZoneRule("szczyt_popoludniowy", 16, 21, WORKDAYS, WINTER),
+        ),
+    ),
+}
+
+
+def build_zone_table(calendar: TariffCalendar) -> bytes:
+    """Precompute the zone index of every slot of the year.
+
+    Args:
+        calendar: Tariff calendar
+
+    Returns:
+        Zone indexes by ((month - 1) * 7 + weekday) * SLOTS_PER_DAY + slot
+    """
+    zones = calendar.zones
+    table = bytearray([zones.index(calendar.default)]) * (12 * 7 * SLOTS_PER_DAY)
+    # Apply in reverse so earlier rules overwrite later ones
+    for rule in reversed(calendar.rules):
+        first = math.ceil(rule.start * 60 / SLOT_MINUTES)
+        last = math.ceil(rule.end * 60 / SLOT_MINUTES)
+        index = zones.index(rule.zone)
+        for month in rule.months:
+            for weekday in rule.weekdays:
+                day = ((month - 1) * 7 + weekday) * SLOTS_PER_DAY
+                table[day + first : day + last] = bytes([index]) * (last - first)
+    return bytes(table)
+
+
+class FoxEnergyTariffZones:
+    """Resolve the tariff zone of a timestamp from a precomputed table.
+
+    The local time is only converted once per slot; lookups within the
+    current slot compare two floats.
+    """
+
+    def __init__(self, calendar: TariffCalendar, time_zone: tzinfo):
+        """Initialize the lookup.
+
+        Args:
+            calendar: Tariff calendar
+            time_zone: Time zone the calendar hours are in
+        """
+        self.zones = calendar.zones
+        self.time_zone = time_zone
+        self._table = build_zone_table(calendar)
+        self._slot_start = math.inf
+        self._slot_end = -math.inf
+        self._zone = calendar.default
+
+    def zone(self, timestamp: float) -> str:
+        """Return the zone of a Unix timestamp."""
+        if self._slot_start <= timestamp < self._slot_end:
+            return self._zone
+
+        local = datetime.fromtimestamp(timestamp, self.time_zone)
+        minutes = local.hour * 60 + local.minute
+        slot = minutes // SLOT_MINUTES
+        into_slot = (
+            (minutes % SLOT_MINUTES) * 60 + local.second + local.microsecond / 1e6
+        )
+        self._slot_start = timestamp - into_slot
+        self._slot_end = self._slot_start + SLOT_MINUTES * 60
+        self._zone = self.zones[
+            self._table[
+                ((local.month - 1) * 7 + local.weekday()) * SLOTS_PER_DAY + slot
+            ]
+        ]
+        return self._zone
+
+
+def tariff_key(energy_key: str, zone: str) -> str:
+    """Return the sensor key of an energy counter in a zone."""
+    return f"{energy_key}_{zone}"
+
+
+def tariff_sensors(
+    calendar: TariffCalendar, energy_sensors: dict[str, dict[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """Return the sensor configuration of per-zone energy counters.
+
+    Args:
+        calendar: Tariff calendar
+        energy_sensors: Configuration of the metered energy sensors by key
+
+    Returns:
+        Sensor configuration by key, the current zone first
+    """
+    sensors: dict[str, dict[str, Any]] = {
+        TARIFF_ZONE_KEY: {
+            "name": "Tariff Zone",
+            "unit": None,
+            "device_class": None,
+            "state_class": None,
+            "icon": "mdi:clock-outline",
+        }
+    }
+    for key, config in energy_sensors.items():
+        for zone in calendar.zones:
+            sensors[tariff_key(key, zone)] = {
+                **config,
+                "name": f"{config['name']} {ZONE_NAMES.get(zone, zone)}",
+            }
+    return sensors
+
+
+class FoxEnergyTariffCounters:
+    """Split metered energy into per-zone counters.
+
+    Every increase of an energy reading is added to the counter of the zone
+    the sample falls into. The last readings are kept with the counters, so
+    energy consumed while Home Assistant was down is not lost; it is
+    accounted to the zone of the first sample after the restart.
+
+    Readings below the last one are ignored, so a single bogus reading
+    cannot restart accounting. Large drops and rises above
+    TARIFF_MAX_HOUR_ENERGY per hour since the last reading are held back;
+    only if they persist for TARIFF_RESET_SAMPLES readings is the counter
+    taken as reset or replaced, and accounting continues from the first of
+    them.
+    """
+
+    def __init__(self, zones: FoxEnergyTariffZones, energy_keys: list[str]):
+        """Initialize the counters.
+
+        Args:
+            zones: Zone lookup
+            energy_keys: Monotonic energy readings (kWh) to split
+        """
+        self.zones = zones
+        self.energy_keys = list(energy_keys)
+        self.readings: dict[str, float] = {}
+        # Key -> Unix timestamp of the last accepted reading
+        self.reading_times: dict[str, float] = {}
+        self.counters: dict[str, float] = {
+            tariff_key(key, zone): 0.0
+            for key in self.energy_keys
+            for zone in zones.zones
+        }
+        # Key -> first implausible reading and number of them in a row
+        self._resets: dict[str, tuple[float, int]] = {}
+
+    def add(self, timestamp: float, data: dict[str, Any]) -> bool:
+        """Account a sample and add the counters to it.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample, updated in place
+
+        Returns:
+            True if a counter changed
+        """
+        zone = self.zones.zone(timestamp)
+        changed = False
+        for key in self.energy_keys:
+            reading = data.get(key)
+            if reading is None:
+                continue
+            previous = self.readings.get(key)
+            if previous is None:
+                self.readings[key] = reading
+                self.reading_times[key] = timestamp
+                continue
+
+            if reading < previous * TARIFF_RESET_RATIO or (
+                reading - previous > self._max_rise(key, timestamp)
+            ):
+                first, count = self._resets.get(key, (reading, 0))
+                if count + 1 < TARIFF_RESET_SAMPLES:
+                    self._resets[key] = (first, count + 1)
+                    continue
+                # The meter was reset or replaced, count from its first reading
+                del self._resets[key]
+                previous = first
+            else:
+                self._resets.pop(key, None)
+
+            if reading > previous:
+                self.counters[tariff_key(key, zone)] += reading - previous
+                changed = True
+            # Small drops are noise, accounting continues from the highest
+            self.readings[key] = max(reading, previous)
+            self.reading_times[key] = timestamp
+
+        data[TARIFF_ZONE_KEY] = zone
+        for key, value in self.counters.items():
+            data[key] = round(value, 3)
+        return changed
+
+    def _max_rise(self, key: str, timestamp: float) -> float:
+        """Return the largest plausible rise of a reading since the last one.
+
+        Args:
+            key: Energy key
+            timestamp: Unix timestamp of the new reading
+
+        Returns:
+            Rise in kWh, unbounded if the time of the last reading is unknown
+        """
+        last = self.reading_times.get(key)
+        if last is None:
+            return math.inf
+        hours = max(timestamp - last, 0) / 3600
+        return TARIFF_MAX_HOUR_ENERGY * hours + TARIFF_MIN_PLAUSIBLE_RISE
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "readings": self.readings,
+            "reading_times": self.reading_times,
+            "counters": self.counters,
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Restore persisted state.
+
+        Counters of zones the tariff no longer has are dropped.
+
+        Args:
+            state: State returned by as_dict
+        """
+        self.readings.update(
+            (key, value)
+            for key, value in state.get("readings", {}).items()
+            if key in self.energy_keys
+        )
+        self.reading_times.update(
+            (key, value)
+            for key, value in state.get("reading_times", {}).items()
+            if key in self.readings
+        )
+        self.counters.update(
+            (key, value)
+            for key, value in state.get("counters", {}).items()
+            if key in self.counters
+        )
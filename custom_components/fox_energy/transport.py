@@ -0,0 +1,263 @@
+"""Lightweight HTTP/1.1 keep-alive transport for Fox Energy meters."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HTTP_PORT = 80
+# Upper bound for response headers plus body; meter responses are < 1 KiB
+MAX_RESPONSE_SIZE = 64 * 1024
+
+
+class FoxEnergyTransportError(Exception):
+    """Connection to the meter failed or was closed."""
+
+
+class FoxEnergyProtocolError(Exception):
+    """Meter sent a response that cannot be parsed."""
+
+
+@dataclass(slots=True)
+class FoxEnergyHTTPResponse:
+    """Status and body of a response."""
+
+    status: int
+    body: bytes
+
+
+class _FoxEnergyHTTPProtocol(asyncio.Protocol):
+    """Parse responses to requests written on one connection.
+
+    Only what the meter sends is supported: a status line, headers and a
+    body delimited by Content-Length or by the connection closing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self.transport: asyncio.Transport | None = None
+        self.closed = False
+        self.keep_alive = True
+        self._buffer = bytearray()
+        self._waiter: asyncio.Future[FoxEnergyHTTPResponse] | None = None
+        self._status = 0
+        self._body_start = -1
+        self._length: int | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Finish a close-delimited body or fail the pending request."""
+        self.closed = True
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            return
+        if self._body_start >= 0 and self._length is None:
+            self._finish(bytes(self._buffer[self._body_start :]))
+            return
+        waiter.set_exception(
+            FoxEnergyTransportError(f"Connection closed: {exc}" if exc else "Closed")
+        )
+
+    def data_received(self, data: bytes) -> None:
+        """Collect response bytes and complete the request once whole."""
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            # Unsolicited bytes, the connection cannot be reused
+            self.keep_alive = False
+            return
+
+        self._buffer += data
+        if len(self._buffer) > MAX_RESPONSE_SIZE:
+            self._fail(FoxEnergyProtocolError("Response too large"))
+            return
+
+        if self._body_start < 0:
+            end = self._buffer.find(b"\r\n\r\n")
+            if end < 0:
+                return
+            try:
+                self._parse_head(bytes(self._buffer[:end]))
+            except (ValueError, IndexError) as err:
+                self._fail(FoxEnergyProtocolError(f"Malformed response: {err}"))
+                return
+            self._body_start = end + 4
+
+        if (
+            self._length is not None
+            and len(self._buffer) - self._body_start >= self._length
+        ):
+            self._finish(
+                bytes(self._buffer[self._body_start : self._body_start + self._length])
+            )
+
+    def _parse_head(self, head: bytes) -> None:
+        """Parse the status line and the headers the client relies on.
+
+        Args:
+            head: Response head without the final blank line
+        """
+        lines = head.split(b"\r\n")
+        version, status = lines[0].split(b" ", 2)[:2]
+        self._status = int(status)
+        self.keep_alive = version == b"HTTP/1.1"
+
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == b"content-length":
+                self._length = int(value)
+            elif name == b"connection":
+                self.keep_alive = value == b"keep-alive"
+            elif name == b"transfer-encoding" and value != b"identity":
+                raise ValueError(f"unsupported transfer encoding {value!r}")
+
+        if self._length is None:
+            # Body ends when the meter closes the connection
+            self.keep_alive = False
+
+    def request(self, data: bytes) -> "asyncio.Future[FoxEnergyHTTPResponse]":
+        """Write a request.
+
+        Args:
+            data: Complete request bytes
+
+        Returns:
+            Future resolved with the response
+        """
+        self._waiter = asyncio.get_running_loop().create_future()
+        self._buffer.clear()
+        self._status = 0
+        self._body_start = -1
+        self._length = None
+        self.transport.write(data)
+        return self._waiter
+
+    def _finish(self, body: bytes) -> None:
+        """Resolve the pending request."""
+        self._waiter.set_result(FoxEnergyHTTPResponse(self._status, body))
+        self._buffer.clear()
+
+    def _fail(self, err: Exception) -> None:
+        """Fail the pending request and drop the connection."""
+        self.keep_alive = False
+        self._waiter.set_exception(err)
+        self.transport.close()
+
+
+class FoxEnergyHTTPConnection:
+    """Persistent HTTP/1.1 connection to one meter.
+
+    Requests are sent one at a time over a single keep-alive connection,
+    from request bytes built once per path. Response bodies are returned
+    as bytes, ready for the JSON decoder.
+    """
+
+    def __init__(self, host: str):
+        """Initialize the connection.
+
+        Args:
+            host: Meter address, optionally with port (e.g., 192.168.3.101:80)
+        """
+        parsed = urlsplit(f"//{host}")
+        self.host = parsed.hostname or host
+        self.port = parsed.port or DEFAULT_HTTP_PORT
+        self._host_header = host.encode("ascii")
+        self._requests: dict[str, bytes] = {}
+        self._protocol: _FoxEnergyHTTPProtocol | None = None
+        self._lock = asyncio.Lock()
+        self.connections = 0
+
+    def _request_bytes(self, path: str) -> bytes:
+        """Return the GET request for path, built on first use."""
+        data = self._requests.get(path)
+        if data is None:
+            data = self._requests[path] = (
+                f"GET {path} HTTP/1.1\r\n".encode("ascii")
+                + b"Host: "
+                + self._host_header
+                + b"\r\nAccept: application/json\r\nConnection: keep-alive\r\n\r\n"
+            )
+        return data
+
+    async def get(
+        self, path: str, connect_timeout: float, read_timeout: float
+    ) -> FoxEnergyHTTPResponse:
+        """Send a GET request and wait for the response.
+
+        A request on a reused connection the meter has meanwhile closed is
+        retried once on a new connection.
+
+        Args:
+            path: Request path
+            connect_timeout: Connection establishment timeout in seconds
+            read_timeout: Timeout for the whole response in seconds
+
+        Returns:
+            Response status and body
+
+        Raises:
+            FoxEnergyTransportError: If the connection fails
+            FoxEnergyProtocolError: If the response cannot be parsed
+            TimeoutError: If connecting or reading times out
+        """
+        request = self._request_bytes(path)
+        async with self._lock:
+            for attempt in range(2):
+                reused = await self._ensure_connected(connect_timeout)
+                protocol = self._protocol
+                try:
+                    response = await asyncio.wait_for(
+                        protocol.request(request), read_timeout
+                    )
+                except FoxEnergyTransportError:
+                    self.close()
+                    if reused and attempt == 0:
+                        _LOGGER.debug(
+                            "Idle connection to %s closed, retrying", self.host
+                        )
+                        continue
+                    raise
+                except BaseException:
+                    # State of the connection is unknown
+                    self.close()
+                    raise
+
+                if not protocol.keep_alive or protocol.closed:
+                    self.close()
+                return response
+
+        raise FoxEnergyTransportError("Unreachable")  # pragma: no cover
+
+    async def _ensure_connected(self, connect_timeout: float) -> bool:
+        """Open a connection unless an open one exists.
+
+        Returns:
+            True if an existing connection is reused
+        """
+        if self._protocol is not None and not self._protocol.closed:
+            return True
+
+        loop = asyncio.get_running_loop()
+        try:
+            _, protocol = await asyncio.wait_for(
+                loop.create_connection(_FoxEnergyHTTPProtocol, self.host, self.port),
+                connect_timeout,
+            )
+        except OSError as err:
+            raise FoxEnergyTransportError(f"Cannot connect: {err}") from err
+        self._protocol = protocol
+        self.connections += 1
+        return False
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._protocol is not None:
+            if self._protocol.transport is not None:
+                self._protocol.transport.close()
+            self._protocol = None
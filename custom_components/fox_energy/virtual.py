@@ -0,0 +1,260 @@
+"""Virtual aggregate meters for Fox Energy integration."""
+
+import asyncio
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .coordinator import FoxEnergyCoordinator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Units of fields that add up across meters (energy, power, current)
+ADDITIVE_UNITS = frozenset({"kWh", "W", "VAr", "A"})
+
+# Ticks waiting for samples of all members; older ones are dropped
+MAX_PENDING_TICKS = 2
+# Seconds apart samples of different members may be taken and still be
+# combined, e.g. manual refreshes of all members
+PAIRING_TOLERANCE = 1.0
+# Scan intervals of the slowest member without a combined sample after
+# which the virtual meter is unavailable
+STALE_INTERVALS = 3
+
+
+def virtual_sensors(
+    sensors: dict[str, dict[str, Any]], differences: bool
+) -> dict[str, dict[str, Any]]:
+    """Return the sensor configuration of a virtual meter.
+
+    Args:
+        sensors: Sensor configuration of the member meters
+        differences: Whether meters are subtracted; energy can then fall,
+            so it is a total rather than an increasing counter
+
+    Returns:
+        Sensor configuration of the additive fields by key
+    """
+    virtual = {}
+    for key, config in sensors.items():
+        if config["unit"] not in ADDITIVE_UNITS:
+            continue
+        if differences and config["state_class"] == "total_increasing":
+            config = {**config, "state_class": "total"}
+        virtual[key] = config
+    return virtual
+
+
+class FoxEnergyAggregator:
+    """Combine samples of several meters taken on the same tick.
+
+    Samples are collected per tick. A sample joins the pending tick its
+    member has not reported yet whose timestamp is closest, within the
+    tolerance; otherwise it starts a new tick. Once every member has
+    reported a tick, the weighted sum of all fields is computed in one
+    matrix product. Ticks some member never reports (failed poll,
+    different update interval) are dropped when newer ticks arrive.
+    """
+
+    def __init__(
+        self,
+        members: list[str],
+        weights: list[float],
+        keys: list[str],
+        max_pending: int = MAX_PENDING_TICKS,
+        tolerance: float = 0.0,
+    ):
+        """Initialize the aggregator.
+
+        Args:
+            members: Member meter hosts
+            weights: Factor of each member, 1 to add and -1 to subtract
+            keys: Fields to combine
+            max_pending: Incomplete ticks kept
+            tolerance: Seconds between samples of one tick (0 = exact ticks)
+        """
+        self.members = {host: index for index, host in enumerate(members)}
+        self.weights = list(weights)
+        self.keys = list(keys)
+        self.max_pending = max_pending
+        self.tolerance = tolerance
+        self.dropped_ticks = 0
+        self.last_tick: float | None = None
+        self._pending: dict[float, list[list[float] | None]] = {}
+
+    def add(
+        self, member: str, timestamp: float, data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Add the sample of one member.
+
+        Args:
+            member: Member meter host
+            timestamp: Tick of the sample
+            data: Processed sample
+
+        Returns:
+            Combined fields once all members reported the tick
+        """
+        index = self.members[member]
+        tick = self._match(index, timestamp)
+        if tick is None:
+            if (self.last_tick is not None and timestamp <= self.last_tick) or (
+                self._pending and timestamp < min(self._pending)
+            ):
+                # Arrived after a newer tick, already given up on
+                return None
+            tick = timestamp
+            self._pending[tick] = [None] * len(self.members)
+            while len(self._pending) > self.max_pending:
+                del self._pending[min(self._pending)]
+                self.dropped_ticks += 1
+
+        rows = self._pending[tick]
+        rows[index] = [
+            math.nan if (value := data.get(key)) is None else value for key in self.keys
+        ]
+        if any(row is None for row in rows):
+            return None
+
+        # Older incomplete ticks can no longer complete in order
+        for pending in [pending for pending in self._pending if pending <= tick]:
+            if pending != tick:
+                self.dropped_ticks += 1
+            del self._pending[pending]
+        self.last_tick = tick
+        return self._combine(rows)
+
+    def _match(self, index: int, timestamp: float) -> float | None:
+        """Return the pending tick a sample of a member belongs to, if any."""
+        if timestamp in self._pending:
+            return timestamp
+        candidates = [
+            tick
+            for tick, rows in self._pending.items()
+            if rows[index] is None and abs(tick - timestamp) <= self.tolerance
+        ]
+        return min(candidates, key=lambda tick: abs(tick - timestamp), default=None)
+
+    def missing(self) -> list[str]:
+        """Return the members the newest pending tick is waiting for."""
+        if not self._pending:
+            return []
+        rows = self._pending[max(self._pending)]
+        return [host for host, index in self.members.items() if rows[index] is None]
+
+    def _combine(self, rows: list[list[float]]) -> dict[str, Any]:
+        """Return the weighted sums of the rows, None where a member lacks a value."""
+        if np is not None:
+            totals = (
+                np.asarray(self.weights) @ np.asarray(rows, dtype=np.float64)
+            ).tolist()
+        else:
+            totals = [
+                sum(weight * value for weight, value in zip(self.weights, column))
+                for column in zip(*rows)
+            ]
+        return {
+            key: None if math.isnan(total) else round(total, 3)
+            for key, total in zip(self.keys, totals)
+        }
+
+
+class FoxEnergyVirtualCoordinator(DataUpdateCoordinator):
+    """Coordinator of a virtual meter fed by the samples of member meters."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        unique_id: str,
+        members: list[FoxEnergyCoordinator],
+        subtracted: list[FoxEnergyCoordinator],
+    ):
+        """Initialize the coordinator.
+
+        Args:
+            hass: Home Assistant instance
+            name: Virtual meter name
+            unique_id: Prefix of the entity unique IDs
+            members: Coordinators of the added meters
+            subtracted: Coordinators of the subtracted meters
+        """
+        super().__init__(hass, _LOGGER, name=f"Fox Energy {name}", update_interval=None)
+        self.host = unique_id
+        self.device_name = f"Fox Energy ({name})"
+        self.device_type = members[0].device_type
+        self.members = [*members, *subtracted]
+        self.sensors_config = virtual_sensors(
+            members[0].sensors_config, bool(subtracted)
+        )
+        intervals = [member.scan_interval for member in self.members]
+        self.aggregator = FoxEnergyAggregator(
+            [member.host for member in self.members],
+            [1.0] * len(members) + [-1.0] * len(subtracted),
+            list(self.sensors_config),
+            tolerance=min(PAIRING_TOLERANCE, min(intervals) / 2),
+        )
+        self.stale_timeout = STALE_INTERVALS * max(intervals)
+        self._stale_handle: asyncio.TimerHandle | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for samples of the members."""
+        keys = self.aggregator.keys
+        for member in self.members:
+
+            @callback
+            def add_sample(
+                timestamp: float, data: dict[str, Any], host: str = member.host
+            ) -> None:
+                combined = self.aggregator.add(host, timestamp, data)
+                if combined is not None:
+                    self._schedule_stale_check()
+                    self.async_set_updated_data(combined)
+
+            # Members process the fields even if their entities are disabled
+            self._unsubs.append(member.async_require_keys(keys))
+            self._unsubs.append(member.async_add_sample_listener(add_sample))
+        self._schedule_stale_check()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening for samples."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._stale_handle is not None:
+            self._stale_handle.cancel()
+            self._stale_handle = None
+
+    @callback
+    def _schedule_stale_check(self) -> None:
+        """Restart the timeout for the next combined sample."""
+        if self._stale_handle is not None:
+            self._stale_handle.cancel()
+        self._stale_handle = self.hass.loop.call_later(
+            self.stale_timeout, self._handle_stale
+        )
+
+    @callback
+    def _handle_stale(self) -> None:
+        """Mark the entities unavailable, a member stopped delivering samples."""
+        self._stale_handle = None
+        missing = self.aggregator.missing() or [member.host for member in self.members]
+        self.async_set_update_error(
+            UpdateFailed(
+                f"No sample of {', '.join(missing)} for {self.stale_timeout} s"
+            )
+        )
+
+    async def _async_update_data(self) -> dict[str, Any] | None:
+        """Return the last combined sample; virtual meters are never polled."""
+        return self.data
@@ -0,0 +1,128 @@
+"""Websocket API for Fox Energy integration."""
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import FoxEnergyCoordinator
+
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+MAX_DECIMATION = 3600
+
+
+class FoxEnergySampleEncoder:
+    """Encode samples of one meter for one subscriber.
+
+    Samples are sent as compact arrays, [meter index, timestamp, *values]
+    in the key order announced when subscribing. With decimation N only
+    every Nth sample is sent.
+    """
+
+    def __init__(self, index: int, keys: list[str], decimation: int = 1):
+        """Initialize the encoder.
+
+        Args:
+            index: Position of the meter in the subscription
+            keys: Sample fields, in payload order
+            decimation: Send every Nth sample
+        """
+        self.index = index
+        self.keys = list(keys)
+        self.decimation = decimation
+        self._skipped = decimation - 1
+
+    def encode(self, timestamp: float, data: dict[str, Any]) -> list[Any] | None:
+        """Return the payload of a sample, None if it is decimated away.
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            data: Processed sample
+
+        Returns:
+            Compact sample array
+        """
+        self._skipped += 1
+        if self._skipped < self.decimation:
+            return None
+        self._skipped = 0
+        return [self.index, timestamp, *(data.get(key) for key in self.keys)]
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register Fox Energy websocket commands.
+
+    Args:
+        hass: Home Assistant instance
+    """
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Optional("meters"): [str],
+        vol.Optional("keys"): [str],
+        vol.Optional("decimation", default=1): vol.All(
+            int, vol.Range(min=1, max=MAX_DECIMATION)
+        ),
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream processed samples of meters to the client.
+
+    The first event maps every meter to its index and keys, later events
+    carry one compact sample array each. Samples are taken straight from
+    the coordinators, so streaming causes no state writes.
+    """
+    coordinators: list[FoxEnergyCoordinator] = list(hass.data.get(DOMAIN, {}).values())
+    if "meters" in msg:
+        by_host = {coordinator.host: coordinator for coordinator in coordinators}
+        unknown = [host for host in msg["meters"] if host not in by_host]
+        if unknown:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                f"Unknown Fox Energy meters: {', '.join(unknown)}",
+            )
+            return
+        coordinators = [by_host[host] for host in msg["meters"]]
+
+    unsubs: list[CALLBACK_TYPE] = []
+    meters: list[dict[str, Any]] = []
+    for index, coordinator in enumerate(coordinators):
+        available = list(coordinator.sensors_config)
+        keys = [key for key in msg.get("keys", available) if key in available]
+        encoder = FoxEnergySampleEncoder(index, keys, msg["decimation"])
+        meters.append({"host": coordinator.host, "keys": keys})
+
+        @callback
+        def forward(
+            timestamp: float,
+            data: dict[str, Any],
+            encoder: FoxEnergySampleEncoder = encoder,
+        ) -> None:
+            payload = encoder.encode(timestamp, data)
+            if payload is not None:
+                connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+        # Streamed keys are processed even if their entities are disabled
+        unsubs.append(coordinator.async_require_keys(keys))
+        unsubs.append(coordinator.async_add_sample_listener(forward))
+
+    @callback
+    def unsubscribe() -> None:
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"meters": meters}))
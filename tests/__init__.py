@@ -5,5 +5,27 @@ This package contains unit tests for the Fox Energy Home Assistant integration.
 Test modules:
 - test_api.py: Tests for API client and data processor
 - test_config_flow.py: Tests for configuration flow
+- test_schedule.py: Tests for wall-clock aligned poll scheduling
+- test_coordinator.py: Tests for the coordinator on the event loop and options changes
 - test_const.py: Tests for constants and sensor configurations
+- test_rollups.py: Tests for hourly statistics rollups
+- test_tariffs.py: Tests for tariff-zone energy accounting
+- test_demand.py: Tests for 15-minute demand tracking
+- test_forecast.py: Tests for the incremental energy forecast
+- test_virtual.py: Tests for virtual aggregate meters
+- test_alarms.py: Tests for threshold alarms
+- test_steps.py: Tests for appliance step detection (with benchmark)
+- test_cli.py: Tests for the probing and benchmarking command-line tool
+- test_daemon.py: Tests for the poller daemon and sample stream (against the simulator)
+- test_pipeline.py: Tests for the worker pool pipeline and the loop budget (with benchmark)
+- test_errors.py: Tests for rate-limited error accounting
+- test_memory.py: Tests for the per-meter and per-entity memory budgets
+- test_replay.py: Tests for traffic capture and replay
+- test_transport.py: Tests for the keep-alive HTTP transport (with benchmark against aiohttp)
+- test_profile.py: Tests for update path profiling
+- test_burst.py: Tests for burst capture
+- test_websocket_api.py: Tests for live sample streaming payloads
+- simulator.py: Local meter simulator serving the fixtures over HTTP
+- test_export.py: Tests for the sample store and export (with throughput benchmark)
+- test_gorilla.py: Tests for compressed sample storage (with query benchmark)
 """
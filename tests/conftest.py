@@ -1,9 +1,14 @@
 """Fixtures for Fox Energy integration tests."""
 
+import asyncio
+import importlib
 import json
 import sys
+from datetime import UTC, datetime
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
+from zoneinfo import ZoneInfo
 
 import pytest
 
@@ -12,22 +17,108 @@ sys.modules["homeassistant"] = MagicMock()
 sys.modules["homeassistant.config_entries"] = MagicMock()
 sys.modules["homeassistant.const"] = MagicMock()
 sys.modules["homeassistant.core"] = MagicMock()
+sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.aiohttp_client"] = MagicMock()
+sys.modules["homeassistant.helpers.config_validation"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.entity_registry"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
 sys.modules["homeassistant.helpers.typing"] = MagicMock()
 sys.modules["homeassistant.data_entry_flow"] = MagicMock()
 sys.modules["homeassistant.util"] = MagicMock()
 sys.modules["homeassistant.util.dt"] = MagicMock()
 sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.components.binary_sensor"] = MagicMock()
 sys.modules["homeassistant.components.sensor"] = MagicMock()
+sys.modules["homeassistant.components.websocket_api"] = MagicMock()
+sys.modules["homeassistant.components.recorder"] = MagicMock()
+sys.modules["homeassistant.components.recorder.models"] = MagicMock()
+sys.modules["homeassistant.components.recorder.statistics"] = MagicMock()
 sys.modules["voluptuous"] = MagicMock()
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+class _UpdateFailed(Exception):
+    """Failed update like Home Assistant's."""
+
+
+class _DataUpdateCoordinator:
+    """Data update coordinator keeping the state Home Assistant's keeps."""
+
+    def __init__(self, hass, logger, *, name, update_interval=None):
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.data = None
+        self.last_update_success = True
+        self.last_exception = None
+
+    async def async_refresh(self):
+        try:
+            self.data = await self._async_update_data()
+        except _UpdateFailed as err:
+            self.async_set_update_error(err)
+        else:
+            self.last_update_success = True
+
+    async def async_config_entry_first_refresh(self):
+        await self.async_refresh()
+        if not self.last_update_success:
+            raise self.last_exception
+
+    def async_set_updated_data(self, data):
+        self.data = data
+        self.last_update_success = True
+
+    def async_set_update_error(self, err):
+        self.last_update_success = False
+        self.last_exception = err
+
+
+class _Hass:
+    """The parts of Home Assistant the coordinator uses, on the test loop."""
+
+    def __init__(self, loop, config_dir):
+        self.loop = loop
+        self.bus = MagicMock()
+        self.config = SimpleNamespace(
+            time_zone="Europe/Warsaw",
+            components=set(),
+            path=lambda *parts: str(Path(config_dir, *parts)),
+        )
+        self.data = {}
+        self.tasks = set()
+
+    def async_create_background_task(self, target, name):
+        task = self.loop.create_task(target, name=name)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def async_add_executor_job(self, target, *args):
+        return self.loop.run_in_executor(None, target, *args)
+
+
+def pytest_addoption(parser):
+    """Add the option enabling benchmarks."""
+    parser.addoption("--benchmark", action="store_true", help="run timing benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless requested, timings depend on the machine."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def mock_3phase_current():
     """Load 3-phase current parameters fixture."""
@@ -79,3 +170,39 @@ def mock_response_error():
     response.status = 500
     response.text = AsyncMock(return_value="Internal Server Error")
     return response
+
+
+@pytest.fixture
+async def hass(tmp_path):
+    """Create a minimal Home Assistant on the running loop."""
+    hass = _Hass(asyncio.get_running_loop(), tmp_path)
+    yield hass
+    for task in list(hass.tasks):
+        task.cancel()
+
+
+@pytest.fixture
+def coordinator_module(monkeypatch):
+    """Import the coordinator on real base classes instead of mocks."""
+    update_coordinator = sys.modules["homeassistant.helpers.update_coordinator"]
+    monkeypatch.setattr(
+        update_coordinator, "DataUpdateCoordinator", _DataUpdateCoordinator
+    )
+    monkeypatch.setattr(update_coordinator, "UpdateFailed", _UpdateFailed)
+    monkeypatch.setattr(sys.modules["homeassistant.core"], "callback", lambda f: f)
+    dt = sys.modules["homeassistant.util.dt"]
+    monkeypatch.setattr(dt, "get_time_zone", ZoneInfo)
+    monkeypatch.setattr(dt, "utcnow", lambda: datetime.now(UTC))
+    monkeypatch.setattr(
+        dt,
+        "utc_from_timestamp",
+        lambda timestamp: datetime.fromtimestamp(timestamp, UTC),
+    )
+    # A fresh module built on these classes, dropped again afterwards
+    package = importlib.import_module("custom_components.fox_energy")
+    name = f"{package.__name__}.coordinator"
+    monkeypatch.setitem(sys.modules, name, None)
+    del sys.modules[name]
+    monkeypatch.setattr(package, "coordinator", None, raising=False)
+    delattr(package, "coordinator")
+    return importlib.import_module(name)
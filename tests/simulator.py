@@ -0,0 +1,103 @@
+"""Local Fox Energy meter simulator for tests and benchmarks."""
+
+import asyncio
+import json
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+ENDPOINT_FIXTURES = {
+    "/0000/get_current_parameters": "{phases}_current.json",
+    "/0000/get_total_energy": "{phases}_energy.json",
+}
+
+
+class MeterSimulator:
+    """HTTP/1.1 server answering the meter endpoints with fixture JSON.
+
+    Attributes:
+        connections: Number of accepted connections
+        requests: Number of served requests
+    """
+
+    def __init__(
+        self,
+        phases: str = "3phase",
+        keep_alive: bool = True,
+        max_requests_per_connection: int | None = None,
+    ):
+        """Initialize the simulator.
+
+        Args:
+            phases: Fixture set, "3phase" or "1phase"
+            keep_alive: Keep connections open between requests
+            max_requests_per_connection: Close a connection after this many
+                requests, like a meter dropping idle clients
+        """
+        self.keep_alive = keep_alive
+        self.max_requests_per_connection = max_requests_per_connection
+        self.bodies = {
+            path: (FIXTURES_DIR / name.format(phases=phases)).read_bytes()
+            for path, name in ENDPOINT_FIXTURES.items()
+        }
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def host(self) -> str:
+        """Return host:port the simulator listens on."""
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"{host}:{port}"
+
+    async def start(self) -> None:
+        """Start listening on a free local port."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests of one connection."""
+        self.connections += 1
+        served = 0
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                path = head.split(b" ", 2)[1].decode()
+                served += 1
+                self.requests += 1
+
+                keep_alive = self.keep_alive and (
+                    self.max_requests_per_connection is None
+                    or served < self.max_requests_per_connection
+                )
+                body = self.bodies.get(path)
+                status = b"200 OK" if body is not None else b"404 Not Found"
+                if body is None:
+                    body = json.dumps({"status": "error"}).encode()
+                writer.write(
+                    b"HTTP/1.1 "
+                    + status
+                    + b"\r\nContent-Type: application/json\r\nContent-Length: "
+                    + str(len(body)).encode()
+                    + (
+                        b"\r\nConnection: keep-alive"
+                        if keep_alive
+                        else b"\r\nConnection: close"
+                    )
+                    + b"\r\n\r\n"
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
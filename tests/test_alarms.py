@@ -0,0 +1,92 @@
+"""Tests for Fox Energy threshold alarms."""
+
+from custom_components.fox_energy.alarms import (
+    ALARM_OVERCURRENT,
+    ALARM_REACTIVE_POWER,
+    ALARM_UNDERVOLTAGE,
+    AlarmRule,
+    FoxEnergyAlarms,
+    build_alarm_rules,
+)
+
+
+def _states(alarms, field, values, step=1):
+    """Feed one value per step seconds, return the transitions."""
+    transitions = []
+    for index, value in enumerate(values):
+        for rule, active, reported in alarms.evaluate(index * step, {field: value}):
+            transitions.append((index, rule.key, active, reported))
+    return transitions
+
+
+def test_hysteresis():
+    """Test the alarm clears only once back past the hysteresis band."""
+    rule = AlarmRule("over", "Over", "natezenie", threshold=25, hysteresis=1)
+    alarms = FoxEnergyAlarms([rule])
+
+    transitions = _states(alarms, "natezenie", [20, 26, 24.5, 26, 24, 23.9, 24.5])
+
+    assert transitions == [(1, "over", True, 26), (4, "over", False, 24)]
+    assert not alarms.is_active("over")
+
+
+def test_min_duration():
+    """Test short excursions do not raise an alarm."""
+    rule = AlarmRule(
+        "under", "Under", "napiecie", threshold=207, above=False, min_duration=10
+    )
+    alarms = FoxEnergyAlarms([rule])
+
+    # 5 s dip, back to normal, then 15 s below the limit
+    values = [230] + [200] * 6 + [230] + [200] * 16
+    transitions = _states(alarms, "napiecie", values)
+
+    assert transitions == [(18, "under", True, 200)]
+    assert alarms.is_active("under")
+
+
+def test_missing_value_restarts_duration_keeps_alarm():
+    """Test a missing value restarts the duration and keeps an active alarm."""
+    rule = AlarmRule("over", "Over", "natezenie", threshold=25, min_duration=2)
+    alarms = FoxEnergyAlarms([rule])
+
+    transitions = _states(alarms, "natezenie", [30, 30, None, 30, 30, 30, None, 20])
+
+    assert transitions == [(5, "over", True, 30), (7, "over", False, 20)]
+
+
+def test_absolute_value():
+    """Test the reactive power alarm checks the magnitude."""
+    rule = AlarmRule("q", "Q", "moc_reaktywna", threshold=1000, absolute=True)
+    alarms = FoxEnergyAlarms([rule])
+
+    transitions = _states(alarms, "moc_reaktywna", [-500, -1500, 800])
+
+    assert transitions == [(1, "q", True, 1500), (2, "q", False, 800)]
+
+
+def test_build_rules_3phase():
+    """Test per-phase rules are built for the configured limits only."""
+    rules = build_alarm_rules("3phase", fuse_rating=25, min_duration=10)
+
+    assert [rule.key for rule in rules] == [
+        f"{ALARM_OVERCURRENT}_l1",
+        f"{ALARM_OVERCURRENT}_l2",
+        f"{ALARM_OVERCURRENT}_l3",
+    ]
+    assert rules[1].field == "natezenie_l2"
+    assert rules[1].name == "Overcurrent L2"
+    assert rules[1].hysteresis == 25 * 0.03
+    assert rules[1].min_duration == 10
+
+
+def test_build_rules_1phase():
+    """Test 1-phase rules use the unsuffixed fields."""
+    rules = build_alarm_rules("1phase", undervoltage=207, reactive_power=500)
+    alarms = FoxEnergyAlarms(rules)
+
+    assert [rule.key for rule in rules] == [ALARM_UNDERVOLTAGE, ALARM_REACTIVE_POWER]
+    assert alarms.fields == {"napiecie", "moc_reaktywna"}
+    assert not rules[0].above
+    assert rules[1].absolute
+    assert build_alarm_rules("1phase") == []
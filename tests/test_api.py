@@ -1,5 +1,7 @@
 """Tests for Fox Energy API client."""
 
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,8 +11,18 @@ from custom_components.fox_energy.api import (
     FoxEnergyConnectionError,
     FoxEnergyDataProcessor,
     FoxEnergyInvalidResponse,
+    FoxEnergyRequestLimiter,
+    FoxEnergyTimeoutError,
+    percentile,
+)
+from custom_components.fox_energy.const import (
+    DEVICE_TYPE_1PHASE,
+    DEVICE_TYPE_3PHASE,
+    ENDPOINT_CURRENT_PARAMETERS,
+    ENDPOINT_TOTAL_ENERGY,
+    SENSORS_1PHASE,
+    SENSORS_3PHASE,
 )
-from custom_components.fox_energy.const import DEVICE_TYPE_1PHASE, DEVICE_TYPE_3PHASE
 
 
 class TestFoxEnergyAPI:
@@ -128,6 +140,238 @@ class TestFoxEnergyAPI:
 
         assert device_type == DEVICE_TYPE_1PHASE
 
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_fetch(self, mock_3phase_current):
+        """Test concurrent callers share a single in-flight request."""
+        api = FoxEnergyAPI("192.168.1.100")
+        calls = 0
+
+        async def slow_fetch(endpoint):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return mock_3phase_current
+
+        with patch.object(api, "_fetch_endpoint", side_effect=slow_fetch):
+            results = await asyncio.gather(
+                *(api.get_current_parameters() for _ in range(5))
+            )
+
+        assert calls == 1
+        assert all(result is mock_3phase_current for result in results)
+        assert not api._inflight
+
+    @pytest.mark.asyncio
+    async def test_response_cache_ttl(self, mock_3phase_current):
+        """Test recent responses are served from cache."""
+        api = FoxEnergyAPI("192.168.1.100", cache_ttl=60)
+        fetch = AsyncMock(return_value=mock_3phase_current)
+
+        with patch.object(api, "_fetch_endpoint", fetch):
+            await api.get_current_parameters()
+            await api.get_current_parameters()
+
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_response_cache_disabled(self, mock_3phase_current):
+        """Test cache_ttl of zero always fetches."""
+        api = FoxEnergyAPI("192.168.1.100", cache_ttl=0)
+        fetch = AsyncMock(return_value=mock_3phase_current)
+
+        with patch.object(api, "_fetch_endpoint", fetch):
+            await api.get_current_parameters()
+            await api.get_current_parameters()
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, mock_3phase_current):
+        """Test failed requests are retried on the next call."""
+        api = FoxEnergyAPI("192.168.1.100", cache_ttl=60)
+        fetch = AsyncMock(
+            side_effect=[FoxEnergyConnectionError("boom"), mock_3phase_current]
+        )
+
+        with patch.object(api, "_fetch_endpoint", fetch):
+            with pytest.raises(FoxEnergyConnectionError):
+                await api.get_current_parameters()
+            result = await api.get_current_parameters()
+
+        assert result is mock_3phase_current
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_per_host_concurrency_limit(self, mock_3phase_current):
+        """Test endpoints of one device are fetched one at a time."""
+        api = FoxEnergyAPI("192.168.1.100", max_concurrent=1)
+        in_flight = 0
+        peak = 0
+
+        async def request(endpoint):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_3phase_current
+
+        with patch.object(api, "_request", side_effect=request):
+            await asyncio.gather(api.get_current_parameters(), api.get_total_energy())
+
+        assert peak == 1
+        assert api.metrics["requests"] == 2
+        assert api.metrics["queue_wait_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_global_concurrency_limit(self, mock_3phase_current):
+        """Test the shared limiter caps requests across devices."""
+        limiter = FoxEnergyRequestLimiter(2)
+        apis = [
+            FoxEnergyAPI(f"192.168.1.{i}", max_concurrent=2, global_limiter=limiter)
+            for i in range(4)
+        ]
+        in_flight = 0
+        peak = 0
+
+        async def request(endpoint):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_3phase_current
+
+        with patch.object(FoxEnergyAPI, "_request", side_effect=request):
+            await asyncio.gather(
+                *(api.get_current_parameters() for api in apis),
+                *(api.get_total_energy() for api in apis),
+            )
+
+        assert peak == 2
+
+    def test_timeout_capped_by_ceiling(self):
+        """Test the total timeout never exceeds the ceiling."""
+        api = FoxEnergyAPI("192.168.1.100", timeout=30, timeout_ceiling=5)
+        assert api.effective_timeout == 5
+
+        client_timeout = api._client_timeout()
+        assert client_timeout.total == 5
+        assert client_timeout.connect == 3.0
+        assert client_timeout.sock_read == 5.0
+
+    def test_adaptive_timeout(self):
+        """Test adaptive timeout follows observed p99 latency."""
+        api = FoxEnergyAPI("192.168.1.100", adaptive_timeout=True, timeout_ceiling=5)
+        api.latencies.extend([0.05] * 98 + [0.2] * 2)
+        assert api.effective_timeout == pytest.approx(0.6)
+
+        # Never below the floor
+        api.latencies.clear()
+        api.latencies.extend([0.01] * 100)
+        assert api.effective_timeout == 0.3
+
+        # Never above the ceiling
+        api.latencies.clear()
+        api.latencies.extend([4.0] * 100)
+        assert api.effective_timeout == 5
+
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_follows_slower_meter(self, mock_3phase_current):
+        """Test timeouts raise the adaptive timeout when the meter slows down."""
+        api = FoxEnergyAPI("192.168.1.100", timeout=5, adaptive_timeout=True)
+        latency = 0.001
+        # Simulated clock, so loop jitter cannot turn a response into a timeout
+        clock = SimpleNamespace(now=0.0)
+
+        async def request(endpoint):
+            timeout = api.effective_timeout
+            if latency > timeout:
+                clock.now += timeout
+                raise FoxEnergyTimeoutError("Connection timeout")
+            clock.now += latency
+            return mock_3phase_current
+
+        failures = 0
+        # Scaled down: floor 30 ms, the meter slows from 1 ms to 40 ms
+        with (
+            patch("custom_components.fox_energy.api.ADAPTIVE_TIMEOUT_MIN", 0.03),
+            patch(
+                "custom_components.fox_energy.api.time",
+                SimpleNamespace(monotonic=lambda: clock.now),
+            ),
+            patch.object(api, "_request", side_effect=request),
+        ):
+            for _ in range(30):
+                await api.get_current_parameters(fresh=True)
+            assert api.effective_timeout == 0.03
+
+            latency = 0.04
+            for _ in range(20):
+                try:
+                    await api.get_current_parameters(fresh=True)
+                except FoxEnergyConnectionError:
+                    failures += 1
+
+        assert failures == 1
+        assert api.effective_timeout > latency
+
+    def test_adaptive_timeout_needs_samples(self):
+        """Test adaptive mode keeps the configured timeout until warmed up."""
+        api = FoxEnergyAPI("192.168.1.100", timeout=10, adaptive_timeout=True)
+        api.latencies.extend([0.05] * 5)
+        assert api.effective_timeout == 10
+
+    def test_percentile(self):
+        """Test nearest-rank percentile."""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.99) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_limiter_replaced_during_request(self, mock_3phase_current):
+        """Test a request releases the limiter it acquired."""
+        api = FoxEnergyAPI("192.168.1.100")
+        old_limiter = api.limiter
+
+        async def request(endpoint):
+            api.limiter = FoxEnergyRequestLimiter(2)
+            return mock_3phase_current
+
+        with patch.object(api, "_request", side_effect=request):
+            await api.get_current_parameters()
+
+        assert old_limiter._semaphore._value == 1
+        assert api.limiter._semaphore._value == 2
+
+
+class TestFoxEnergyRequestLimiter:
+    """Tests for FoxEnergyRequestLimiter class."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self):
+        """Test token bucket spaces requests at the configured rate."""
+        limiter = FoxEnergyRequestLimiter(4, rate=50)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        for _ in range(4):
+            await limiter.acquire()
+            limiter.release()
+
+        # First request uses the initial token, the other three wait 20 ms each
+        assert loop.time() - start >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_no_rate_limit(self):
+        """Test a rate of zero never waits."""
+        limiter = FoxEnergyRequestLimiter(1)
+
+        for _ in range(10):
+            assert await limiter.acquire() < 0.01
+            limiter.release()
+
 
 class TestFoxEnergyDataProcessor:
     """Tests for FoxEnergyDataProcessor class."""
@@ -145,12 +389,12 @@ class TestFoxEnergyDataProcessor:
     def test_parse_energy_wh_invalid(self):
         """Test energy parsing with invalid value."""
         result = FoxEnergyDataProcessor.parse_energy_wh("invalid")
-        assert result == 0.0
+        assert result is None
 
     def test_parse_energy_wh_none(self):
         """Test energy parsing with None."""
         result = FoxEnergyDataProcessor.parse_energy_wh(None)
-        assert result == 0.0
+        assert result is None
 
     def test_parse_float_string(self):
         """Test float parsing from string."""
@@ -170,7 +414,7 @@ class TestFoxEnergyDataProcessor:
     def test_parse_float_invalid(self):
         """Test float parsing with invalid value."""
         result = FoxEnergyDataProcessor.parse_float("invalid")
-        assert result == 0.0
+        assert result is None
 
     def test_process_3phase_data(self, mock_3phase_current, mock_3phase_energy):
         """Test 3-phase data processing."""
@@ -213,6 +457,21 @@ class TestFoxEnergyDataProcessor:
         assert result["cos_phi_l2"] == -0.34
         assert result["cos_phi_l3"] == -0.27
 
+    def test_process_3phase_unparsable_phase(
+        self, mock_3phase_current, mock_3phase_energy
+    ):
+        """Test a phase that cannot be parsed makes its sum unknown."""
+        energy = {
+            **mock_3phase_energy,
+            "active_energy_import": [4951294, "garbage", 6228263],
+        }
+
+        result = FoxEnergyDataProcessor.process_3phase_data(mock_3phase_current, energy)
+
+        assert result["energia_pobrana_l1"] == 4951.294
+        assert result["energia_pobrana_l2"] is None
+        assert result["energia_pobrana_suma"] is None
+
     def test_process_1phase_data(self, mock_1phase_current, mock_1phase_energy):
         """Test 1-phase data processing."""
         result = FoxEnergyDataProcessor.process_1phase_data(
@@ -239,3 +498,51 @@ class TestFoxEnergyDataProcessor:
 
         # Check reactive power
         assert result["moc_reaktywna"] == 0.0
+
+    def test_process_3phase_all_keys(self, mock_3phase_current, mock_3phase_energy):
+        """Test processing without key selection produces every sensor."""
+        result = FoxEnergyDataProcessor.process_3phase_data(
+            mock_3phase_current, mock_3phase_energy
+        )
+        assert set(result) == set(SENSORS_3PHASE)
+
+    def test_process_3phase_selected_keys(self, mock_3phase_current):
+        """Test only selected keys and their sum inputs are computed."""
+        result = FoxEnergyDataProcessor.process_3phase_data(
+            mock_3phase_current, None, {"moc_czynna_suma", "napiecie_l1"}
+        )
+        assert result == {
+            "moc_czynna_l1": 353.6,
+            "moc_czynna_l2": 40.3,
+            "moc_czynna_l3": 69.7,
+            "napiecie_l1": 239.7,
+            "moc_czynna_suma": 463.6,
+        }
+
+    def test_process_1phase_selected_keys(self, mock_1phase_energy):
+        """Test 1-phase processing of a single endpoint."""
+        result = FoxEnergyDataProcessor.process_1phase_data(
+            None, mock_1phase_energy, ["energia_pobrana"]
+        )
+        assert result == {"energia_pobrana": 1871193.477}
+
+    def test_required_endpoints(self):
+        """Test endpoints are derived from requested keys."""
+        both = {ENDPOINT_CURRENT_PARAMETERS, ENDPOINT_TOTAL_ENERGY}
+        assert FoxEnergyDataProcessor.required_endpoints(DEVICE_TYPE_3PHASE) == both
+        assert (
+            FoxEnergyDataProcessor.required_endpoints(
+                DEVICE_TYPE_1PHASE, set(SENSORS_1PHASE)
+            )
+            == both
+        )
+        assert FoxEnergyDataProcessor.required_endpoints(
+            DEVICE_TYPE_3PHASE, {"energia_pobrana_suma"}
+        ) == {ENDPOINT_TOTAL_ENERGY}
+        assert FoxEnergyDataProcessor.required_endpoints(
+            DEVICE_TYPE_3PHASE, {"cos_phi_l1"}
+        ) == {ENDPOINT_CURRENT_PARAMETERS}
+        assert (
+            FoxEnergyDataProcessor.required_endpoints(DEVICE_TYPE_3PHASE, set())
+            == set()
+        )
@@ -0,0 +1,125 @@
+"""Tests for Fox Energy burst capture."""
+
+import json
+from functools import partial
+
+import pytest
+
+from custom_components.fox_energy.api import (
+    FoxEnergyAPI,
+    FoxEnergyConnectionError,
+    FoxEnergyDataProcessor,
+)
+from custom_components.fox_energy.burst import (
+    BURST_MAX_CONSECUTIVE_ERRORS,
+    FoxEnergyBurstBuffer,
+    async_burst_capture,
+)
+from custom_components.fox_energy.const import (
+    DEVICE_TYPE_1PHASE,
+    DEVICE_TYPE_3PHASE,
+    ENDPOINT_CURRENT_PARAMETERS,
+    TRANSPORT_KEEPALIVE,
+)
+
+from .simulator import MeterSimulator
+
+
+class TestFoxEnergyBurstBuffer:
+    """Tests for FoxEnergyBurstBuffer class."""
+
+    def test_append_until_full(self):
+        """Test samples are stored until the capacity is reached."""
+        buffer = FoxEnergyBurstBuffer(["a", "b"], capacity=2)
+
+        assert buffer.append(1.0, {"a": 1.5, "b": None})
+        assert buffer.append(2.0, {"a": 2.5, "b": 3.0})
+        assert buffer.full
+        assert not buffer.append(3.0, {"a": 9.0})
+
+        assert buffer.as_dict() == {
+            "timestamps": [1.0, 2.0],
+            "values": {"a": [1.5, 2.5], "b": [None, 3.0]},
+        }
+
+    def test_write_json(self, tmp_path):
+        """Test the series is written as JSON."""
+        buffer = FoxEnergyBurstBuffer(["a"], capacity=4)
+        buffer.append(1.0, {"a": 1.0})
+
+        buffer.write_json(tmp_path / "burst" / "series.json")
+
+        with open(tmp_path / "burst" / "series.json", encoding="utf-8") as handle:
+            assert json.load(handle) == buffer.as_dict()
+
+
+def test_endpoint_keys():
+    """Test keys computed from current parameters alone."""
+    keys = FoxEnergyDataProcessor.endpoint_keys(
+        DEVICE_TYPE_3PHASE, ENDPOINT_CURRENT_PARAMETERS
+    )
+
+    assert "napiecie_l1" in keys
+    assert "moc_czynna_suma" in keys
+    assert "energia_pobrana_l1" not in keys
+    assert "energia_pobrana_suma" not in keys
+    assert "energia_pobrana" not in FoxEnergyDataProcessor.endpoint_keys(
+        DEVICE_TYPE_1PHASE, ENDPOINT_CURRENT_PARAMETERS
+    )
+
+
+@pytest.mark.asyncio
+async def test_burst_capture_simulator():
+    """Test back-to-back sampling of a simulated meter bypasses the cache."""
+    meter = MeterSimulator()
+    await meter.start()
+    try:
+        api = FoxEnergyAPI(meter.host, 5, transport=TRANSPORT_KEEPALIVE)
+        keys = FoxEnergyDataProcessor.endpoint_keys(
+            DEVICE_TYPE_3PHASE, ENDPOINT_CURRENT_PARAMETERS
+        )
+        buffer = FoxEnergyBurstBuffer(keys, capacity=10_000)
+
+        result = await async_burst_capture(
+            partial(api.get_current_parameters, fresh=True),
+            partial(
+                FoxEnergyDataProcessor.process_3phase_data,
+                total_energy=None,
+                keys=keys,
+            ),
+            buffer,
+            duration=0.3,
+        )
+        api.close()
+    finally:
+        await meter.stop()
+
+    assert result["errors"] == 0
+    assert result["samples"] == meter.requests == buffer.size
+    assert result["samples"] > 10
+    series = buffer.as_dict()
+    assert series["values"]["cos_phi_l1"][0] == -0.75
+    assert series["timestamps"] == sorted(series["timestamps"])
+
+
+@pytest.mark.asyncio
+async def test_burst_capture_errors():
+    """Test failures back off, bad responses are counted and a dead meter aborts."""
+    responses = iter([{"v": 1.0}, {}, {"v": 2.0}])
+
+    async def fetch():
+        try:
+            return next(responses)
+        except StopIteration:
+            raise FoxEnergyConnectionError("Connection refused") from None
+
+    buffer = FoxEnergyBurstBuffer(["v"], capacity=100)
+    result = await async_burst_capture(
+        fetch, lambda response: {"v": response["v"]}, buffer, duration=10
+    )
+
+    assert result["aborted"]
+    assert buffer.as_dict()["values"] == {"v": [1.0, 2.0]}
+    assert result["errors"] == 1 + BURST_MAX_CONSECUTIVE_ERRORS
+    # Backed off between the failures instead of spinning
+    assert 0.5 < result["seconds"] < 10
@@ -0,0 +1,210 @@
+"""Tests for the Fox Energy command-line tool."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from custom_components.fox_energy.api import FoxEnergyDataProcessor
+from custom_components.fox_energy.cli import (
+    async_discover,
+    async_latency,
+    async_load,
+    async_probe,
+    main,
+    summarize,
+)
+from custom_components.fox_energy.const import (
+    ENDPOINT_CURRENT_PARAMETERS,
+    ENDPOINT_TOTAL_ENERGY,
+)
+
+from .simulator import MeterSimulator
+
+# Nothing listens on port 1
+UNREACHABLE = "127.0.0.1:1"
+
+# Runs the tool in a fresh interpreter where Home Assistant cannot be imported,
+# without the mocks of conftest.py
+STANDALONE = """
+import runpy, sys
+
+class NoHomeAssistant:
+    def find_spec(self, name, path=None, target=None):
+        if name.partition(".")[0] == "homeassistant":
+            raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+sys.meta_path.insert(0, NoHomeAssistant())
+sys.argv = ["fox_energy"] + sys.argv[1:]
+from custom_components.fox_energy import *
+runpy.run_module("custom_components.fox_energy.cli", run_name="__main__")
+"""
+
+
+@pytest.fixture
+async def simulator():
+    """Start a 3-phase meter simulator."""
+    meter = MeterSimulator()
+    await meter.start()
+    yield meter
+    await meter.stop()
+
+
+def test_summarize():
+    """Test latencies are summarized in milliseconds."""
+    stats = summarize([i / 1000 for i in range(100, 0, -1)])
+
+    assert stats == {
+        "count": 100,
+        "mean_ms": 50.5,
+        "min_ms": 1.0,
+        "p50_ms": 50.0,
+        "p90_ms": 90.0,
+        "p99_ms": 99.0,
+        "max_ms": 100.0,
+    }
+    assert summarize([]) == {"count": 0}
+
+
+async def test_probe(simulator, mock_3phase_current, mock_3phase_energy):
+    """Test a probe detects the meter and reads a processed sample."""
+    result = await async_probe(simulator.host)
+
+    assert result["device_type"] == "3phase"
+    assert result["data"] == FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+    assert "error" in await async_probe(UNREACHABLE, timeout=1)
+
+
+async def test_discover(simulator):
+    """Test discovery returns only addresses answering as a meter."""
+    port = int(simulator.host.rpartition(":")[2])
+
+    found = await async_discover("127.0.0.1/32", port)
+
+    assert [result["host"] for result in found] == [simulator.host]
+    assert await async_discover("127.0.0.1/32", 1) == []
+    with pytest.raises(ValueError):
+        await async_discover("10.0.0.0/8")
+
+
+async def test_latency(simulator):
+    """Test every request reaches the meter and is measured per endpoint."""
+    other = MeterSimulator("1phase")
+    await other.start()
+    hosts = [simulator.host, other.host]
+    try:
+        results = await async_latency(hosts, requests=20)
+    finally:
+        await other.stop()
+
+    for host in hosts:
+        assert set(results[host]) == {
+            ENDPOINT_CURRENT_PARAMETERS,
+            ENDPOINT_TOTAL_ENERGY,
+        }
+        for stats in results[host].values():
+            assert stats["count"] == 20
+            assert stats["errors"] == 0
+            assert stats["min_ms"] <= stats["p50_ms"] <= stats["p99_ms"]
+    assert simulator.requests == other.requests == 40
+
+
+async def test_load(simulator):
+    """Test sustained polling reports throughput, errors and jitter."""
+    results = await async_load([simulator.host], rate=20, duration=0.5)
+
+    stats = results[simulator.host]
+    assert stats["polls"] == 10
+    assert stats["errors"] == stats["skipped"] == 0
+    assert stats["throughput"] == pytest.approx(20, rel=0.2)
+    assert stats["latency"]["count"] == 10
+    assert stats["jitter_ms"] < 50
+
+
+async def test_load_errors(simulator):
+    """Test failed polls count towards the error rate."""
+    del simulator.bodies[ENDPOINT_TOTAL_ENERGY]
+
+    results = await async_load(
+        [simulator.host, UNREACHABLE], rate=20, duration=0.25, timeout=1
+    )
+
+    stats = results[simulator.host]
+    assert stats["polls"] == 5
+    assert stats["error_rate"] == 1.0
+    assert stats["error_types"] == {"FoxEnergyConnectionError": 5}
+    assert stats["latency"] == {"count": 0}
+    assert "error" in results[UNREACHABLE]
+
+
+def test_main(capsys):
+    """Test the command line prints results and fails if no meter answered."""
+    assert main(["--json", "probe", UNREACHABLE, "--timeout", "1"]) == 1
+    assert json.loads(capsys.readouterr().out)[0]["host"] == UNREACHABLE
+
+    assert main(["probe", UNREACHABLE, "--timeout", "1"]) == 1
+    assert capsys.readouterr().out.splitlines()[0].split() == [
+        "host",
+        "type",
+        "seconds",
+        "values",
+        "error",
+    ]
+
+    with pytest.raises(SystemExit):
+        main(["discover", "10.0.0.0/8"])
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["load", UNREACHABLE, "--rate", "0"],
+        ["load", UNREACHABLE, "--rate", "-1"],
+        ["load", UNREACHABLE, "--rate", "inf"],
+        ["load", UNREACHABLE, "--duration", "0"],
+        ["latency", UNREACHABLE, "-n", "0"],
+        ["probe", UNREACHABLE, "--timeout", "-1"],
+    ],
+)
+def test_main_rejects_non_positive(argv, capsys):
+    """Test counts, rates and durations must be positive."""
+    with pytest.raises(SystemExit) as err:
+        main(argv)
+
+    assert err.value.code == 2
+    assert "positive number" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(("rate", "duration"), [(0, 1), (-1, 1), (1, 0)])
+async def test_load_rejects_non_positive(rate, duration):
+    """Test a load without a positive rate and duration is refused."""
+    with pytest.raises(ValueError):
+        await async_load([UNREACHABLE], rate=rate, duration=duration)
+
+
+def test_runs_without_home_assistant():
+    """Test the tool runs as a module without Home Assistant installed."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            STANDALONE,
+            "--json",
+            "probe",
+            UNREACHABLE,
+            "--timeout",
+            "1",
+        ],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=False,
+    )
+
+    assert result.returncode == 1, result.stderr
+    assert "error" in json.loads(result.stdout)[0]
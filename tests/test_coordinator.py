@@ -0,0 +1,257 @@
+"""Tests for the Fox Energy coordinator on the event loop."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.fox_energy import integration
+from custom_components.fox_energy.api import (
+    FoxEnergyConnectionError,
+    FoxEnergyDataProcessor,
+)
+from custom_components.fox_energy.const import (
+    CONF_EXTERNAL_STATISTICS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_RATE,
+    CONF_SCAN_INTERVAL,
+    CONF_STORE_SAMPLES,
+    CONF_TRANSPORT,
+    DOMAIN,
+    TRANSPORT_KEEPALIVE,
+)
+from custom_components.fox_energy.pipeline import FoxEnergyWorkerPool
+
+HOST = "192.168.3.101"
+SCAN_INTERVAL = 0.1
+
+
+@pytest.fixture
+async def coordinator(coordinator_module, hass):
+    """Create a 3-phase meter coordinator registered for a config entry."""
+    pool = FoxEnergyWorkerPool(hass.loop)
+    coordinator = coordinator_module.FoxEnergyCoordinator(hass, HOST, worker_pool=pool)
+    coordinator.device_type = "3phase"
+    hass.data[DOMAIN] = {"entry": coordinator}
+    hass.config_entries = SimpleNamespace(async_reload=AsyncMock())
+    yield coordinator
+    coordinator.async_stop()
+    await hass.async_add_executor_job(pool.shutdown)
+
+
+@pytest.fixture
+def sample(mock_3phase_current, mock_3phase_energy):
+    """Return a processed 3-phase sample."""
+    return FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+
+
+def _entry(**options):
+    """Return a config entry of the test meter with options."""
+    return SimpleNamespace(
+        entry_id="entry", data={integration.CONF_HOST: HOST}, options=options
+    )
+
+
+def _rows(store, start):
+    """Return the number of stored rows since start."""
+    return sum(len(chunk) for _, chunk in store.iter_rows(start, start + 3600))
+
+
+class TestUpdateOptions:
+    """Tests for options applied without a reload."""
+
+    async def test_limiter_transport_and_interval(self, coordinator, hass):
+        """Test new limits and transport are applied and the tick rescheduled."""
+        coordinator.async_start()
+        limiter = coordinator.api.limiter
+        handle = coordinator._tick_handle
+
+        await integration.async_update_options(
+            hass,
+            _entry(
+                **{
+                    CONF_MAX_CONCURRENT_REQUESTS: 2,
+                    CONF_REQUEST_RATE: 4,
+                    CONF_TRANSPORT: TRANSPORT_KEEPALIVE,
+                    CONF_SCAN_INTERVAL: 60,
+                }
+            ),
+        )
+
+        hass.config_entries.async_reload.assert_not_awaited()
+        assert coordinator.api.limiter is not limiter
+        assert coordinator.api.limiter.max_concurrent == 2
+        assert coordinator.api.limiter.rate == 4
+        assert coordinator.api.transport == TRANSPORT_KEEPALIVE
+        assert coordinator.api.timeout_ceiling == 60
+        assert coordinator.scan_interval == 60
+        assert handle.cancelled()
+        assert not coordinator._tick_handle.cancelled()
+        # The next tick is on a multiple of the new interval
+        delay = coordinator._tick_handle.when() - hass.loop.time()
+        due = time.time() + delay
+        assert 0 < delay <= 60
+        assert due == pytest.approx(round(due / 60) * 60, abs=0.1)
+
+    async def test_unchanged_limits_kept(self, coordinator, hass):
+        """Test the limiter is kept if its limits did not change."""
+        limiter = coordinator.api.limiter
+
+        await integration.async_update_options(hass, _entry())
+
+        assert coordinator.api.limiter is limiter
+
+    async def test_store_path_switched(self, coordinator, hass, tmp_path, sample):
+        """Test samples go to the new store path without a reload."""
+        old_path = tmp_path / "old"
+        coordinator.sample_store_path = old_path
+        coordinator.pipeline.batch_size = 1
+        start = time.time() // 3600 * 3600
+        for index in range(5):
+            coordinator._publish_sample(start + index, dict(sample))
+        await coordinator.async_flush_samples()
+        old_store = coordinator.sample_store
+
+        # Workers keep storing while the store is switched
+        update = hass.loop.create_task(
+            integration.async_update_options(hass, _entry(**{CONF_STORE_SAMPLES: True}))
+        )
+        for index in range(5, 50):
+            coordinator._publish_sample(start + index, dict(sample))
+            await asyncio.sleep(0)
+        await update
+        for index in range(50, 55):
+            coordinator._publish_sample(start + index, dict(sample))
+        await coordinator.async_flush_samples()
+
+        hass.config_entries.async_reload.assert_not_awaited()
+        new_store = coordinator.sample_store
+        assert new_store.path == tmp_path / DOMAIN / HOST
+        assert coordinator.sample_store_path == new_store.path
+        assert old_store.path == old_path
+        assert _rows(old_store, start) >= 5
+        assert _rows(new_store, start) >= 5
+        assert _rows(old_store, start) + _rows(new_store, start) == 55
+
+    async def test_store_disabled(self, coordinator, hass, tmp_path, sample):
+        """Test buffered samples are written when storing is switched off."""
+        coordinator.sample_store_path = tmp_path / "old"
+        start = time.time() // 3600 * 3600
+        for index in range(5):
+            coordinator._publish_sample(start + index, dict(sample))
+        await coordinator.pipeline.async_flush()
+        store = coordinator.sample_store
+
+        await integration.async_update_options(hass, _entry())
+        coordinator._publish_sample(start + 5, dict(sample))
+        await coordinator.async_flush_samples()
+
+        assert coordinator.sample_store is None
+        assert coordinator.sample_store_path is None
+        assert _rows(store, start) == 5
+
+    async def test_external_statistics_reloads(self, coordinator, hass):
+        """Test options changing how entities are created reload the entry."""
+        limiter = coordinator.api.limiter
+
+        await integration.async_update_options(
+            hass,
+            _entry(**{CONF_EXTERNAL_STATISTICS: True, CONF_MAX_CONCURRENT_REQUESTS: 2}),
+        )
+
+        hass.config_entries.async_reload.assert_awaited_once_with("entry")
+        assert coordinator.api.limiter is limiter
+
+
+class _SlowAPI:
+    """Meter API answering after a delay and counting polls in flight."""
+
+    def __init__(self, current, energy, delay):
+        self.current = current
+        self.energy = energy
+        self.delay = delay
+        self.fail = False
+        self.polls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def detect_device_type(self):
+        return "3phase"
+
+    async def get_current_parameters(self):
+        self.polls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise FoxEnergyConnectionError("Meter unreachable")
+            return self.current
+        finally:
+            self.in_flight -= 1
+
+    async def get_total_energy(self):
+        await asyncio.sleep(self.delay)
+        return self.energy
+
+    def close(self):
+        pass
+
+
+class TestPolling:
+    """Tests for aligned ticks and serialized polls."""
+
+    @pytest.fixture
+    def api(self, coordinator, mock_3phase_current, mock_3phase_energy):
+        """Replace the meter API of the coordinator by a slow one."""
+        coordinator.scan_interval = SCAN_INTERVAL
+        coordinator.api = _SlowAPI(mock_3phase_current, mock_3phase_energy, 0.25)
+        return coordinator.api
+
+    async def test_in_flight_poll_skips_ticks(self, coordinator, api):
+        """Test ticks due while a poll runs are skipped and counted."""
+        coordinator.async_start()
+        await asyncio.sleep(1)
+        coordinator.async_stop()
+
+        assert api.max_in_flight == 1
+        # Every poll spans two or three ticks
+        assert 2 <= api.polls <= 6
+        assert coordinator.skipped_ticks >= api.polls - 1
+        assert coordinator.data["device_type"] == "3phase"
+
+    async def test_manual_refresh_serialized(self, coordinator, api):
+        """Test manual refreshes never poll in parallel with scheduled ones."""
+        coordinator.async_start()
+        await asyncio.sleep(SCAN_INTERVAL * 1.5)
+        await asyncio.gather(*(coordinator.async_refresh() for _ in range(3)))
+        coordinator.async_stop()
+
+        assert api.max_in_flight == 1
+        assert api.polls >= 4
+        assert coordinator.last_update_success
+
+    async def test_tick_rescheduled_after_failed_poll(self, coordinator, api):
+        """Test polling continues on aligned ticks after a failed poll."""
+        api.delay = 0.01
+        api.fail = True
+        coordinator.async_start()
+        await asyncio.sleep(SCAN_INTERVAL * 2.5)
+
+        assert not coordinator.last_update_success
+        failed_tick = coordinator.last_tick
+        api.fail = False
+        await asyncio.sleep(SCAN_INTERVAL * 2.5)
+        coordinator.async_stop()
+
+        assert coordinator.last_tick > failed_tick
+        assert coordinator.last_update_success
+        assert coordinator.skipped_ticks == 0
+        # Ticks stay on multiples of the interval
+        assert coordinator.last_tick / SCAN_INTERVAL == pytest.approx(
+            round(coordinator.last_tick / SCAN_INTERVAL), abs=1e-6
+        )
@@ -0,0 +1,313 @@
+"""Tests for the Fox Energy poller daemon and sample stream."""
+
+import asyncio
+import json
+
+import pytest
+
+from custom_components.fox_energy.api import FoxEnergyDataProcessor
+from custom_components.fox_energy.daemon import FoxEnergyDaemon
+from custom_components.fox_energy.stream import (
+    FRAME_HELLO,
+    FRAME_METER,
+    METER_INDEX,
+    STREAM_VERSION,
+    FoxEnergyStreamClient,
+    FoxEnergyStreamError,
+    StreamMeter,
+    encode_frame,
+    parse_address,
+)
+
+from .simulator import MeterSimulator
+
+SCAN_INTERVAL = 0.2
+
+
+class _Subscriber:
+    """Collect the samples and errors of one meter."""
+
+    def __init__(self):
+        self.samples = []
+        self.errors = []
+        self.event = asyncio.Event()
+
+    def on_sample(self, timestamp, data, device_type):
+        self.samples.append((timestamp, data, device_type))
+        self.event.set()
+
+    def on_error(self, message):
+        self.errors.append(message)
+        self.event.set()
+
+    async def wait(self, condition, timeout=5):
+        """Wait until condition() holds."""
+        async with asyncio.timeout(timeout):
+            while not condition():
+                self.event.clear()
+                await self.event.wait()
+
+
+@pytest.fixture
+async def simulators():
+    """Start a 3-phase and a 1-phase meter simulator."""
+    meters = [MeterSimulator("3phase"), MeterSimulator("1phase")]
+    for meter in meters:
+        await meter.start()
+    yield meters
+    for meter in meters:
+        await meter.stop()
+
+
+def test_sample_round_trip(mock_3phase_current, mock_3phase_energy):
+    """Test samples survive the binary framing, missing values included."""
+    data = FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+    key = next(iter(data))
+    data[key] = None
+    meter = StreamMeter(3, "192.168.3.101", "3phase", list(data))
+
+    frame = meter.encode_sample(1_767_225_600.0, data)
+    announced = StreamMeter.from_payload(meter.encode_meter()[5:])
+    timestamp, decoded = announced.decode_sample(frame[5:])
+
+    assert announced == meter
+    assert timestamp == 1_767_225_600.0
+    assert decoded == data
+    # 8 bytes per value instead of JSON names and digits
+    assert len(frame) == 5 + 2 + 8 + 8 * len(data)
+    assert len(frame) < len(json.dumps(data)) / 2
+
+
+@pytest.mark.parametrize(
+    ("address", "expected"),
+    [
+        ("/run/fox_energy.sock", ("/run/fox_energy.sock", None)),
+        ("127.0.0.1:8765", ("127.0.0.1", 8765)),
+        ("::1:8765", ("::1", 8765)),
+    ],
+)
+def test_parse_address(address, expected):
+    """Test Unix socket paths and host:port are told apart."""
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize(
+    "address", ["fox_energy.sock", "localhost", ":8765", "h:65536"]
+)
+def test_invalid_address(address):
+    """Test addresses that are neither a path nor host:port are rejected."""
+    with pytest.raises(ValueError):
+        parse_address(address)
+
+
+async def test_streams_processed_samples(
+    simulators,
+    mock_3phase_current,
+    mock_3phase_energy,
+    mock_1phase_current,
+    mock_1phase_energy,
+):
+    """Test the daemon streams the same samples the integration computes."""
+    three, one = simulators
+    daemon = FoxEnergyDaemon(
+        [three.host, one.host], "127.0.0.1:0", scan_interval=SCAN_INTERVAL
+    )
+    await daemon.async_start()
+    client = FoxEnergyStreamClient(daemon.bound_address)
+    subscribers = {three.host: _Subscriber(), one.host: _Subscriber()}
+    unsubs = [
+        client.subscribe(host, subscriber.on_sample, subscriber.on_error)
+        for host, subscriber in subscribers.items()
+    ]
+    try:
+        for subscriber in subscribers.values():
+            await subscriber.wait(lambda s=subscriber: len(s.samples) >= 2)
+    finally:
+        for unsub in unsubs:
+            unsub()
+        await daemon.async_stop()
+
+    timestamp, data, device_type = subscribers[three.host].samples[-1]
+    assert device_type == "3phase"
+    assert data == FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+    # Samples carry the aligned tick
+    assert timestamp / SCAN_INTERVAL == pytest.approx(
+        round(timestamp / SCAN_INTERVAL), abs=1e-6
+    )
+
+    _timestamp, data, device_type = subscribers[one.host].samples[-1]
+    assert device_type == "1phase"
+    assert data == FoxEnergyDataProcessor.process_1phase_data(
+        mock_1phase_current, mock_1phase_energy
+    )
+    assert not any(subscriber.errors for subscriber in subscribers.values())
+
+
+async def test_failing_subscriber(simulators, caplog):
+    """Test a raising callback neither ends the stream nor other subscribers."""
+    three, one = simulators
+    daemon = FoxEnergyDaemon(
+        [three.host, one.host], "127.0.0.1:0", scan_interval=SCAN_INTERVAL
+    )
+    await daemon.async_start()
+    tasks = []
+
+    def create_task(coro, name):
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        tasks.append(task)
+        return task
+
+    client = FoxEnergyStreamClient(daemon.bound_address, create_task=create_task)
+    subscriber = _Subscriber()
+
+    def on_sample(timestamp, data, device_type):
+        raise RuntimeError("broken subscriber")
+
+    unsubs = [
+        client.subscribe(three.host, on_sample, subscriber.on_error),
+        client.subscribe(one.host, subscriber.on_sample, subscriber.on_error),
+    ]
+    try:
+        await subscriber.wait(lambda: len(subscriber.samples) >= 3)
+        assert client.connects == 1
+    finally:
+        for unsub in unsubs:
+            unsub()
+        await daemon.async_stop()
+
+    assert len(tasks) == 1
+    assert "Error in sample stream subscriber of " + three.host in caplog.text
+    assert not subscriber.errors
+
+
+@pytest.mark.parametrize(
+    "info",
+    [
+        {"device_type": "3phase", "keys": ["a"]},
+        {"host": "192.168.3.101", "device_type": "3phase"},
+        {"host": "192.168.3.101", "device_type": "3phase", "keys": 5},
+        {"host": None, "device_type": "3phase", "keys": ["a"]},
+        ["192.168.3.101"],
+    ],
+)
+def test_malformed_meter_frame(info):
+    """Test meter frames with missing or mistyped fields are stream errors."""
+    with pytest.raises(FoxEnergyStreamError):
+        StreamMeter.from_payload(METER_INDEX.pack(0) + json.dumps(info).encode())
+
+
+async def test_malformed_meter_frame_reconnects():
+    """Test a malformed meter frame is reported and the client reconnects."""
+    meter = StreamMeter(0, "192.168.3.101", "1phase", ["moc_czynna"])
+    connections = 0
+
+    async def serve(reader, writer):
+        nonlocal connections
+        connections += 1
+        writer.write(encode_frame(FRAME_HELLO, bytes([STREAM_VERSION])))
+        if connections == 1:
+            info = {"device_type": "1phase", "keys": meter.keys}
+            payload = METER_INDEX.pack(0) + json.dumps(info).encode()
+            writer.write(encode_frame(FRAME_METER, payload))
+        else:
+            writer.write(meter.encode_meter())
+            writer.write(meter.encode_sample(1_767_225_600.0, {"moc_czynna": 1.5}))
+        await writer.drain()
+        await reader.read()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    client = FoxEnergyStreamClient(f"{host}:{port}", retry_delay=0.05)
+    subscriber = _Subscriber()
+    unsub = client.subscribe(meter.host, subscriber.on_sample, subscriber.on_error)
+    try:
+        await subscriber.wait(lambda: subscriber.samples)
+    finally:
+        unsub()
+        server.close()
+
+    assert subscriber.errors[0].startswith("Sample stream error: Malformed meter")
+    assert subscriber.samples == [(1_767_225_600.0, {"moc_czynna": 1.5}, "1phase")]
+    assert client.connects == 2
+
+
+async def test_errors_and_reconnect(simulators, tmp_path):
+    """Test failed polls are reported and the client survives a daemon restart."""
+    down = MeterSimulator()
+    await down.start()
+    down_host = down.host
+    await down.stop()
+
+    address = str(tmp_path / "fox_energy.sock")
+    hosts = [simulators[0].host, down_host]
+    daemon = FoxEnergyDaemon(hosts, address, scan_interval=SCAN_INTERVAL)
+    await daemon.async_start()
+    client = FoxEnergyStreamClient(address, retry_delay=0.05)
+    live, dead = _Subscriber(), _Subscriber()
+    unsubs = [
+        client.subscribe(simulators[0].host, live.on_sample, live.on_error),
+        client.subscribe(down_host, dead.on_sample, dead.on_error),
+    ]
+    try:
+        await dead.wait(lambda: dead.errors)
+        assert not dead.samples
+        await live.wait(lambda: live.samples)
+
+        await daemon.async_stop()
+        await live.wait(lambda: live.errors)
+        assert live.errors[0] == "Sample stream closed"
+        assert not client.connected
+
+        daemon = FoxEnergyDaemon(hosts, address, scan_interval=SCAN_INTERVAL)
+        await daemon.async_start()
+        received = len(live.samples)
+        await live.wait(lambda: len(live.samples) > received)
+        assert client.connects == 2
+    finally:
+        for unsub in unsubs:
+            unsub()
+        await daemon.async_stop()
+
+
+async def test_fleet_polled_every_tick():
+    """Test a fleet of meters is polled concurrently on every tick."""
+    fleet = [MeterSimulator() for _ in range(50)]
+    for meter in fleet:
+        await meter.start()
+    hosts = [meter.host for meter in fleet]
+    daemon = FoxEnergyDaemon(
+        hosts,
+        "127.0.0.1:0",
+        scan_interval=SCAN_INTERVAL,
+        max_concurrent=len(fleet),
+    )
+    await daemon.async_start()
+    client = FoxEnergyStreamClient(daemon.bound_address)
+    subscribers = {host: _Subscriber() for host in hosts}
+    unsubs = [
+        client.subscribe(host, subscriber.on_sample, subscriber.on_error)
+        for host, subscriber in subscribers.items()
+    ]
+    try:
+        for subscriber in subscribers.values():
+            await subscriber.wait(lambda s=subscriber: len(s.samples) >= 4)
+    finally:
+        for unsub in unsubs:
+            unsub()
+        await daemon.async_stop()
+        for meter in fleet:
+            await meter.stop()
+
+    # Every meter got a sample for the same ticks
+    ticks = [
+        {round(timestamp / SCAN_INTERVAL) for timestamp, _, _ in s.samples[1:4]}
+        for s in subscribers.values()
+    ]
+    assert all(tick == ticks[0] for tick in ticks)
+    stats = daemon.as_dict()
+    assert stats["failed_polls"] == 0
+    assert stats["skipped_ticks"] == 0
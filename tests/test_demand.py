@@ -0,0 +1,135 @@
+"""Tests for Fox Energy demand tracking."""
+
+import tracemalloc
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.fox_energy.demand import (
+    DEMAND_BLOCK,
+    DEMAND_KEY,
+    DEMAND_PROJECTED_KEY,
+    PEAK_DEMAND_KEY,
+    PEAK_DEMAND_MEAN_KEY,
+    FoxEnergyDemand,
+)
+
+WARSAW = ZoneInfo("Europe/Warsaw")
+# 2026-03-02 00:00 local, a block boundary
+START = datetime(2026, 3, 2, tzinfo=WARSAW).timestamp()
+
+
+def _feed(demand, start, powers, step=5):
+    """Feed one power value per step seconds, return completed blocks."""
+    completed = []
+    for index, power in enumerate(powers):
+        block = demand.add(start + index * step, power)
+        if block is not None:
+            completed.append(block)
+    return completed
+
+
+def test_running_average_and_projection():
+    """Test the average so far and the projected end-of-block value."""
+    demand = FoxEnergyDemand(WARSAW)
+
+    _feed(demand, START, [1000] * 60 + [4000])
+
+    # 300 s at 1000 W, now 4000 W for the remaining 600 s
+    assert demand.average == 1000
+    assert demand.projected == pytest.approx((300 * 1000 + 600 * 4000) / 900)
+
+
+def test_block_completion_and_peaks():
+    """Test block averages, top-N peaks and sensor values."""
+    demand = FoxEnergyDemand(WARSAW, peaks=2)
+    powers = [1000] * 180 + [3000] * 180 + [2000] * 180 + [500]
+
+    completed = _feed(demand, START, powers)
+
+    assert [(block.start, block.average) for block in completed] == [
+        (START, 1000),
+        (START + DEMAND_BLOCK, 3000),
+        (START + 2 * DEMAND_BLOCK, 2000),
+    ]
+    assert demand.values() == {
+        DEMAND_KEY: 500,
+        DEMAND_PROJECTED_KEY: 500,
+        PEAK_DEMAND_KEY: 3000,
+        PEAK_DEMAND_MEAN_KEY: 2500,
+    }
+
+
+def test_peaks_reset_each_month():
+    """Test peaks start over with the first block of a new month."""
+    demand = FoxEnergyDemand(WARSAW)
+    end_of_march = datetime(2026, 3, 31, 23, 45, tzinfo=WARSAW).timestamp()
+
+    _feed(demand, end_of_march, [5000] * 180 + [100] * 181)
+
+    assert [block.average for block in demand.peaks] == [100]
+    assert demand.month == "2026-04"
+
+
+def test_gaps_are_not_integrated():
+    """Test the average covers only the time samples were received."""
+    demand = FoxEnergyDemand(WARSAW, max_gap=15)
+
+    _feed(demand, START, [1000] * 12)
+    demand.add(START + 300, 3000)
+    demand.add(START + 305, 3000)
+    completed = demand.add(START + DEMAND_BLOCK, 0)
+
+    # 55 s at 1000 W, a gap, 5 s at 3000 W and another gap
+    assert completed.average == pytest.approx((55 * 1000 + 5 * 3000) / 60)
+
+
+def test_threshold_alerts_once_per_block():
+    """Test a projected excess alerts once, not before the minimum elapsed."""
+    demand = FoxEnergyDemand(WARSAW)
+    alerts = []
+    for index, power in enumerate([9000] * 360):
+        demand.add(START + index * 5, power)
+        alerts.append(demand.check_threshold(5000))
+
+    assert alerts.count(True) == 2
+    assert alerts.index(True) == 12
+    assert alerts[180 + 12]
+    assert not demand.check_threshold(0)
+
+
+def test_restore_continues_block():
+    """Test a restored tracker completes the interrupted block."""
+    demand = FoxEnergyDemand(WARSAW)
+    _feed(demand, START, [2000] * 100)
+
+    restored = FoxEnergyDemand(WARSAW)
+    restored.restore(demand.as_dict())
+    completed = restored.add(START + DEMAND_BLOCK + 60, 100)
+
+    assert completed.average == 2000
+    assert [block.average for block in restored.peaks] == [2000]
+
+
+def test_constant_memory():
+    """Test memory does not grow with the number of samples."""
+    demand = FoxEnergyDemand(WARSAW)
+    _feed(demand, START, [1000] * 1000)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        _feed(demand, START + 5000, [float(index % 7000) for index in range(50_000)])
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    grown = sum(
+        stat.size_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.traceback[0].filename.endswith("fox_energy/demand.py")
+    )
+    # A per-sample leak would grow by megabytes
+    assert grown < 64 * 1024
+    assert len(demand.peaks) == 3
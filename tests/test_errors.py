@@ -0,0 +1,54 @@
+"""Tests for Fox Energy error accounting."""
+
+import logging
+from unittest.mock import patch
+
+from custom_components.fox_energy.api import FoxEnergyDataProcessor
+from custom_components.fox_energy.errors import FoxEnergyErrorTracker
+
+
+class TestFoxEnergyErrorTracker:
+    """Tests for FoxEnergyErrorTracker class."""
+
+    def test_first_occurrence_logged_once(self, caplog):
+        """Test only the first error of a category is logged."""
+        tracker = FoxEnergyErrorTracker("meter")
+
+        with caplog.at_level(logging.WARNING):
+            for _ in range(100):
+                tracker.record("parse:napiecie", "Bad value %r", "x")
+
+        assert len(caplog.records) == 1
+        assert "Bad value 'x'" in caplog.records[0].getMessage()
+        assert tracker.as_dict()["parse:napiecie"]["count"] == 100
+
+    def test_summary_after_interval(self, caplog):
+        """Test repeats are summarised once the interval has elapsed."""
+        tracker = FoxEnergyErrorTracker("meter", summary_interval=60)
+
+        with patch("custom_components.fox_energy.errors.time.monotonic") as clock:
+            clock.return_value = 0
+            for _ in range(11):
+                tracker.record("connection", "Timeout")
+
+            tracker.log_summaries()
+            clock.return_value = 61
+            caplog.clear()
+            with caplog.at_level(logging.WARNING):
+                tracker.log_summaries()
+                tracker.log_summaries()
+
+        assert len(caplog.records) == 1
+        assert "connection failed 10 times" in caplog.records[0].getMessage()
+
+    def test_processor_records_parse_errors(self):
+        """Test parse failures are counted per field."""
+        tracker = FoxEnergyErrorTracker("meter")
+
+        FoxEnergyDataProcessor.parse_float("bad", "napiecie", tracker)
+        FoxEnergyDataProcessor.parse_float("bad", "napiecie", tracker)
+        FoxEnergyDataProcessor.parse_energy_wh("bad", "energia_pobrana", tracker)
+
+        counters = tracker.as_dict()
+        assert counters["parse:napiecie"]["count"] == 2
+        assert counters["parse:energia_pobrana"]["count"] == 1
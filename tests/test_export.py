@@ -0,0 +1,154 @@
+"""Tests for Fox Energy sample store and export."""
+
+import csv
+
+import pytest
+
+from custom_components.fox_energy.export import (
+    FoxEnergyExportError,
+    export_samples,
+)
+from custom_components.fox_energy.store import FoxEnergySampleStore
+
+KEYS = ["moc_czynna", "napiecie"]
+START = 1_767_225_600  # 2026-01-01 00:00:00 UTC
+
+
+def fill_store(store, count, interval=5):
+    """Append count samples to store and write them to disk."""
+    for index in range(count):
+        block = store.append(
+            START + index * interval, {"moc_czynna": float(index), "napiecie": 230.0}
+        )
+        if block:
+            store.write_block(block)
+    store.write_block(store.take_pending())
+
+
+class TestFoxEnergySampleStore:
+    """Tests for FoxEnergySampleStore class."""
+
+    def test_append_returns_full_blocks(self, tmp_path):
+        """Test blocks are handed out once full."""
+        store = FoxEnergySampleStore(tmp_path, KEYS, block_size=3)
+        assert store.append(START, {"moc_czynna": 1.0}) is None
+        assert store.append(START + 5, {"moc_czynna": 2.0}) is None
+        block = store.append(START + 10, {"moc_czynna": 3.0})
+
+        assert block == [
+            [START, 1.0, None],
+            [START + 5, 2.0, None],
+            [START + 10, 3.0, None],
+        ]
+        assert store.take_pending() == []
+
+    def test_iter_rows_range(self, tmp_path):
+        """Test range reads return only rows inside [start, end)."""
+        store = FoxEnergySampleStore(tmp_path, KEYS, block_size=10)
+        fill_store(store, 100)
+
+        rows = [
+            row
+            for _keys, chunk in store.iter_rows(START + 50, START + 100)
+            for row in chunk
+        ]
+        assert [row[0] for row in rows] == [START + 50 + 5 * i for i in range(10)]
+
+    def test_iter_rows_chunked(self, tmp_path):
+        """Test chunks never exceed the chunk size."""
+        store = FoxEnergySampleStore(tmp_path, KEYS, block_size=7)
+        fill_store(store, 50)
+
+        chunks = [chunk for _keys, chunk in store.iter_rows(START, START + 1000, 8)]
+        assert all(len(chunk) <= 8 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == 50
+
+    def test_blocks_split_at_day_boundary(self, tmp_path):
+        """Test samples spanning midnight land in two day files."""
+        store = FoxEnergySampleStore(tmp_path, KEYS, block_size=100)
+        for index in range(4):
+            store.append(START - 10 + index * 5, {"moc_czynna": 1.0})
+        store.write_block(store.take_pending())
+
+        assert sorted(file.name for file in tmp_path.iterdir()) == [
+            "2025-12-31.fxs",
+            "2026-01-01.fxs",
+        ]
+
+
+class TestExport:
+    """Tests for sample export."""
+
+    def test_export_csv(self, tmp_path):
+        """Test CSV export merges columns of several meters."""
+        store_1 = FoxEnergySampleStore(tmp_path / "a", KEYS)
+        store_2 = FoxEnergySampleStore(tmp_path / "b", ["moc_czynna"])
+        fill_store(store_1, 3)
+        fill_store(store_2, 2)
+
+        output = tmp_path / "export.csv"
+        result = export_samples(
+            [("10.0.0.1", store_1), ("10.0.0.2", store_2)],
+            START,
+            START + 3600,
+            output,
+        )
+
+        assert result["rows"] == 5
+        with open(output, newline="") as handle:
+            rows = list(csv.reader(handle))
+        assert rows[0] == ["time", "host", "moc_czynna", "napiecie"]
+        assert rows[1] == ["2026-01-01T00:00:00+00:00", "10.0.0.1", "0.0", "230.0"]
+        assert rows[4] == ["2026-01-01T00:00:00+00:00", "10.0.0.2", "0.0", ""]
+
+    def test_export_unknown_format(self, tmp_path):
+        """Test unsupported formats are rejected."""
+        store = FoxEnergySampleStore(tmp_path, KEYS)
+        with pytest.raises(FoxEnergyExportError):
+            export_samples(
+                [("10.0.0.1", store)], START, START + 1, tmp_path / "x", "xls"
+            )
+
+    def test_export_parquet(self, tmp_path):
+        """Test Parquet export round-trips times, hosts and missing values."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        store_1 = FoxEnergySampleStore(tmp_path / "a", KEYS)
+        store_2 = FoxEnergySampleStore(tmp_path / "b", ["moc_czynna"])
+        fill_store(store_1, 3)
+        fill_store(store_2, 2)
+
+        output = tmp_path / "export.parquet"
+        result = export_samples(
+            [("10.0.0.1", store_1), ("10.0.0.2", store_2)],
+            START,
+            START + 3600,
+            output,
+            "parquet",
+        )
+
+        table = pq.read_table(output)
+        assert result["rows"] == table.num_rows == 5
+        assert table.column_names == ["time", "host", "moc_czynna", "napiecie"]
+        rows = table.to_pylist()
+        assert rows[1]["time"].timestamp() == START + 5
+        assert rows[1]["host"] == "10.0.0.1"
+        assert rows[1]["moc_czynna"] == 1.0
+        assert rows[4] == {
+            "time": rows[1]["time"],
+            "host": "10.0.0.2",
+            "moc_czynna": 1.0,
+            "napiecie": None,
+        }
+
+    @pytest.mark.benchmark
+    def test_export_throughput(self, tmp_path):
+        """Benchmark CSV export rows per second."""
+        store = FoxEnergySampleStore(tmp_path / "meter", KEYS, block_size=720)
+        fill_store(store, 100_000, interval=1)
+
+        result = export_samples(
+            [("10.0.0.1", store)], START, START + 100_000, tmp_path / "bench.csv"
+        )
+
+        assert result["rows"] == 100_000
+        assert result["rows_per_second"] > 20_000
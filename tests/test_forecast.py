@@ -0,0 +1,168 @@
+"""Tests for Fox Energy energy forecast."""
+
+import json
+import random
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.fox_energy.forecast import (
+    FORECAST_NEXT_DAY_KEY,
+    FORECAST_NEXT_HOUR_KEY,
+    FORECAST_REFIT_HOURS,
+    HOURS_PER_WEEK,
+    ForecastModel,
+    ForecastParameters,
+    FoxEnergyForecast,
+    fit_parameters,
+)
+
+WARSAW = ZoneInfo("Europe/Warsaw")
+# Monday 2026-03-02 00:00 local
+START = datetime(2026, 3, 2, tzinfo=WARSAW).timestamp()
+
+
+def _pattern(hour):
+    """Return the energy of an hour of the week: evening peaks, weekend base."""
+    day, hour_of_day = divmod(hour, 24)
+    base = 0.6 if day >= 5 else 0.3
+    return base + (1.5 if 17 <= hour_of_day < 21 else 0.0)
+
+
+def _feed(forecast, hours, energy=_pattern, start=START, step=300):
+    """Feed counter readings every step seconds for a number of hours."""
+    reading = 1000.0
+    for hour in range(hours):
+        hour_energy = energy(hour % HOURS_PER_WEEK)
+        for index in range(3600 // step):
+            forecast.add(start + hour * 3600 + index * step, reading)
+            reading += hour_energy * step / 3600
+    return reading
+
+
+def test_model_learns_weekly_profile():
+    """Test the profile converges to a repeating weekly pattern."""
+    model = ForecastModel(ForecastParameters())
+
+    for hour in range(3 * HOURS_PER_WEEK):
+        model.update(hour % HOURS_PER_WEEK, _pattern(hour % HOURS_PER_WEEK))
+
+    for hour in (3, 18, 5 * 24 + 3, 6 * 24 + 19):
+        assert model.predict(hour) == pytest.approx(_pattern(hour), abs=1e-6)
+
+
+def test_level_follows_recent_deviation():
+    """Test a run of higher hours raises the forecast, decaying further ahead."""
+    model = ForecastModel(ForecastParameters())
+    for hour in range(HOURS_PER_WEEK):
+        model.update(hour, 0.5)
+
+    for hour in range(6):
+        model.update(hour, 1.5)
+
+    assert model.predict(6, ahead=1) > 1.0
+    assert 0.5 < model.predict(30, ahead=24) < model.predict(6, ahead=1)
+
+
+def test_hours_from_counter_readings():
+    """Test hourly energy is taken from the counter at every full hour."""
+    forecast = FoxEnergyForecast(WARSAW)
+
+    _feed(forecast, 2 * HOURS_PER_WEEK + 1)
+
+    # Two weeks completed, now in the first hour of the third Monday
+    assert [entry[1] for entry in list(forecast.history)[:3]] == [
+        pytest.approx(0.3),
+        pytest.approx(0.3),
+        pytest.approx(0.3),
+    ]
+    assert forecast.history[0][0] == 0
+    values = forecast.values()
+    assert values[FORECAST_NEXT_HOUR_KEY] == pytest.approx(_pattern(1), abs=0.01)
+    assert values[FORECAST_NEXT_DAY_KEY] == pytest.approx(
+        sum(_pattern(hour) for hour in range(1, 25)), abs=0.05
+    )
+
+
+def test_gaps_and_counter_resets_skipped():
+    """Test hours missed entirely or with a reset counter are not learned."""
+    forecast = FoxEnergyForecast(WARSAW)
+
+    assert not forecast.add(START, 100.0)
+    assert forecast.add(START + 3600, 101.0)
+    # Three hours later: the energy spans several hours
+    assert not forecast.add(START + 4 * 3600, 110.0)
+    # Counter replaced: taken as reset once it stays lower for an hour
+    assert not forecast.add(START + 5 * 3600, 0.5)
+    assert not forecast.add(START + 6 * 3600, 1.0)
+    assert forecast.add(START + 7 * 3600, 1.5)
+
+    assert list(forecast.history) == [(0, 1.0), (6, 0.5)]
+
+
+def test_bad_readings_skipped():
+    """Test zero, backwards and impossible readings never anchor an hour."""
+    forecast = FoxEnergyForecast(WARSAW)
+    forecast.add(START, 100.0)
+
+    # Zero at the hour boundary, then the counter again
+    assert not forecast.add(START + 3600, 0.0)
+    assert forecast.add(START + 3600 + 300, 100.5)
+    # Impossible jump, then a reading going backwards
+    assert not forecast.add(START + 2 * 3600, 99_999.0)
+    assert not forecast.add(START + 2 * 3600 + 300, 99.0)
+    assert forecast.add(START + 2 * 3600 + 600, 101.0)
+
+    assert list(forecast.history) == [(0, 0.5), (1, 0.5)]
+
+
+def test_persisted_state_round_trip():
+    """Test the state survives JSON persistence and stays compact."""
+    forecast = FoxEnergyForecast(WARSAW, ForecastParameters(0.1, 0.3, 0.9))
+    _feed(forecast, 5 * HOURS_PER_WEEK, step=900)
+
+    stored = json.dumps(forecast.as_dict())
+    restored = FoxEnergyForecast(WARSAW)
+    restored.restore(json.loads(stored))
+
+    assert len(stored) < 32 * 1024
+    assert restored.model.parameters == ForecastParameters(0.1, 0.3, 0.9)
+    assert restored.model.profile == pytest.approx(forecast.model.profile, abs=1e-4)
+    assert list(restored.history) == list(forecast.history)
+    assert restored.values() == pytest.approx(forecast.values(), abs=1e-3)
+
+
+def test_refit_improves_error():
+    """Test the refit picks factors at least as good as the defaults."""
+    rng = random.Random(4)
+    history = [
+        (hour % HOURS_PER_WEEK, _pattern(hour % HOURS_PER_WEEK) * rng.uniform(0.5, 1.5))
+        for hour in range(3 * HOURS_PER_WEEK)
+    ]
+
+    def error(parameters):
+        model = ForecastModel(parameters)
+        total = 0.0
+        for index, (hour, energy) in enumerate(history):
+            if index >= HOURS_PER_WEEK:
+                total += (model.predict(hour) - energy) ** 2
+            model.update(hour, energy)
+        return total
+
+    fitted = fit_parameters(history)
+
+    assert error(fitted) <= error(ForecastParameters())
+
+
+def test_refit_due():
+    """Test a refit is due daily once two weeks of hours are kept."""
+    forecast = FoxEnergyForecast(WARSAW)
+    _feed(forecast, 2 * HOURS_PER_WEEK, step=1800)
+    assert not forecast.refit_due
+
+    _feed(forecast, FORECAST_REFIT_HOURS + 2, start=START + 2 * HOURS_PER_WEEK * 3600)
+    assert forecast.refit_due
+
+    forecast.set_parameters(ForecastParameters())
+    assert not forecast.refit_due
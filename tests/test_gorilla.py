@@ -0,0 +1,139 @@
+"""Tests for Fox Energy compressed sample storage."""
+
+import math
+import random
+import time
+
+import pytest
+
+from custom_components.fox_energy.gorilla import (
+    ENCODING_DECIMAL,
+    ENCODING_XOR,
+    decode_column,
+    decode_floats,
+    decode_ints,
+    encode_column,
+    encode_floats,
+    encode_ints,
+)
+from custom_components.fox_energy.store import FoxEnergySampleStore
+
+START = 1_767_225_600  # 2026-01-01 00:00:00 UTC
+DAY = 86400
+KEYS = ["moc_czynna", "napiecie", "energia_pobrana", "cos_phi"]
+
+
+def _sample(rnd, energy):
+    """Return a noisy single-phase sample."""
+    power = max(0.0, 300 + rnd.gauss(0, 50))
+    return {
+        "moc_czynna": round(power, 1),
+        "napiecie": round(230 + rnd.gauss(0, 1.5), 1),
+        "energia_pobrana": round(energy + power * 5 / 3_600_000, 3),
+        "cos_phi": round(rnd.uniform(-1, 1), 2),
+    }
+
+
+class TestCodecs:
+    """Tests for column codecs."""
+
+    def test_ints_roundtrip(self):
+        """Test regular, irregular and extreme integer series."""
+        rnd = random.Random(1)
+        series = [
+            [START * 1000 + 5000 * index for index in range(200)],
+            [rnd.randrange(-(2**40), 2**40) for _ in range(200)],
+            [0, 2**60, -(2**60), 7],
+            [42],
+        ]
+        for values in series:
+            assert decode_ints(encode_ints(values), len(values)) == values
+
+    def test_regular_timestamps_compress(self):
+        """Test evenly spaced timestamps take about one bit each."""
+        values = [START * 1000 + 5000 * index for index in range(120)]
+        assert len(encode_ints(values)) < 8 + 2 + 120 // 8 + 2
+
+    def test_floats_roundtrip(self):
+        """Test floats, repeats and NaN survive bit-exact."""
+        rnd = random.Random(2)
+        values = [rnd.uniform(-1e6, 1e6) for _ in range(100)]
+        values += [1.5] * 10 + [math.nan, -0.0, math.inf, 5e-324]
+
+        decoded = decode_floats(encode_floats(values), len(values))
+
+        assert [repr(value) for value in decoded] == [repr(value) for value in values]
+
+    def test_column_encoding_choice(self):
+        """Test decimal columns use integer encoding, others XOR."""
+        decimal = [230.1, 230.2, 229.9, 0.05]
+        arbitrary = [math.pi, math.e, 1 / 3]
+        missing = [1.0, None, 2.0]
+
+        assert encode_column(decimal)[0] == ENCODING_DECIMAL
+        assert encode_column(arbitrary)[0] == ENCODING_XOR
+        for values in (decimal, arbitrary, missing):
+            assert decode_column(encode_column(values), len(values)) == values
+
+
+class TestCompressedStore:
+    """Tests for the compressed sample store."""
+
+    def test_projection_and_value_filter(self, tmp_path):
+        """Test column projection and block skipping by value range."""
+        store = FoxEnergySampleStore(tmp_path, KEYS, block_size=10)
+        for index in range(100):
+            block = store.append(START + index * 5, {"moc_czynna": float(index)})
+            if block:
+                store.write_block(block)
+
+        chunks = list(
+            store.iter_rows(
+                START,
+                START + DAY,
+                keys=["moc_czynna"],
+                where={"moc_czynna": (95, None)},
+            )
+        )
+
+        assert chunks == [
+            (["moc_czynna"], [[START + i * 5, float(i)] for i in range(95, 100)])
+        ]
+
+
+def _fill_day(path):
+    """Store one day of 5 s samples and return the store and sample count."""
+    rnd = random.Random(3)
+    store = FoxEnergySampleStore(path, KEYS)
+    energy = 4951.294
+    count = DAY // 5
+    for index in range(count):
+        sample = _sample(rnd, energy)
+        energy = sample["energia_pobrana"]
+        block = store.append(START + index * 5, sample)
+        if block:
+            store.write_block(block)
+    store.write_block(store.take_pending())
+    return store, count
+
+
+def test_day_size(tmp_path):
+    """Test one day of 5 s samples takes less than 3 bytes per value."""
+    _store, count = _fill_day(tmp_path)
+
+    size = sum(file.stat().st_size for file in tmp_path.iterdir())
+
+    assert size / (count * len(KEYS)) < 3
+
+
+@pytest.mark.benchmark
+def test_day_query_benchmark(tmp_path):
+    """Benchmark reading one day of 5 s samples."""
+    store, count = _fill_day(tmp_path)
+
+    start = time.perf_counter()
+    rows = sum(len(chunk) for _keys, chunk in store.iter_rows(START, START + DAY))
+    seconds = time.perf_counter() - start
+
+    assert rows == count
+    assert seconds < 1
@@ -0,0 +1,144 @@
+"""Memory budget tests for Fox Energy integration."""
+
+import gc
+import importlib
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.fox_energy.api import FoxEnergyAPI, FoxEnergyDataProcessor
+from custom_components.fox_energy.errors import FoxEnergyErrorTracker
+from custom_components.fox_energy.rollups import FoxEnergyHourlyRollup
+
+METERS = 500
+# Per-meter ceiling for the API client, error tracker, rollup and one sample
+MAX_BYTES_PER_METER = 12 * 1024
+# Per-entity ceiling for a sensor built from a shared description: its
+# instance state and unique ID
+MAX_BYTES_PER_ENTITY = 512
+
+
+@dataclass(frozen=True, kw_only=True)
+class _SensorEntityDescription:
+    """Frozen description like Home Assistant's."""
+
+    key: str
+    name: str | None = None
+    native_unit_of_measurement: str | None = None
+    device_class: Any = None
+    state_class: Any = None
+    icon: str | None = None
+
+
+class _CoordinatorEntity:
+    """Coordinator entity holding only its coordinator, like Home Assistant's."""
+
+    def __class_getitem__(cls, coordinator_type: Any) -> type:
+        return cls
+
+    def __init__(self, coordinator: Any):
+        self.coordinator = coordinator
+
+
+class _SensorEntity:
+    """Sensor entity without instance state of its own."""
+
+
+@pytest.fixture
+def sensor_module(monkeypatch):
+    """Import the sensor platform on real base classes instead of mocks."""
+    sensor = sys.modules["homeassistant.components.sensor"]
+    monkeypatch.setattr(sensor, "SensorEntity", _SensorEntity)
+    monkeypatch.setattr(sensor, "SensorEntityDescription", _SensorEntityDescription)
+    monkeypatch.setattr(sensor, "SensorDeviceClass", str)
+    monkeypatch.setattr(sensor, "SensorStateClass", str)
+    monkeypatch.setattr(
+        sys.modules["homeassistant.helpers.update_coordinator"],
+        "CoordinatorEntity",
+        _CoordinatorEntity,
+    )
+    # Fresh modules built on these classes, dropped again afterwards
+    package = importlib.import_module("custom_components.fox_energy")
+    for name in ("entity", "sensor"):
+        monkeypatch.setitem(sys.modules, f"{package.__name__}.{name}", None)
+        del sys.modules[f"{package.__name__}.{name}"]
+        monkeypatch.setattr(package, name, None, raising=False)
+        delattr(package, name)
+    return importlib.import_module(f"{package.__name__}.sensor")
+
+
+def test_memory_per_meter(mock_3phase_current, mock_3phase_energy):
+    """Test the per-meter footprint of 500 simulated meters stays bounded."""
+    keys = list(
+        FoxEnergyDataProcessor.process_3phase_data(
+            mock_3phase_current, mock_3phase_energy
+        )
+    )
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        meters = []
+        for index in range(METERS):
+            host = f"192.168.{index // 250}.{index % 250 + 1}"
+            data = FoxEnergyDataProcessor.process_3phase_data(
+                mock_3phase_current, mock_3phase_energy
+            )
+            rollup = FoxEnergyHourlyRollup(keys, [])
+            rollup.add(0, data)
+            meters.append(
+                (FoxEnergyAPI(host), FoxEnergyErrorTracker(host), rollup, data)
+            )
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    assert len(meters) == METERS
+    assert allocated / METERS < MAX_BYTES_PER_METER
+
+
+def test_memory_per_entity(sensor_module):
+    """Test sensors of 500 meters share descriptions and stay small."""
+    descriptions = sensor_module.SENSOR_DESCRIPTIONS_3PHASE
+    coordinators = [
+        SimpleNamespace(host=f"192.168.{index // 250}.{index % 250 + 1}")
+        for index in range(METERS)
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        entities = [
+            sensor_module.FoxEnergySensor(coordinator, description)
+            for coordinator in coordinators
+            for description in descriptions
+        ]
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    assert len(entities) == METERS * len(descriptions)
+    assert allocated / len(entities) < MAX_BYTES_PER_ENTITY
+    # Static attributes live in the shared description, not in the entity
+    assert all(
+        entity.entity_description is descriptions[index % len(descriptions)]
+        for index, entity in enumerate(entities)
+    )
+    assert set(vars(entities[0])) == {
+        "coordinator",
+        "sensor_key",
+        "entity_description",
+        "_attr_unique_id",
+    }
@@ -0,0 +1,244 @@
+"""Tests for the Fox Energy worker pool pipeline."""
+
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from custom_components.fox_energy.api import FoxEnergyDataProcessor
+from custom_components.fox_energy.pipeline import (
+    LOOP_BUDGET,
+    FoxEnergyPipeline,
+    FoxEnergyWorkerPool,
+    LoopTimeStats,
+)
+
+START = 1_767_225_600  # 2026-01-01 00:00:00 UTC
+
+
+async def test_batches_in_order_with_results_on_loop():
+    """Test batches run in order in workers and results arrive on the loop."""
+    loop = asyncio.get_running_loop()
+    pool = FoxEnergyWorkerPool(loop)
+    processed = []
+    results = []
+
+    def process(batch):
+        processed.append((threading.current_thread().name, batch))
+        return len(batch)
+
+    def done(result):
+        assert threading.current_thread() is threading.main_thread()
+        results.append(result)
+
+    pipeline = FoxEnergyPipeline(pool, process, done, batch_size=3)
+    for index in range(8):
+        pipeline.add(START + index, {"index": index})
+    await pipeline.async_flush()
+
+    # Samples added while the first batch was in flight form the next one
+    assert [[data["index"] for _, data in batch] for _, batch in processed] == [
+        [0, 1, 2],
+        [3, 4, 5, 6, 7],
+    ]
+    assert all(name.startswith("fox_energy_worker") for name, _ in processed)
+    assert results == [3, 5]
+    assert pool.pending == 0
+
+
+async def test_backpressure():
+    """Test a saturated pool refuses work and meters keep a bounded backlog."""
+    loop = asyncio.get_running_loop()
+    pool = FoxEnergyWorkerPool(loop, max_workers=1, max_pending=1)
+    release = threading.Event()
+    processed = []
+
+    def process(batch):
+        release.wait(5)
+        processed.extend(timestamp for timestamp, _ in batch)
+
+    busy = FoxEnergyPipeline(pool, process, batch_size=1)
+    blocked = FoxEnergyPipeline(pool, process, batch_size=2, max_backlog=5)
+
+    busy.add(START, {})
+    for index in range(10):
+        blocked.add(START + 1 + index, {})
+
+    assert pool.rejected == 9
+    assert blocked.dropped_samples == 5
+    assert blocked.as_dict()["queued_samples"] == 5
+
+    release.set()
+    await busy.async_flush()
+    await blocked.async_flush()
+
+    # The newest samples were kept
+    assert processed == [START, *range(START + 6, START + 11)]
+
+
+async def test_worker_errors_logged(caplog):
+    """Test a failing batch is logged and later batches still run."""
+    loop = asyncio.get_running_loop()
+    pool = FoxEnergyWorkerPool(loop)
+    results = []
+
+    def process(batch):
+        if batch[0][0] == START:
+            raise ValueError("broken")
+        return batch[0][0]
+
+    pipeline = FoxEnergyPipeline(pool, process, results.append, batch_size=1)
+    pipeline.add(START, {})
+    await pipeline.async_flush()
+    pipeline.add(START + 1, {})
+    await pipeline.async_flush()
+
+    assert results == [START + 1]
+    assert "Error processing samples" in caplog.text
+
+
+async def test_shutdown():
+    """Test shutdown finishes queued batches and later ones are not processed."""
+    loop = asyncio.get_running_loop()
+    pool = FoxEnergyWorkerPool(loop)
+    processed = []
+    pipeline = FoxEnergyPipeline(pool, processed.extend, batch_size=1)
+
+    pipeline.add(START, {})
+    await loop.run_in_executor(None, pool.shutdown)
+    pipeline.add(START + 1, {})
+    await asyncio.wait_for(pipeline.async_flush(), 1)
+
+    assert processed == [(START, {})]
+    assert pool.submitted == 1
+    assert pipeline.as_dict()["queued_samples"] == 1
+
+
+def test_loop_time_stats():
+    """Test loop times are summarized against the budget."""
+    stats = LoopTimeStats(budget=0.001)
+    for seconds in (0.0002, 0.0004, 0.003):
+        stats.add(seconds)
+
+    assert stats.as_dict() == {
+        "budget_ms": 1.0,
+        "mean_ms": 1.2,
+        "max_ms": 3.0,
+        "over_budget": 1,
+    }
+
+
+async def _run_meters(
+    coordinator_module, hass, tmp_path, sample, meters, polls, start
+) -> list:
+    """Publish polls of many meters with every analytics stage enabled.
+
+    Returns:
+        The coordinators, their worker pool already shut down
+    """
+    pool = FoxEnergyWorkerPool(hass.loop)
+    rng = random.Random(5)
+    coordinators = []
+    for meter in range(meters):
+        coordinator = coordinator_module.FoxEnergyCoordinator(
+            hass,
+            f"192.168.{meter // 250}.{meter % 250 + 1}",
+            worker_pool=pool,
+            sample_store_path=tmp_path / str(meter),
+            external_statistics=True,
+            tariff="G12",
+            demand_tracking=True,
+            demand_threshold=10000,
+            alarm_settings={"fuse_rating": 25, "undervoltage": 207},
+            energy_forecast=True,
+            step_threshold=100,
+        )
+        coordinator.device_type = "3phase"
+        coordinator.async_add_sample_listener(lambda timestamp, data: None)
+        coordinators.append(coordinator)
+
+    energy = {key: sample[key] for key in coordinators[0].energy_keys}
+    for poll in range(polls):
+        timestamp = start + poll * 5
+        for key in energy:
+            energy[key] += 0.01
+        for coordinator in coordinators:
+            data = dict(sample)
+            data.update(energy)
+            data["moc_czynna_suma"] = round(rng.uniform(0, 5000), 1)
+            coordinator._publish_sample(timestamp, data)
+            # Polls of different meters are separate loop iterations
+            await asyncio.sleep(0)
+    for coordinator in coordinators:
+        await coordinator.async_flush_samples()
+    await hass.async_add_executor_job(pool.shutdown)
+    return coordinators
+
+
+def _loop_time(coordinators) -> LoopTimeStats:
+    """Combine the loop time statistics of the coordinators."""
+    stats = LoopTimeStats()
+    for coordinator in coordinators:
+        stats.count += coordinator.loop_time.count
+        stats.total += coordinator.loop_time.total
+        stats.max = max(stats.max, coordinator.loop_time.max)
+        stats.over_budget += coordinator.loop_time.over_budget
+    return stats
+
+
+async def test_loop_budget_many_meters(
+    coordinator_module, hass, tmp_path, mock_3phase_current, mock_3phase_energy
+):
+    """Test loop time per sample stays in budget with many meters.
+
+    Every meter runs tariff, demand, forecast, alarm and step analytics and
+    listeners on the loop and stores samples in the worker pool. The limits
+    leave headroom for slow machines.
+    """
+    sample = FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+    meters, polls = 50, 20
+
+    coordinators = await _run_meters(
+        coordinator_module, hass, tmp_path, sample, meters, polls, START
+    )
+
+    stats = _loop_time(coordinators)
+    assert stats.count == meters * polls
+    assert stats.total / stats.count < LOOP_BUDGET / 2
+    # 99% of the samples within the budget
+    assert stats.over_budget <= stats.count * 0.01
+    assert all(c.tariff_counters and c.demand and c.forecast for c in coordinators)
+    assert sum(c.pipeline.dropped_samples for c in coordinators) == 0
+
+
+@pytest.mark.benchmark
+async def test_loop_budget_benchmark(
+    coordinator_module, hass, tmp_path, mock_3phase_current, mock_3phase_energy
+):
+    """Test the loop budget with a large fleet storing samples for minutes."""
+    sample = FoxEnergyDataProcessor.process_3phase_data(
+        mock_3phase_current, mock_3phase_energy
+    )
+    meters, polls = 500, 60
+    # Recent samples, older ones are pruned from the store
+    start = time.time() // 3600 * 3600
+
+    coordinators = await _run_meters(
+        coordinator_module, hass, tmp_path, sample, meters, polls, start
+    )
+
+    stats = _loop_time(coordinators)
+    assert stats.total / stats.count < LOOP_BUDGET / 4
+    # Allow some samples delayed by the workers holding the GIL
+    assert stats.over_budget <= stats.count * 0.005
+    assert sum(c.pipeline.dropped_samples for c in coordinators) == 0
+    rows = sum(
+        len(chunk)
+        for coordinator in coordinators
+        for _, chunk in coordinator.sample_store.iter_rows(start, start + polls * 5)
+    )
+    assert rows == meters * polls
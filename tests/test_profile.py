@@ -0,0 +1,101 @@
+"""Tests for Fox Energy update path profiling."""
+
+import pstats
+
+import pytest
+
+from custom_components.fox_energy import api as api_module
+from custom_components.fox_energy.api import FoxEnergyAPI, FoxEnergyDataProcessor
+from custom_components.fox_energy.profile import (
+    STAGE_ENDPOINT,
+    STAGE_JSON_DECODE,
+    STAGE_PROCESS,
+    STAGE_STATE_WRITE,
+    STAGE_UPDATE,
+    FoxEnergyProfiler,
+)
+
+
+class _Coordinator:
+    """Minimal stand-in for the coordinator update path."""
+
+    def __init__(self, body):
+        self.api = FoxEnergyAPI("192.168.1.100", cache_ttl=0)
+        self.body = body
+        self.writes = 0
+
+        async def request(endpoint):
+            return api_module.decode_json(self.body)
+
+        self.api._request = request
+
+    async def _async_update_data(self):
+        current = await self.api.get_current_parameters()
+        return FoxEnergyDataProcessor.process_3phase_data(
+            current, None, {"napiecie_l1", "cos_phi_l1"}
+        )
+
+    def async_update_listeners(self):
+        self.writes += 1
+
+    async def async_refresh(self):
+        await self._async_update_data()
+        self.async_update_listeners()
+
+
+@pytest.fixture
+def body():
+    """Return the raw 3-phase current parameters response."""
+    with open("tests/fixtures/3phase_current.json", "rb") as handle:
+        return handle.read()
+
+
+class TestFoxEnergyProfiler:
+    """Tests for FoxEnergyProfiler class."""
+
+    @pytest.mark.asyncio
+    async def test_stages_timed(self, body, tmp_path):
+        """Test every stage is timed and the profile can be loaded."""
+        coordinators = [_Coordinator(body) for _ in range(3)]
+        profiler = FoxEnergyProfiler()
+
+        profiler.start(coordinators)
+        try:
+            for coordinator in coordinators:
+                for _ in range(4):
+                    await coordinator.async_refresh()
+        finally:
+            profiler.stop()
+
+        summary = profiler.summary()
+        stages = summary["stages"]
+        for stage in (STAGE_UPDATE, STAGE_ENDPOINT, STAGE_JSON_DECODE, STAGE_PROCESS):
+            assert stages[stage]["calls"] == 12
+        assert stages[STAGE_STATE_WRITE]["calls"] == 12
+        assert coordinators[0].writes == 4
+        assert summary["top"]
+
+        profiler.dump(tmp_path / "profile.pstats")
+        assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0
+
+    @pytest.mark.asyncio
+    async def test_wrappers_removed(self, body):
+        """Test the update path is unmodified once profiling stops."""
+        coordinator = _Coordinator(body)
+        process = FoxEnergyDataProcessor.__dict__["process_3phase_data"]
+        decode = api_module.decode_json
+        profiler = FoxEnergyProfiler()
+
+        profiler.start([coordinator])
+        assert "_async_update_data" in vars(coordinator)
+        assert api_module.decode_json is not decode
+        profiler.stop()
+
+        assert "_async_update_data" not in vars(coordinator)
+        assert "async_update_listeners" not in vars(coordinator)
+        assert "_get_endpoint" not in vars(coordinator.api)
+        assert FoxEnergyDataProcessor.__dict__["process_3phase_data"] is process
+        assert api_module.decode_json is decode
+
+        await coordinator.async_refresh()
+        assert profiler.stages == {}
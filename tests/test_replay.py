@@ -0,0 +1,154 @@
+"""Tests for Fox Energy capture and replay."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.fox_energy.api import (
+    FoxEnergyAPI,
+    FoxEnergyConnectionError,
+    FoxEnergyDataProcessor,
+)
+from custom_components.fox_energy.capture import (
+    CaptureRecord,
+    FoxEnergyCapture,
+    read_capture,
+)
+from custom_components.fox_energy.const import (
+    ENDPOINT_CURRENT_PARAMETERS,
+    ENDPOINT_TOTAL_ENERGY,
+)
+from custom_components.fox_energy.replay import (
+    FoxEnergyReplayAPI,
+    ReplayFrame,
+    async_replay,
+    iter_frames,
+)
+
+
+def _records(current, energy, count=3, interval=1.0):
+    """Build captured responses of count polls."""
+    records = []
+    for index in range(count):
+        timestamp = 1_700_000_000 + index * interval
+        records.append(
+            CaptureRecord(timestamp, ENDPOINT_CURRENT_PARAMETERS, 0.05, current)
+        )
+        records.append(
+            CaptureRecord(timestamp + 0.01, ENDPOINT_TOTAL_ENERGY, 0.04, energy)
+        )
+    return records
+
+
+class TestFoxEnergyCapture:
+    """Tests for FoxEnergyCapture class."""
+
+    @pytest.mark.asyncio
+    async def test_api_records_responses(self, tmp_path, mock_3phase_current):
+        """Test an attached capture records every fetched response."""
+        api = FoxEnergyAPI("192.168.1.100", cache_ttl=0)
+        api.capture = FoxEnergyCapture(tmp_path / "capture.jsonl.gz")
+
+        with patch.object(api, "_request", AsyncMock(return_value=mock_3phase_current)):
+            await api.get_current_parameters()
+            await api.get_current_parameters()
+            api.capture, capture = None, api.capture
+            await api.get_current_parameters()
+
+        records = capture.take_pending()
+        assert capture.count == 2
+        assert [record.endpoint for record in records] == [
+            ENDPOINT_CURRENT_PARAMETERS
+        ] * 2
+        assert records[0].data == mock_3phase_current
+
+    def test_write_read_roundtrip(self, tmp_path, mock_1phase_current):
+        """Test written responses read back unchanged across writes."""
+        capture = FoxEnergyCapture(tmp_path / "meter" / "capture.jsonl.gz")
+        capture.record(ENDPOINT_CURRENT_PARAMETERS, mock_1phase_current, 0.1)
+        capture.write(capture.take_pending())
+        capture.record(ENDPOINT_CURRENT_PARAMETERS, mock_1phase_current, 0.2)
+        capture.write(capture.take_pending())
+
+        records = list(read_capture(capture.path))
+
+        assert len(records) == 2
+        assert records[0].data == mock_1phase_current
+        assert records[1].latency == 0.2
+        assert records[0].timestamp <= records[1].timestamp
+
+
+class TestReplay:
+    """Tests for replay helpers."""
+
+    def test_iter_frames(self, mock_3phase_current, mock_3phase_energy):
+        """Test responses are grouped into one frame per poll."""
+        frames = list(
+            iter_frames(_records(mock_3phase_current, mock_3phase_energy, count=3))
+        )
+
+        assert len(frames) == 3
+        assert frames[1].timestamp == 1_700_000_001
+        assert set(frames[0].responses) == {
+            ENDPOINT_CURRENT_PARAMETERS,
+            ENDPOINT_TOTAL_ENERGY,
+        }
+
+    @pytest.mark.asyncio
+    async def test_replay_api_missing_endpoint(self, mock_3phase_current):
+        """Test an endpoint missing from the frame fails like a meter error."""
+        api = FoxEnergyReplayAPI("192.168.1.100")
+        api.frame = ReplayFrame(0.0, {ENDPOINT_CURRENT_PARAMETERS: mock_3phase_current})
+
+        assert await api.detect_device_type() == "3phase"
+        with pytest.raises(FoxEnergyConnectionError):
+            await api.get_total_energy()
+
+    @pytest.mark.asyncio
+    async def test_replay_through_processor(
+        self, tmp_path, mock_3phase_current, mock_3phase_energy
+    ):
+        """Test captured payloads replay through the processor unchanged."""
+        capture = FoxEnergyCapture(tmp_path / "capture.jsonl.gz")
+        capture.write(_records(mock_3phase_current, mock_3phase_energy, count=50))
+
+        api = FoxEnergyReplayAPI("192.168.1.100")
+        samples = []
+
+        async def poll(timestamp):
+            current, energy = await asyncio.gather(
+                api.get_current_parameters(), api.get_total_energy()
+            )
+            samples.append(
+                (timestamp, FoxEnergyDataProcessor.process_3phase_data(current, energy))
+            )
+
+        result = await async_replay(
+            iter_frames(read_capture(capture.path)), api, poll, speed=None
+        )
+
+        assert result["frames"] == 50
+        assert len(samples) == 50
+        assert samples[-1][0] == 1_700_000_049
+        assert samples[0][1]["cos_phi_l1"] == -0.75
+        assert samples[0][1]["energia_pobrana_l1"] == 4951.294
+        assert api.request_count == 100
+
+    @pytest.mark.asyncio
+    async def test_replay_paced(self, mock_1phase_current, mock_1phase_energy):
+        """Test replay keeps the captured spacing scaled by speed."""
+        api = FoxEnergyReplayAPI("192.168.1.100")
+        frames = list(
+            iter_frames(
+                _records(mock_1phase_current, mock_1phase_energy, count=3, interval=1)
+            )
+        )
+
+        start = time.monotonic()
+        result = await async_replay(frames, api, AsyncMock(), speed=20)
+
+        # Two intervals of 1 s at 20x
+        assert time.monotonic() - start >= 0.09
+        assert result["frames"] == 3
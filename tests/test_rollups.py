@@ -0,0 +1,45 @@
+"""Tests for Fox Energy hourly rollups."""
+
+import pytest
+
+from custom_components.fox_energy.rollups import FoxEnergyHourlyRollup
+
+HOUR_START = 1_767_225_600  # 2026-01-01 00:00:00 UTC
+
+
+class TestFoxEnergyHourlyRollup:
+    """Tests for FoxEnergyHourlyRollup class."""
+
+    def test_rollup_on_hour_change(self):
+        """Test an hour is emitted when the first sample of the next arrives."""
+        rollup = FoxEnergyHourlyRollup(["moc_czynna"], ["energia_pobrana"])
+
+        assert (
+            rollup.add(HOUR_START, {"moc_czynna": 100.0, "energia_pobrana": 1.0})
+            is None
+        )
+        assert (
+            rollup.add(HOUR_START + 1800, {"moc_czynna": 300.0, "energia_pobrana": 1.2})
+            is None
+        )
+        result = rollup.add(
+            HOUR_START + 3600, {"moc_czynna": 50.0, "energia_pobrana": 1.3}
+        )
+
+        assert result.start == HOUR_START
+        assert result.measurements["moc_czynna"] == (200.0, 100.0, 300.0)
+        assert result.energy["energia_pobrana"] == 1.2
+
+    def test_missing_values_skipped(self):
+        """Test fields missing from samples do not affect the aggregate."""
+        rollup = FoxEnergyHourlyRollup(["moc_czynna", "cos_phi"], [])
+        rollup.add(HOUR_START, {"moc_czynna": 10.0})
+        rollup.add(HOUR_START + 5, {"moc_czynna": 20.0, "cos_phi": None})
+
+        result = rollup.flush()
+        assert result.measurements == {"moc_czynna": (pytest.approx(15.0), 10.0, 20.0)}
+
+    def test_flush_empty(self):
+        """Test flushing without samples returns nothing."""
+        rollup = FoxEnergyHourlyRollup(["moc_czynna"], [])
+        assert rollup.flush() is None
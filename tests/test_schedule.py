@@ -0,0 +1,20 @@
+"""Tests for Fox Energy poll scheduling."""
+
+from custom_components.fox_energy.schedule import next_aligned_tick
+
+
+class TestNextAlignedTick:
+    """Tests for wall-clock aligned tick scheduling."""
+
+    def test_aligned_to_interval(self):
+        """Test ticks land on exact multiples of the interval."""
+        assert next_aligned_tick(1_700_000_001.3, 5) == 1_700_000_005
+        assert next_aligned_tick(1_700_000_004.999, 5) == 1_700_000_005
+
+    def test_strictly_after_now(self):
+        """Test a tick exactly on a boundary schedules the following one."""
+        assert next_aligned_tick(1_700_000_005, 5) == 1_700_000_010
+
+    def test_sub_second_interval(self):
+        """Test fractional intervals."""
+        assert next_aligned_tick(10.26, 0.5) == 10.5
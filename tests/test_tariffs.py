@@ -0,0 +1,179 @@
+"""Tests for Fox Energy tariff-zone accounting."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.fox_energy.tariffs import (
+    TARIFF_CALENDARS,
+    TARIFF_ZONE_KEY,
+    FoxEnergyTariffCounters,
+    FoxEnergyTariffZones,
+    TariffCalendar,
+    ZoneRule,
+    tariff_sensors,
+)
+
+WARSAW = ZoneInfo("Europe/Warsaw")
+
+
+def _ts(*args: int) -> float:
+    """Return the Unix timestamp of a local Warsaw time."""
+    return datetime(*args, tzinfo=WARSAW).timestamp()
+
+
+def _zones(tariff: str) -> FoxEnergyTariffZones:
+    return FoxEnergyTariffZones(TARIFF_CALENDARS[tariff], WARSAW)
+
+
+class TestTariffZones:
+    """Tests for the zone lookup."""
+
+    def test_g12(self):
+        """Test night hours of G12, weekday or not."""
+        zones = _zones("G12")
+
+        assert zones.zone(_ts(2026, 3, 2, 5, 59)) == "nocna"
+        assert zones.zone(_ts(2026, 3, 2, 6, 0)) == "dzienna"
+        assert zones.zone(_ts(2026, 3, 2, 14, 30)) == "nocna"
+        assert zones.zone(_ts(2026, 3, 7, 12, 0)) == "dzienna"
+        assert zones.zone(_ts(2026, 3, 7, 23, 0)) == "nocna"
+
+    def test_g12w_weekend(self):
+        """Test weekends are off-peak all day in G12w."""
+        zones = _zones("G12w")
+
+        assert zones.zone(_ts(2026, 3, 6, 12, 0)) == "dzienna"
+        assert zones.zone(_ts(2026, 3, 7, 12, 0)) == "nocna"
+        assert zones.zone(_ts(2026, 3, 8, 18, 0)) == "nocna"
+
+    def test_g13_seasons(self):
+        """Test the afternoon peak moves between summer and winter."""
+        zones = _zones("G13")
+
+        assert zones.zone(_ts(2026, 1, 5, 8, 0)) == "szczyt_przedpoludniowy"
+        assert zones.zone(_ts(2026, 1, 5, 17, 0)) == "szczyt_popoludniowy"
+        assert zones.zone(_ts(2026, 1, 5, 21, 30)) == "pozaszczytowa"
+        assert zones.zone(_ts(2026, 7, 6, 17, 0)) == "pozaszczytowa"
+        assert zones.zone(_ts(2026, 7, 6, 21, 30)) == "szczyt_popoludniowy"
+        assert zones.zone(_ts(2026, 7, 4, 8, 0)) == "pozaszczytowa"
+
+    def test_local_time_across_dst(self):
+        """Test hours are local on both sides of a DST change."""
+        zones = _zones("G12")
+
+        # 2026-03-29 02:00 CET becomes 03:00 CEST
+        assert zones.zone(_ts(2026, 3, 29, 1, 59)) == "nocna"
+        assert zones.zone(_ts(2026, 3, 29, 5, 59)) == "nocna"
+        assert zones.zone(_ts(2026, 3, 29, 6, 0)) == "dzienna"
+
+    def test_partial_hours(self):
+        """Test rules starting within an hour."""
+        calendar = TariffCalendar(
+            zones=("a", "b"), default="a", rules=(ZoneRule("b", 21.5, 22),)
+        )
+        zones = FoxEnergyTariffZones(calendar, WARSAW)
+
+        assert zones.zone(_ts(2026, 3, 2, 21, 29)) == "a"
+        assert zones.zone(_ts(2026, 3, 2, 21, 30)) == "b"
+        assert zones.zone(_ts(2026, 3, 2, 22, 0)) == "a"
+
+
+class TestTariffCounters:
+    """Tests for per-zone energy counters."""
+
+    def test_split_by_zone(self):
+        """Test energy deltas land in the zone of their sample."""
+        counters = FoxEnergyTariffCounters(_zones("G12"), ["energia_pobrana"])
+
+        for hour, reading in ((5, 100.0), (5, 100.5), (7, 101.0), (14, 103.0)):
+            data = {"energia_pobrana": reading}
+            counters.add(_ts(2026, 3, 2, hour, 30), data)
+
+        assert data[TARIFF_ZONE_KEY] == "nocna"
+        assert data["energia_pobrana_nocna"] == 2.5
+        assert data["energia_pobrana_dzienna"] == 0.5
+
+    def test_reset_and_missing_readings(self):
+        """Test a sustained large drop restarts accounting and gaps are skipped."""
+        counters = FoxEnergyTariffCounters(_zones("G11"), ["energia_pobrana"])
+        timestamp = _ts(2026, 3, 2, 12, 0)
+
+        assert not counters.add(timestamp, {"energia_pobrana": 50.0})
+        assert counters.add(timestamp, {"energia_pobrana": 51.0})
+        assert not counters.add(timestamp, {"energia_pobrana": None})
+        assert not counters.add(timestamp, {"energia_pobrana": 1.0})
+        assert not counters.add(timestamp, {"energia_pobrana": 1.5})
+        # Third low reading in a row confirms the reset
+        assert counters.add(timestamp, {"energia_pobrana": 2.0})
+
+        assert counters.counters == {"energia_pobrana_calodobowa": 2.0}
+
+    def test_bad_reading_ignored(self):
+        """Test a single zero or lower reading between good ones is not a reset."""
+        counters = FoxEnergyTariffCounters(_zones("G11"), ["energia_pobrana"])
+        timestamp = _ts(2026, 3, 2, 12, 0)
+
+        for reading in (12345.0, 12345.1, 0.0, 12345.2, 12344.9, 12345.3):
+            counters.add(timestamp, {"energia_pobrana": reading})
+
+        assert counters.counters["energia_pobrana_calodobowa"] == pytest.approx(0.3)
+
+    def test_spike_ignored(self):
+        """Test a single implausibly high reading is not counted."""
+        counters = FoxEnergyTariffCounters(_zones("G11"), ["energia_pobrana_suma"])
+        start = _ts(2026, 3, 2, 12, 0)
+        readings = (10000.0, 10000.1, 99999.0, 10000.2, 10000.3, 10000.4, 10000.5)
+
+        for index, reading in enumerate(readings):
+            counters.add(start + 5 * index, {"energia_pobrana_suma": reading})
+
+        assert counters.counters == {
+            "energia_pobrana_suma_calodobowa": pytest.approx(0.5)
+        }
+
+    def test_replaced_meter_higher(self):
+        """Test a sustained jump restarts accounting from its first reading."""
+        counters = FoxEnergyTariffCounters(_zones("G11"), ["energia_pobrana"])
+        start = _ts(2026, 3, 2, 12, 0)
+
+        for index, reading in enumerate((100.0, 100.1, 5000.0, 5000.1, 5000.2)):
+            counters.add(start + 5 * index, {"energia_pobrana": reading})
+
+        assert counters.counters == {"energia_pobrana_calodobowa": pytest.approx(0.3)}
+
+    def test_restore(self):
+        """Test energy used while stopped is counted after a restore."""
+        counters = FoxEnergyTariffCounters(_zones("G12"), ["energia_pobrana"])
+        counters.add(_ts(2026, 3, 2, 12, 0), {"energia_pobrana": 10.0})
+        counters.add(_ts(2026, 3, 2, 12, 5), {"energia_pobrana": 11.0})
+
+        restored = FoxEnergyTariffCounters(_zones("G12"), ["energia_pobrana"])
+        restored.restore(
+            {**counters.as_dict(), "counters": {"old_zone": 5.0, **counters.counters}}
+        )
+        data = {"energia_pobrana": 12.0}
+        restored.add(_ts(2026, 3, 2, 23, 0), data)
+
+        assert "old_zone" not in restored.counters
+        assert data["energia_pobrana_dzienna"] == 1.0
+        assert data["energia_pobrana_nocna"] == 1.0
+
+
+def test_tariff_sensors():
+    """Test one energy sensor per metered key and zone."""
+    energy = {"energia_pobrana_l1": {"name": "Energy Import L1", "unit": "kWh"}}
+
+    sensors = tariff_sensors(TARIFF_CALENDARS["G13"], energy)
+
+    assert list(sensors) == [
+        TARIFF_ZONE_KEY,
+        "energia_pobrana_l1_szczyt_przedpoludniowy",
+        "energia_pobrana_l1_szczyt_popoludniowy",
+        "energia_pobrana_l1_pozaszczytowa",
+    ]
+    assert sensors["energia_pobrana_l1_pozaszczytowa"] == {
+        "name": "Energy Import L1 Off-Peak",
+        "unit": "kWh",
+    }
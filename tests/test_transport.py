@@ -0,0 +1,120 @@
+"""Tests for the Fox Energy keep-alive HTTP transport."""
+
+import time
+
+import pytest
+
+from custom_components.fox_energy.api import (
+    FoxEnergyAPI,
+    FoxEnergyConnectionError,
+    FoxEnergyInvalidResponse,
+)
+from custom_components.fox_energy.const import TRANSPORT_AIOHTTP, TRANSPORT_KEEPALIVE
+from custom_components.fox_energy.transport import FoxEnergyHTTPConnection
+
+from .simulator import MeterSimulator
+
+BENCHMARK_REQUESTS = 300
+
+
+@pytest.fixture
+async def simulator():
+    """Start a 3-phase meter simulator."""
+    meter = MeterSimulator()
+    await meter.start()
+    yield meter
+    await meter.stop()
+
+
+def _api(host: str, transport: str) -> FoxEnergyAPI:
+    """Create an API client without response caching."""
+    return FoxEnergyAPI(host, 5, cache_ttl=0, transport=transport)
+
+
+class TestFoxEnergyHTTPConnection:
+    """Tests for FoxEnergyHTTPConnection class."""
+
+    def test_parse_host_port(self):
+        """Test host and port are split, port 80 by default."""
+        connection = FoxEnergyHTTPConnection("192.168.3.101:8080")
+        assert (connection.host, connection.port) == ("192.168.3.101", 8080)
+
+        connection = FoxEnergyHTTPConnection("192.168.3.101")
+        assert (connection.host, connection.port) == ("192.168.3.101", 80)
+
+    @pytest.mark.asyncio
+    async def test_connection_reused(self, simulator, mock_3phase_current):
+        """Test requests share one persistent connection."""
+        api = _api(simulator.host, TRANSPORT_KEEPALIVE)
+
+        for _ in range(5):
+            assert await api.get_current_parameters() == mock_3phase_current
+        await api.get_total_energy()
+        api.close()
+
+        assert simulator.requests == 6
+        assert simulator.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_close(self, mock_1phase_energy):
+        """Test the client reconnects when the meter closes connections."""
+        meter = MeterSimulator("1phase", max_requests_per_connection=2)
+        await meter.start()
+        try:
+            api = _api(meter.host, TRANSPORT_KEEPALIVE)
+            for _ in range(5):
+                assert await api.get_total_energy() == mock_1phase_energy
+            api.close()
+        finally:
+            await meter.stop()
+
+        assert meter.requests == 5
+        assert meter.connections == 3
+
+    @pytest.mark.asyncio
+    async def test_http_error(self, simulator):
+        """Test non-200 responses raise a connection error."""
+        api = _api(simulator.host, TRANSPORT_KEEPALIVE)
+
+        with pytest.raises(FoxEnergyConnectionError, match="HTTP 404"):
+            await api._get_endpoint("/0000/unknown")
+        api.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_refused(self, simulator):
+        """Test an unreachable meter raises a connection error."""
+        host = simulator.host
+        await simulator.stop()
+        api = _api(host, TRANSPORT_KEEPALIVE)
+
+        with pytest.raises(FoxEnergyConnectionError):
+            await api.get_current_parameters()
+        await simulator.start()
+
+    @pytest.mark.asyncio
+    async def test_invalid_status(self, simulator):
+        """Test a response without status ok is rejected."""
+        simulator.bodies["/0000/get_total_energy"] = b'{"status": "error"}'
+        api = _api(simulator.host, TRANSPORT_KEEPALIVE)
+
+        with pytest.raises(FoxEnergyInvalidResponse):
+            await api.get_total_energy()
+        api.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_transports(simulator):
+    """Benchmark the keep-alive transport against aiohttp on the simulator."""
+    results = {}
+    for transport in (TRANSPORT_AIOHTTP, TRANSPORT_KEEPALIVE):
+        api = _api(simulator.host, transport)
+        await api.get_current_parameters()
+
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_REQUESTS):
+            await api.get_current_parameters()
+        results[transport] = time.perf_counter() - start
+        api.close()
+
+    assert results[TRANSPORT_KEEPALIVE] < results[TRANSPORT_AIOHTTP]
@@ -0,0 +1,112 @@
+"""Tests for Fox Energy virtual meters."""
+
+import pytest
+
+from custom_components.fox_energy import virtual
+from custom_components.fox_energy.const import SENSORS_3PHASE
+from custom_components.fox_energy.virtual import FoxEnergyAggregator, virtual_sensors
+
+KEYS = ["moc_czynna_suma", "energia_pobrana_suma"]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def vectorized(request, monkeypatch):
+    """Run with and without numpy."""
+    if not request.param:
+        monkeypatch.setattr(virtual, "np", None)
+    elif virtual.np is None:
+        pytest.skip("numpy not installed")
+
+
+@pytest.mark.usefixtures("vectorized")
+class TestAggregator:
+    """Tests for combining samples of several meters."""
+
+    def test_sum_and_difference(self):
+        """Test the result is emitted once all members reported the tick."""
+        aggregator = FoxEnergyAggregator(["a", "b", "c"], [1, 1, -1], KEYS)
+
+        assert (
+            aggregator.add(
+                "a", 10, {"moc_czynna_suma": 1000, "energia_pobrana_suma": 5}
+            )
+            is None
+        )
+        assert (
+            aggregator.add(
+                "c", 10, {"moc_czynna_suma": 300, "energia_pobrana_suma": 1.5}
+            )
+            is None
+        )
+        combined = aggregator.add(
+            "b", 10, {"moc_czynna_suma": 500.5, "energia_pobrana_suma": 2.25}
+        )
+
+        assert combined == {"moc_czynna_suma": 1200.5, "energia_pobrana_suma": 5.75}
+
+    def test_missing_value(self):
+        """Test a field any member lacks is unknown."""
+        aggregator = FoxEnergyAggregator(["a", "b"], [1, 1], KEYS)
+        aggregator.add("a", 10, {"moc_czynna_suma": 1, "energia_pobrana_suma": 2})
+
+        combined = aggregator.add("b", 10, {"moc_czynna_suma": 3})
+
+        assert combined == {"moc_czynna_suma": 4, "energia_pobrana_suma": None}
+
+    def test_incomplete_ticks_dropped(self):
+        """Test ticks a member skipped never block newer ones."""
+        aggregator = FoxEnergyAggregator(["a", "b"], [1, 1], KEYS[:1])
+        sample = {"moc_czynna_suma": 1}
+
+        aggregator.add("a", 5, sample)
+        aggregator.add("a", 10, sample)
+        assert aggregator.add("b", 10, sample) == {"moc_czynna_suma": 2}
+        # Late sample of an abandoned tick
+        assert aggregator.add("b", 5, sample) is None
+        assert aggregator.dropped_ticks == 1
+
+        for tick in (15, 20, 25):
+            aggregator.add("a", tick, sample)
+        assert aggregator.add("b", 25, sample) == {"moc_czynna_suma": 2}
+        assert aggregator.dropped_ticks == 3
+
+    def test_samples_paired_within_tolerance(self):
+        """Test samples of one refresh taken moments apart are combined."""
+        aggregator = FoxEnergyAggregator(["a", "b"], [1, 1], KEYS[:1], tolerance=1)
+        sample = {"moc_czynna_suma": 1}
+
+        assert aggregator.add("a", 100.2, sample) is None
+        # Too far apart to be the same refresh
+        assert aggregator.add("b", 101.5, sample) is None
+        assert aggregator.add("b", 100.9, sample) == {"moc_czynna_suma": 2}
+        assert aggregator.last_tick == 100.2
+        assert aggregator.add("a", 101.6, sample) == {"moc_czynna_suma": 2}
+
+    def test_member_failure(self):
+        """Test a member that stops reporting holds back every tick."""
+        aggregator = FoxEnergyAggregator(["a", "b"], [1, 1], KEYS[:1])
+        sample = {"moc_czynna_suma": 1}
+        aggregator.add("a", 5, sample)
+        aggregator.add("b", 5, sample)
+
+        for tick in (10, 15, 20):
+            assert aggregator.add("a", tick, sample) is None
+
+        assert aggregator.last_tick == 5
+        assert aggregator.missing() == ["b"]
+        assert aggregator.dropped_ticks == 1
+
+
+def test_virtual_sensors():
+    """Test only additive fields are combined."""
+    sensors = virtual_sensors(SENSORS_3PHASE, differences=False)
+    with_differences = virtual_sensors(SENSORS_3PHASE, differences=True)
+
+    assert "moc_czynna_l1" in sensors
+    assert "natezenie_suma" in sensors
+    assert "napiecie_l1" not in sensors
+    assert "cos_phi_l1" not in sensors
+    assert "czestotliwosc_l1" not in sensors
+    assert sensors["energia_pobrana_suma"]["state_class"] == "total_increasing"
+    assert with_differences["energia_pobrana_suma"]["state_class"] == "total"
+    assert SENSORS_3PHASE["energia_pobrana_suma"]["state_class"] == "total_increasing"
@@ -0,0 +1,29 @@
+"""Tests for Fox Energy websocket API."""
+
+from custom_components.fox_energy.websocket_api import FoxEnergySampleEncoder
+
+
+class TestFoxEnergySampleEncoder:
+    """Tests for FoxEnergySampleEncoder class."""
+
+    def test_compact_payload(self):
+        """Test samples are encoded as arrays in key order."""
+        encoder = FoxEnergySampleEncoder(2, ["moc_czynna", "napiecie", "cos_phi"])
+
+        payload = encoder.encode(
+            1_700_000_000.0, {"napiecie": 230.1, "moc_czynna": 120.5, "x": 1}
+        )
+
+        assert payload == [2, 1_700_000_000.0, 120.5, 230.1, None]
+
+    def test_decimation(self):
+        """Test only every Nth sample is sent, starting with the first."""
+        encoder = FoxEnergySampleEncoder(0, ["moc_czynna"], decimation=3)
+
+        sent = [
+            payload[1]
+            for timestamp in range(10)
+            if (payload := encoder.encode(timestamp, {"moc_czynna": 1.0}))
+        ]
+
+        assert sent == [0, 3, 6, 9]